@@ -0,0 +1,83 @@
+# Command line runner for the FMG tools, running QA, summaries and reports end to end from a config file
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+
+# Tool scripts import fmglib from the script folder
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Pipeline stages in run order, each a section of the config file holding the keyword arguments of its function.
+# Tool scripts are imported when their stage runs, so the summaries run without ArcGIS on GeoPackage or Parquet
+# storage, while QA and reports require arcpy.
+STAGES = ['qa', 'summaries', 'advanced', 'forester_view', 'public_view']
+STAGE_FUNCTIONS = {'qa': ('qa02_run_all_brb', 'run_qa'),
+                   'summaries': ('summary_standard_tables', 'run_standard_summaries'),
+                   'advanced': ('summary_advanced_tables', 'run_advanced_summaries'),
+                   'forester_view': ('report_create_forester_view', 'create_forester_view'),
+                   'public_view': ('report_create_public_view', 'create_public_view')}
+
+
+def run_pipeline(config, stages=None):
+    """Runs the FMG pipeline stages present in the config, in the order of STAGES, feeding the outputs of earlier
+    stages to later stages when the config does not set them.
+
+    Keyword Args:
+        config -- dictionary: stage name to a dictionary of keyword arguments of the stage function, i.e.
+                  {"summaries": {"prism_fc": ..., "fixed_fc": ..., "age_fc": ..., "out_gdb": ..., "levels": [...]}}
+        stages -- list: stage names to run, if None every stage in the config is run
+
+    Details: the deduplicated prism, fixed and age feature classes of the qa stage are the default inputs of the
+    summaries and advanced stages, and the output geodatabase of the summaries stage is the default summary
+    geodatabase of the forester_view and public_view stages. Returns a dictionary of stage name to a tuple of the
+    stage result and the elapsed seconds.
+    """
+    unknown_stages = [stage for stage in config if stage not in STAGES]
+    if unknown_stages:
+        raise ValueError('Unknown stages in config: {0}, expected {1}'.format(unknown_stages, STAGES))
+    stages = [stage for stage in STAGES if stage in config and (stages is None or stage in stages)]
+
+    results = {}
+    for stage in stages:
+        arguments = dict(config[stage])
+        if stage in ('summaries', 'advanced') and 'qa' in results:
+            qa_result = results['qa'][0]
+            arguments.setdefault('prism_fc', qa_result['prism'])
+            arguments.setdefault('fixed_fc', qa_result['fixed'])
+            arguments.setdefault('age_fc', qa_result['age'])
+        if stage in ('forester_view', 'public_view') and 'summaries' in config:
+            arguments.setdefault('in_summary_gdb', config['summaries'].get('out_gdb'))
+
+        print('Running stage {0}'.format(stage), flush=True)
+        start = time.perf_counter()
+        module_name, function_name = STAGE_FUNCTIONS[stage]
+        result = getattr(importlib.import_module(module_name), function_name)(**arguments)
+        elapsed = time.perf_counter() - start
+        print('Stage {0} finished in {1:.1f} s'.format(stage, elapsed), flush=True)
+        results[stage] = (result, elapsed)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='fmg',
+                                     description='Run FMG QA, summaries and reports from a JSON config file.')
+    parser.add_argument('config', help='path to the JSON config file, one section per stage')
+    parser.add_argument('--stages', nargs='+', choices=STAGES,
+                        help='stages to run, by default every stage in the config file')
+    parser.add_argument('--timings', help='path to write the elapsed seconds of each stage as JSON')
+    args = parser.parse_args(argv)
+
+    with open(args.config) as config_file:
+        config = json.load(config_file)
+    results = run_pipeline(config, stages=args.stages)
+
+    if args.timings:
+        with open(args.timings, 'w') as timings_file:
+            json.dump({stage: elapsed for stage, (_, elapsed) in results.items()}, timings_file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
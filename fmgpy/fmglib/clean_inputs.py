@@ -6,10 +6,10 @@ import sys
 import arcpy
 import re
 import pandas as pd
-from pathlib import Path
 from pandas.api.types import is_string_dtype, is_numeric_dtype
 import numpy as np
 from arcgis.features import GeoAccessor, GeoSeriesAccessor
+from . import forest_calcs as fcalc
 
 arcpy.env.overwriteOutput = True
 
@@ -515,15 +515,19 @@ def check_required_fields_prism(fc_prism, plot_name, species_name, dia_name, cla
     else:
         pass
 
-    # crosswalk_df = pd.read_csv('resources/MAST_SP_TYP_Crosswalk.csv') \
-    mast_csv = Path(__file__).parent / "../resources/MAST_SP_TYP_Crosswalk.csv"
-    crosswalk_df = pd.read_csv(mast_csv) \
-        .filter(items=['TR_SP', 'MAST_TYPE'])
-
-    prism_df = prism_df.merge(right=crosswalk_df, how='left', on='TR_SP')
+    # look up mast type from the species crosswalk
+    crosswalk_df = fcalc.crosswalk_lookup(prism_df['TR_SP'], columns=['MAST_TYPE'])
+    prism_df = prism_df \
+        .assign(MAST_TYPE=crosswalk_df['MAST_TYPE']) \
+        .reset_index(drop=True)
 
     arcpy.AddMessage("    MAST_TYPE field populated")
 
+    # report species codes missing from the crosswalk
+    unknown = fcalc.unknown_species(prism_df['TR_SP'])
+    if len(unknown) > 0:
+        arcpy.AddMessage("    Species codes not in crosswalk: {0}".format(", ".join(unknown)))
+
     # populate CANOPY_DBH_FLAG
     # flag all trees with dia > 50"
     prism_df.loc[prism_df['TR_DIA'] > 50, 'CANOPY_DBH_FLAG'] = "Tree diameter > 50in"
@@ -642,15 +646,19 @@ def check_required_fields_age(fc_age, plot_name, species_name, dia_name, height_
     else:
         pass
 
-    mast_csv = Path(__file__).parent / "../resources/MAST_SP_TYP_Crosswalk.csv"
-    crosswalk_df = pd.read_csv(mast_csv) \
-        .filter(items=['TR_SP', 'MAST_TYPE']) \
-        .rename(columns={'TR_SP': 'AGE_SP'})
-
-    age_df = age_df.merge(right=crosswalk_df, how='left', on='AGE_SP')
+    # look up mast type from the species crosswalk
+    crosswalk_df = fcalc.crosswalk_lookup(age_df['AGE_SP'], columns=['MAST_TYPE'])
+    age_df = age_df \
+        .assign(MAST_TYPE=crosswalk_df['MAST_TYPE']) \
+        .reset_index(drop=True)
 
     arcpy.AddMessage("    MAST_TYPE field populated")
 
+    # report species codes missing from the crosswalk
+    unknown = fcalc.unknown_species(age_df['AGE_SP'])
+    if len(unknown) > 0:
+        arcpy.AddMessage("    Age species codes not in crosswalk: {0}".format(", ".join(unknown)))
+
     # recast numerical fields to correct type
     age_df["AGE_DIA"] = age_df["AGE_DIA"].round(1)
 
@@ -2,13 +2,36 @@
 
 import os
 import sys
-import arcpy
 import math
 import pandas as pd
 import numpy as np
-from arcgis.features import GeoAccessor, GeoSeriesAccessor
 import itertools
-arcpy.env.overwriteOutput = True
+import re
+import weakref
+import hashlib
+import functools
+import inspect
+import collections
+import concurrent.futures
+import glob
+from . import storage as fstore
+
+# ArcGIS is optional, the calculations and the GeoPackage and Parquet storage backends run without it
+try:
+    import arcpy
+    from arcgis.features import GeoAccessor, GeoSeriesAccessor
+except ImportError:
+    arcpy = None
+if arcpy is not None:
+    arcpy.env.overwriteOutput = True
+
+
+# Report progress in the ArcGIS tool messages, or on standard output when running without ArcGIS
+def add_message(message):
+    if arcpy is not None:
+        arcpy.AddMessage(message)
+    else:
+        print(message, flush=True)
 
 
 # Set summary level based on user input
@@ -35,6 +58,80 @@ def fmg_level(level):
     return level_field
 
 
+# FMG hierarchy levels, from coarsest to finest
+HIERARCHY_LEVELS = ['POOL', 'COMP', 'UNIT', 'SITE', 'SID', 'PID']
+
+# Hierarchy dimension, plots with level IDs and integer keys, parent columns and plot counts by level
+Hierarchy = collections.namedtuple('Hierarchy', ['plots', 'parents', 'plot_counts'])
+
+
+# Build the hierarchy dimension once per plot table
+def create_hierarchy(plot_table):
+    """ Creates the hierarchy dimension shared by the summaries. It is built once per plot table and reused, so
+    every summary and level reads the same parent columns instead of regrouping the plot table.
+
+    :param plot_table: Specific dataframe produced by the create_plot_table function
+    :type plot_table: pandas.DataFrame
+    :returns: Hierarchy with plots, a dataframe indexed by PID with the POOL, COMP, UNIT, SITE and SID columns
+              and integer POOL_KEY to PID_KEY surrogate keys (-1 for missing IDs), parents, a dictionary of
+              dataframes indexed by each level with its upstream level columns (PLT_CT for POOL), and
+              plot_counts, a dictionary of plot count series indexed by each level
+    :rtype: Hierarchy
+    """
+    state = _table_state(plot_table)
+    if 'hierarchy' in state:
+        return state['hierarchy']
+
+    assert plot_table.columns.isin(HIERARCHY_LEVELS).sum() == len(HIERARCHY_LEVELS), \
+        "df must contain columns POOL, COMP, UNIT, SITE, SID and PID"
+
+    # Integer surrogate keys for each level, in sorted ID order
+    keys_df = pd.DataFrame({level + '_KEY': pd.factorize(plot_table[level], sort=True)[0].astype('int32')
+                            for level in HIERARCHY_LEVELS},
+                           index=plot_table.index)
+
+    # Each child must have exactly one parent at every upstream level, ignoring missing parent IDs
+    for position, level in enumerate(HIERARCHY_LEVELS[1:], start=1):
+        for parent in HIERARCHY_LEVELS[:position]:
+            pairs_df = keys_df[[level + '_KEY', parent + '_KEY']]
+            pairs_df = pairs_df[(pairs_df[level + '_KEY'] >= 0) & (pairs_df[parent + '_KEY'] >= 0)] \
+                .drop_duplicates()
+            conflicts = plot_table.loc[pairs_df.index[pairs_df.duplicated(subset=level + '_KEY')], level]
+            if len(conflicts.index) > 0:
+                raise ValueError("{0} IDs with more than one {1}: {2}".format(
+                    level, parent, ", ".join(sorted(conflicts.astype(str).unique()))))
+
+    plots = pd.concat([plot_table[HIERARCHY_LEVELS], keys_df], axis=1) \
+        .drop_duplicates(subset='PID') \
+        .dropna(subset=['PID']) \
+        .set_index('PID')
+
+    # Decode categorical upstream level columns, pandas takes the first categorical value one group at a time
+    decoded_df = plot_table.assign(**decode_categories(plot_table[HIERARCHY_LEVELS[:-1]]))
+
+    parents = {}
+    plot_counts = {}
+    for position, level in enumerate(HIERARCHY_LEVELS):
+        group_table = plot_table.assign(**{column: decoded_df[column] for column in HIERARCHY_LEVELS[:position]})
+        plot_counts[level] = group_table \
+            .groupby(level, observed=True)['PID'] \
+            .count()
+
+        if level == 'POOL':
+            parents[level] = plot_counts[level] \
+                .rename('PLT_CT') \
+                .to_frame()
+        else:
+            parents[level] = group_table \
+                .groupby(level, observed=True)[HIERARCHY_LEVELS[:position]] \
+                .first()
+
+    hierarchy = Hierarchy(plots=plots, parents=parents, plot_counts=plot_counts)
+    state['hierarchy'] = hierarchy
+
+    return hierarchy
+
+
 # Create an unfiltered df at specified level, including upstream levels
 def create_level_df(level, plot_table):
     """ Creates a data frame to be used as a merge base, it aggregates the plot table based
@@ -47,73 +144,69 @@ def create_level_df(level, plot_table):
     :returns: Data frame with level IDs
     :rtype: pandas.DataFrame
     """
+    assert level in HIERARCHY_LEVELS, "level must be one of POOL, COMP, UNIT, SITE, SID, PID"
+
+    # Read the level's upstream columns from the shared hierarchy dimension
+    base_df = create_hierarchy(plot_table).parents[level].copy()
+
+    return base_df
+
+
+# Schema for an output table, column order, nan fill values and output dtypes from a *_cols.csv definition
+TableSchema = collections.namedtuple('TableSchema', ['columns', 'nan_fill', 'dtypes'])
+
+# Schemas loaded this process, by resolved csv path
+_table_schemas = {}
+
+
+# Resolve a resource file path independent of the current working directory
+def resource_path(file_name):
+    """ Returns the path of a file in the fmgpy resources folder. Relative paths such as resources/x.csv are
+    resolved by file name against the resources folder next to fmglib, absolute paths are returned unchanged.
+
+    :param file_name: file name or path of the resource
+    :type file_name: str
+    :returns: path to the resource file
+    :rtype: str
+    """
+    if os.path.isabs(file_name):
+        return file_name
 
-    if level == 'SID':
-        base_df = plot_table \
-            .groupby(level) \
-            .agg(
-                POOL=('POOL', 'first'),
-                COMP=('COMP', 'first'),
-                UNIT=('UNIT', 'first'),
-                SITE=('SITE', 'first')
-                ) \
-            .reset_index() \
-            .set_index(level)
-        return base_df
-
-    elif level == 'SITE':
-        base_df = plot_table \
-            .groupby(level) \
-            .agg(
-                POOL=('POOL', 'first'),
-                COMP=('COMP', 'first'),
-                UNIT=('UNIT', 'first')
-                ) \
-            .reset_index() \
-            .set_index(level)
-        return base_df
-
-    elif level == 'UNIT':
-        base_df = plot_table \
-            .groupby(level) \
-            .agg(
-                POOL=('POOL', 'first'),
-                COMP=('COMP', 'first')
-                ) \
-            .reset_index() \
-            .set_index(level)
-        return base_df
-
-    elif level == 'COMP':
-        base_df = plot_table\
-            .groupby(level)\
-            .agg(
-                POOL=('POOL', 'first'))\
-            .reset_index()\
-            .set_index(level)
-        return base_df
-
-    elif level == 'POOL':
-        base_df = plot_table\
-            .groupby(level)\
-            .agg(PLT_CT=('PID', 'count'))\
-            .reset_index()\
-            .set_index(level)
-        return base_df
-
-    elif level == 'PID':
-        base_df = plot_table \
-            .groupby(level) \
-            .agg(
-                POOL=('POOL', 'first'),
-                COMP=('COMP', 'first'),
-                UNIT=('UNIT', 'first'),
-                SITE=('SITE', 'first'),
-                SID=('SID', 'first')
-                )\
-            .reset_index()\
-            .set_index(level)
-        return base_df
+    resource_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+    path = os.path.join(resource_dir, os.path.basename(file_name))
+    if not os.path.exists(path) and os.path.exists(file_name):
+        path = os.path.abspath(file_name)
+
+    return path
+
+
+# Load an output table schema once per process
+def table_schema(col_csv):
+    """ Reads a column definition csv into a TableSchema of column order, nan fill values and output dtypes.
+    Each csv is read once per process, later calls return the loaded schema.
+
+    :param col_csv: csv defining the table schema, i.e. resources/general_summary_cols.csv
+    :type col_csv: str
+    :returns: schema with columns (tuple), nan_fill (dict) and dtypes (dict)
+    :rtype: TableSchema
+    """
+    path = resource_path(col_csv)
+
+    if path not in _table_schemas:
+        col_list_df = pd.read_csv(path)
+
+        # String fill values take precedence over numeric fill values
+        col_list_num = col_list_df[col_list_df['REQ_NAN_NUM_FILL'] == 'Yes']
+        col_list_str = col_list_df[col_list_df['REQ_NAN_STR_FILL'] == 'Yes']
+        nan_fill = dict(zip(col_list_num['COL_NAME'], col_list_num['VALUE_NAN_NUM']))
+        nan_fill.update(zip(col_list_str['COL_NAME'], col_list_str['VALUE_NAN_STR']))
+
+        _table_schemas[path] = TableSchema(
+            columns=tuple(col_list_df['COL_NAME']),
+            nan_fill=nan_fill,
+            dtypes=dict(zip(col_list_df['COL_NAME'], col_list_df['OUTPUT_DTYPE'])))
+
+    return _table_schemas[path]
 
 
 # Create ordered list of columns for output gdb tables
@@ -131,25 +224,11 @@ def fmg_column_reindex_list(level, col_csv):
 
     # Create list of upstream levels based on current level
     levels_list = []
-    if level == 'PID':
-        levels_list = ['POOL', 'COMP', 'UNIT', 'SITE', 'SID', 'PID']
-    elif level == 'SID':
-        levels_list = ['POOL', 'COMP', 'UNIT', 'SITE', 'SID']
-    elif level == 'SITE':
-        levels_list = ['POOL', 'COMP', 'UNIT', 'SITE']
-    elif level == 'UNIT':
-        levels_list = ['POOL', 'COMP', 'UNIT']
-    elif level == 'COMP':
-        levels_list = ['POOL', 'COMP']
-    elif level == 'POOL':
-        levels_list = ['POOL']
-
-    # Import the column definition csv
-    col_list_df = pd.read_csv(col_csv)
-
-    # Covert column definition df to list
-    col_list = col_list_df['COL_NAME'].values.tolist()
-    reindex_cols = levels_list + col_list
+    if level in HIERARCHY_LEVELS:
+        levels_list = HIERARCHY_LEVELS[:HIERARCHY_LEVELS.index(level) + 1]
+
+    # Add the columns from the column definition csv
+    reindex_cols = levels_list + list(table_schema(col_csv).columns)
 
     return reindex_cols
 
@@ -161,38 +240,12 @@ def fmg_nan_fill(col_csv):
 
     :param col_csv: csv defining the table schema
     :type col_csv: csv
-    :returns: a dictionary of column names (keys) and their nan fill values (values)
+    :returns: a dictionary of column names (keys) and their nan fill values (values), None if no column is filled
     :rtype: dict
     """
+    out_dict = dict(table_schema(col_csv).nan_fill)
 
-    # import the column definition csv
-    col_list_df = pd.read_csv(col_csv)
-
-    # Create dictionary for just string fill nans
-    col_list_str = col_list_df[col_list_df['REQ_NAN_STR_FILL'] == 'Yes']
-    str_dict = None
-    if len(col_list_str.index) > 0:
-        str_cols = col_list_str['COL_NAME'].values.tolist()
-        str_vals = col_list_str['VALUE_NAN_STR'].values.tolist()
-        str_dict = dict(zip(str_cols, str_vals))
-
-    # Create df for just num fill nans
-    col_list_num = col_list_df[col_list_df['REQ_NAN_NUM_FILL'] == 'Yes']
-    num_dict = None
-    if len(col_list_num.index) > 0:
-        num_cols = col_list_num['COL_NAME'].values.tolist()
-        num_vals = col_list_num['VALUE_NAN_NUM'].values.tolist()
-        num_dict = dict(zip(num_cols, num_vals))
-
-    # Return either or, or, if there are both str and num dicts, combine
-    if str_dict is None:
-        out_dict = num_dict
-    elif num_dict is None:
-        out_dict = str_dict
-    else:
-        out_dict = num_dict | str_dict
-
-    return out_dict
+    return out_dict if out_dict else None
 
 
 # Function to enforce data types in Python/Pandas
@@ -204,16 +257,112 @@ def fmg_dtype_enforce(col_csv):
     :returns: a dictionary of column names (keys) and their dtypes (values)
     :rtype: dict
     """
+    dtype_dict = dict(table_schema(col_csv).dtypes)
 
-    # Import the column csv
-    dtype_list_df = pd.read_csv(col_csv)
+    return dtype_dict
 
-    # Create the dictionary
-    dtype_cols = dtype_list_df['COL_NAME'].values.tolist()
-    dtype_types = dtype_list_df['OUTPUT_DTYPE'].values.tolist()
-    dtype_dict = dict(zip(dtype_cols, dtype_types))
 
-    return dtype_dict
+# Reorder columns, fill nans and enforce dtypes for output gdb tables in one step
+def fmg_enforce_schema(df, level, col_csv):
+    """ Applies an output table schema to a dataframe, equivalent to reindexing on fmg_column_reindex_list, filling
+    nans from fmg_nan_fill then casting to fmg_dtype_enforce. Each output column is built once and the output
+    dataframe is assembled in a single step, rather than copying the full dataframe for each of the three steps.
+
+    :param df: summary dataframe, containing the hierarchy and statistic columns
+    :type df: pandas.DataFrame
+    :param level: FMG level, one of any PID, SID, SITE, UNIT, COMP, POOL
+    :type level: str
+    :param col_csv: csv defining the table schema
+    :type col_csv: str
+    :returns: dataframe with the schema's columns, in order, with nans filled and dtypes enforced
+    :rtype: pandas.DataFrame
+    """
+    schema = table_schema(col_csv)
+
+    out_columns = {}
+    for column in fmg_column_reindex_list(level, col_csv):
+        if column in df.columns:
+            values = df[column]
+        else:
+            values = pd.Series(np.nan, index=df.index, dtype='float64')
+
+        if column in schema.nan_fill:
+            values = values.fillna(schema.nan_fill[column])
+        dtype = schema.dtypes.get(column)
+        if isinstance(dtype, str):
+            values = values.astype(dtype, copy=False)
+
+        out_columns[column] = values
+
+    out_df = pd.DataFrame(out_columns, index=df.index)
+
+    return out_df
+
+
+# Species crosswalk loaded this process
+_species_crosswalk = {}
+
+
+# Load the species crosswalk once per process
+def species_crosswalk():
+    """ Reads resources/MAST_SP_TYP_Crosswalk.csv once per process into a lookup table indexed by species code,
+    with MAST_TYPE, TYP_FOR_MVR and SP_RICH_TYPE columns. Later calls return the loaded table.
+
+    :returns: species attributes indexed by TR_SP
+    :rtype: pandas.DataFrame
+    """
+    if 'table' not in _species_crosswalk:
+        _species_crosswalk['table'] = pd.read_csv(resource_path('MAST_SP_TYP_Crosswalk.csv')) \
+            .filter(items=['TR_SP', 'MAST_TYPE', 'TYP_FOR_MVR', 'SP_RICH_TYPE']) \
+            .set_index('TR_SP')
+
+    return _species_crosswalk['table']
+
+
+# Look up crosswalk attributes for species codes
+def crosswalk_lookup(species, columns=None):
+    """ Looks up species crosswalk attributes for a column of species codes. Each distinct code is looked up once
+    and the attributes are spread back to the rows by code position, instead of merging the crosswalk onto the
+    full table. Codes missing from the crosswalk get nan attributes, as a left merge would.
+
+    :param species: species codes, i.e. the TR_SP column of the tree table
+    :type species: pandas.Series
+    :param columns: crosswalk columns to return, defaults to MAST_TYPE, TYP_FOR_MVR and SP_RICH_TYPE
+    :type columns: list
+    :returns: a dataframe of crosswalk attributes, indexed as the species codes
+    :rtype: pandas.DataFrame
+    """
+    crosswalk_df = species_crosswalk()
+    columns = list(crosswalk_df.columns) if columns is None else list(columns)
+    assert crosswalk_df.columns.isin(columns).sum() == len(columns), "columns must be in the species crosswalk"
+
+    # Position of each distinct code in the crosswalk, -1 if missing
+    codes, uniques = pd.factorize(species)
+    positions = crosswalk_df.index.get_indexer(uniques)
+
+    out_columns = {}
+    for column in columns:
+        values = np.append(crosswalk_df[column].to_numpy(dtype=object), np.nan)
+        unique_values = values[positions]
+        out_columns[column] = np.append(unique_values, np.nan)[codes]
+
+    return pd.DataFrame(out_columns, index=species.index)
+
+
+# Report species codes missing from the crosswalk
+def unknown_species(species):
+    """ Lists the distinct species codes missing from the species crosswalk, ignoring nans and no tree codes.
+
+    :param species: species codes, i.e. the TR_SP column of the tree table
+    :type species: pandas.Series
+    :returns: sorted list of unknown species codes
+    :rtype: list
+    """
+    uniques = pd.Series(pd.unique(species)).dropna()
+    uniques = uniques[~uniques.isin(["NONE", "NoTree", "NOTREE"])]
+    unknown = uniques[~uniques.isin(species_crosswalk().index)]
+
+    return sorted(unknown.astype(str))
 
 
 # Plot count: use with group by - agg
@@ -238,27 +387,9 @@ def agg_tree_count(tr_sp):
     :returns: a count of trees
     :rtype: float
     """
-    trees = []
-    for val in tr_sp:
-        if val == 'NoTree':
-            continue
-        elif val == 'NONE':
-            continue
-        elif val == 'NO TREE':
-            continue
-        elif val == 'NO TREES':
-            continue
-        elif val == 'NOTREE':
-            continue
-        elif val == '':
-            continue
-        elif val == ' ':
-            continue
-        elif val is None:
-            continue
-        else:
-            trees.append(val)
-    return float(len(trees))
+    # Compatibility shim, tree flags are vectorized by is_tree
+    trees = is_tree(pd.Series(tr_sp, dtype='object'))
+    return float(trees.sum())
 
 
 # List of invasive species: use with group by - agg
@@ -301,17 +432,10 @@ def agg_inv_present(inv_present):
        :returns: a single yes or no value
        :rtype: str
     """
-    inv_pres = []
-    for val in inv_present:
-        if val == 'No':
-            continue
-        else:
-            inv_pres.append(val)
-
-    if len(inv_pres) > 0:
-        inv_present = 'Yes'
-
-    return inv_present
+    # Compatibility shim, use inv_present_any for a vectorized group by
+    if (pd.Series(inv_present) != 'No').any():
+        return 'Yes'
+    return 'No'
 
 
 # Count of notes: use with group by - agg
@@ -324,10 +448,8 @@ def agg_count_notes(note_column):
        :returns: a single integer representing rows with strings
        :rtype: int
     """
-    note_column.replace('', pd.NA, inplace=True)
-    note_column.replace(' ', pd.NA, inplace=True)
-    note_column_clean = note_column.dropna()
-    notecount = len(note_column_clean)
+    # Compatibility shim, notes are vectorized by has_note
+    notecount = int(has_note(pd.Series(note_column)).sum())
     return notecount
 
 
@@ -349,6 +471,137 @@ def tree_count(df):
     return num_trees
 
 
+# Tree flag: vectorized equivalent of agg_tree_count
+def is_tree(tr_sp):
+    """Generates a boolean series flagging tree records, excluding the same no tree codes and empty values as
+       agg_tree_count. Summing the series within a group by gives the group tree count.
+
+       :param tr_sp: pandas series of tree species codes
+       :type tr_sp: pandas.Series
+       :returns: a boolean series, True where the record is a tree
+       :rtype: pandas.Series
+    """
+    no_tree = tr_sp.isin(['NoTree', 'NONE', 'NO TREE', 'NO TREES', 'NOTREE', '', ' ']) | tr_sp.isna()
+    return ~no_tree
+
+
+# Note flag: vectorized equivalent of agg_count_notes
+def has_note(note_column):
+    """Generates a boolean series flagging rows with a note, excluding empty and blank strings in the same way as
+       agg_count_notes. Summing the series within a group by gives the group note count.
+
+       :param note_column: pandas series of notes
+       :type note_column: pandas.Series
+       :returns: a boolean series, True where the row has a note
+       :rtype: pandas.Series
+    """
+    no_note = note_column.isin(['', ' ']) | note_column.isna()
+    return ~no_note
+
+
+# Invasive species codes reported in the INV_SP and INV_PRESENT plot table columns
+INVASIVE_SPECIES = ['HUJA', 'PHAR3', 'PHAU7']
+
+# Ground and notable species columns searched for invasive species
+INVASIVE_SPECIES_COLUMNS = ['GRD_SP1', 'GRD_SP2', 'GRD_SP3', 'NOT_SP1', 'NOT_SP2', 'NOT_SP3', 'NOT_SP4', 'NOT_SP5']
+
+
+# Invasive species by plot: vectorized equivalent of applying inv_sp_list to each row
+def inv_sp_detect(plot_table, invasive_species=None):
+    """Finds invasive species recorded on each plot. The ground and notable species columns are stacked into a
+       single long array, matched against the invasive species list once, and joined per plot, in place of an
+       isin filter for each column and an inv_sp_list apply for each row.
+
+       :param plot_table: plot table with the GRD_SP1-3 and NOT_SP1-5 columns
+       :type plot_table: pandas.DataFrame
+       :param invasive_species: invasive species codes, defaults to INVASIVE_SPECIES
+       :type invasive_species: list
+       :returns: a dataframe indexed as the plot table, with INV_SP, a sorted, comma-separated list of unique
+                 invasive species codes or '' if none, and INV_PRESENT, Yes or No
+       :rtype: pandas.DataFrame
+    """
+    assert plot_table.columns.isin(INVASIVE_SPECIES_COLUMNS).sum() == len(INVASIVE_SPECIES_COLUMNS), \
+        "df must contain columns GRD_SP1-3 and NOT_SP1-5"
+    invasive_species = INVASIVE_SPECIES if invasive_species is None else list(invasive_species)
+
+    # Long view of the species columns, one value per plot and column
+    species = plot_table[INVASIVE_SPECIES_COLUMNS].to_numpy(dtype=object).ravel()
+    rows = np.repeat(np.arange(len(plot_table.index)), len(INVASIVE_SPECIES_COLUMNS))
+    matched = pd.Series(species).isin(invasive_species).to_numpy()
+
+    # Sorted, de-duplicated species list for plots with invasive species
+    inv_sp = pd.DataFrame({'ROW': rows[matched], 'SP': species[matched]}) \
+        .drop_duplicates() \
+        .sort_values(by=['ROW', 'SP']) \
+        .groupby('ROW')['SP'] \
+        .agg(', '.join)
+
+    inv_sp_values = np.full(len(plot_table.index), '', dtype=object)
+    inv_sp_values[inv_sp.index.to_numpy()] = inv_sp.to_numpy()
+
+    out_df = pd.DataFrame({'INV_SP': inv_sp_values,
+                           'INV_PRESENT': np.where(inv_sp_values != '', 'Yes', 'No')},
+                          index=plot_table.index) \
+        .astype('string')
+
+    return out_df
+
+
+# Invasive species present by level: vectorized equivalent of agg_inv_present
+def inv_present_any(plot_table, level):
+    """Generates a single yes/no value for each level polygon, Yes if any plot in the polygon has invasive species
+       present. Uses a native group by any in place of the agg_inv_present callback.
+
+       :param plot_table: plot table produced by the create_plot_table function
+       :type plot_table: pandas.DataFrame
+       :param level: field name for desired FMG level, i.e. SID, SITE, UNIT
+       :type level: str
+       :returns: a series of Yes/No values indexed by level
+       :rtype: pandas.Series
+    """
+    present = (plot_table['INV_PRESENT'] != 'No') \
+        .fillna(False) \
+        .astype(bool) \
+        .groupby(plot_table[level], observed=True) \
+        .any() \
+        .map({True: 'Yes', False: 'No'}) \
+        .rename('INV_PRESENT')
+
+    return present
+
+
+# List of invasive species by level: vectorized equivalent of agg_inv_sp
+def inv_sp_union(plot_table, level):
+    """Builds a comma-separated list of unique invasive species for each level polygon from the plot table INV_SP
+       lists. Species are one-hot encoded once and combined with a native group by any, in place of the agg_inv_sp
+       callback.
+
+       :param plot_table: plot table produced by the create_plot_table function
+       :type plot_table: pandas.DataFrame
+       :param level: field name for desired FMG level, i.e. SID, SITE, UNIT
+       :type level: str
+       :returns: a series of alphabetically sorted, comma-separated species lists indexed by level
+       :rtype: pandas.Series
+    """
+    # One column per invasive species code, alphabetically ordered
+    sp_present = plot_table['INV_SP'] \
+        .fillna('') \
+        .astype('object') \
+        .str.get_dummies(sep=', ') \
+        .astype(bool) \
+        .groupby(plot_table[level], observed=True) \
+        .any()
+
+    # Concatenate present species codes, the number of invasive species codes is small
+    inv_sp = pd.Series('', index=sp_present.index, dtype='object')
+    for sp in sp_present.columns:
+        inv_sp = inv_sp + np.where(sp_present[sp], sp + ', ', '')
+
+    inv_sp = inv_sp.str.rstrip(', ').rename('INV_SP')
+
+    return inv_sp
+
+
 # Populate column with list of invasive species codes: use with apply - lambda
 def inv_sp_list(col_list):
     """Generates a list of unique invasive species codes found in the provided list of pandas dataframe columns.
@@ -392,29 +645,138 @@ def date_range(min_year, max_year):
         return str(min_year) + "-" + str(max_year)
 
 
+# Class bin rows loaded this process, by classifier
+_class_bins = {}
+
+
+# Read the class bin table once per process
+def class_bin_table(classifier):
+    """Reads the rows for a single classifier from the declarative class bin table, resources/class_bins.csv.
+    Row order in the table sets the category order of the classifier. The table is read once per process, later
+    calls return the loaded rows, which callers must not modify.
+
+    Keyword Args:
+        classifier -- string: classifier name in the CLASSIFIER column, i.e. TR_SIZE, TR_TYPE, UND_HT_RG, VERT_COMP,
+                      HLTH_RANK
+
+    Details: range classifiers use the LOWER_OP, LOWER, UPPER_OP and UPPER columns, an empty bound is open ended.
+    Code classifiers use the CODE column, each code is assigned the category on its row.
+    """
+    if not _class_bins:
+        bin_csv = resource_path('class_bins.csv')
+        all_bins_df = pd.read_csv(bin_csv,
+                                  dtype={'CATEGORY': str, 'CODE': str, 'LOWER_OP': str, 'UPPER_OP': str},
+                                  keep_default_na=False)
+        for name, bin_df in all_bins_df.groupby('CLASSIFIER', sort=False):
+            bin_df = bin_df.reset_index(drop=True)
+            bin_df['LOWER'] = pd.to_numeric(bin_df['LOWER'], errors='coerce')
+            bin_df['UPPER'] = pd.to_numeric(bin_df['UPPER'], errors='coerce')
+            _class_bins[name] = bin_df
+
+    assert classifier in _class_bins, "classifier not found in class bin table"
+
+    return _class_bins[classifier]
+
+
+# Assign range categories from the class bin table
+def range_classify(values, classifier):
+    """Assigns a category to each value based on the range bins for the classifier in the class bin table.
+    Returns an ordered pandas categorical series, values outside every bin or missing values are NaN.
+
+    Keyword Args:
+        values     -- pandas series: numeric values to classify, i.e. TR_DIA or UND_HT2
+        classifier -- string: range classifier name in the class bin table, i.e. TR_SIZE, TR_TYPE, UND_HT_RG
+    """
+    bin_df = class_bin_table(classifier)
+    num_values = pd.to_numeric(values, errors='coerce').astype('float64').to_numpy()
+
+    # Build one condition per bin, comparisons against nan are False
+    comparisons = {'>=': np.greater_equal, '>': np.greater, '<=': np.less_equal, '<': np.less}
+    conditions = []
+    for row in bin_df.itertuples():
+        condition = np.ones(len(num_values), dtype=bool)
+        if row.LOWER_OP:
+            condition &= comparisons[row.LOWER_OP](num_values, row.LOWER)
+        if row.UPPER_OP:
+            condition &= comparisons[row.UPPER_OP](num_values, row.UPPER)
+        conditions.append(condition)
+
+    codes = np.select(conditions, list(range(len(conditions))), default=-1)
+    classes = pd.Categorical.from_codes(codes, categories=bin_df['CATEGORY'], ordered=True)
+
+    return pd.Series(classes, index=values.index, name=classifier)
+
+
+# Assign code categories from the class bin table
+def code_classify(values, classifier):
+    """Assigns a category to each code based on the code lookup for the classifier in the class bin table.
+    Returns an ordered pandas categorical series, unknown codes or missing values are NaN.
+
+    Keyword Args:
+        values     -- pandas series: codes to classify, i.e. TR_CL or TR_HLTH
+        classifier -- string: code classifier name in the class bin table, i.e. VERT_COMP, HLTH_RANK
+    """
+    bin_df = class_bin_table(classifier)
+    categories = bin_df['CATEGORY'].drop_duplicates().tolist()
+
+    # Look up category codes, codes not in the table are -1
+    code_index = pd.Index(bin_df['CODE'])
+    category_codes = bin_df['CATEGORY'].map({category: i for i, category in enumerate(categories)}).to_numpy()
+    positions = code_index.get_indexer(values.astype('object'))
+    codes = np.where(positions >= 0, category_codes[positions], -1)
+
+    classes = pd.Categorical.from_codes(codes, categories=categories, ordered=True)
+
+    return pd.Series(classes, index=values.index, name=classifier)
+
+
+# Convert a classified series to object values
+def class_values(classes):
+    """Converts a categorical series from range_classify or code_classify to an object series, with None where no
+    class was assigned. Matches the output of the pandas .map method used with the *_map functions.
+
+    Keyword Args:
+        classes -- pandas series: categorical series to convert
+    """
+    values = classes.astype('object')
+    return values.where(values.notna(), None)
+
+
 # Assign vertical composition categorical variable column
+def vert_comp_class(tr_cl):
+    """Vectorized vertical composition class (Canopy, Midstory) for a series of canopy classes. Returns an ordered
+    categorical series, see the VERT_COMP rows of the class bin table.
+
+    Keyword Args:
+        tr_cl -- pandas series: canopy class (D:Dominant, CD:Co-Dominant, S:Suppressed, I:Intermediate)
+    """
+    return code_classify(tr_cl, 'VERT_COMP')
+
+
 def vert_comp_class_map(tr_cl):
-    """Maps a vertical forest composition variable onto the tree canopy class
+    """Maps a vertical composition class (Canopy, Midstory) onto the canopy class values
     as specified by USACE foresters
 
     Keyword Args:
         tr_cl -- canopy class (D:Dominant, CD:Co-Dominant, S:Suppressed, I:Intermediate)
                  for a given tree
 
-    Details: written to function within the pandas .map method
+    Details: written to function within the pandas .map method, vert_comp_class is the vectorized equivalent
     """
-
-    if tr_cl == 'D':
-        return 'Canopy'
-    if tr_cl == 'CD':
-        return 'Canopy'
-    if tr_cl == 'S':
-        return 'Midstory'
-    if tr_cl == 'I':
-        return 'Midstory'
+    return class_values(vert_comp_class(pd.Series([tr_cl]))).iloc[0]
 
 
 # Assign size class categorical variable column
+def size_class(tr_dia):
+    """Vectorized size class (Sapling, Pole, Saw, Mature, Over Mature) for a series of tree diameters. Returns an
+    ordered categorical series, see the TR_SIZE rows of the class bin table.
+
+    Keyword Args:
+        tr_dia -- pandas series: tree diameters
+    """
+    return range_classify(tr_dia, 'TR_SIZE')
+
+
 def size_class_map(tr_dia):
     """Maps a size class categorical variable onto the tree diameter range
      as specified by USACE foresters
@@ -422,53 +784,39 @@ def size_class_map(tr_dia):
      Keyword Args:
         tr_dia -- diameter of a given tree
 
-     Details: written to function within the pandas .map method
+     Details: written to function within the pandas .map method, size_class is the vectorized equivalent
      """
-
-    if 1 <= tr_dia <=6:
-        return 'Sapling'
-    if 6 < tr_dia <= 12:
-        return 'Pole'
-    if 12 < tr_dia <= 18:
-        return 'Saw'
-    if 18 < tr_dia <= 24:
-        return 'Mature'
-    if tr_dia > 24:
-        return 'Over Mature'
+    return class_values(size_class(pd.Series([tr_dia]))).iloc[0]
 
 
 # Assign understory height range categorical variable column
+def und_height_range(height):
+    """Vectorized understory height range (<2, 2-5, ... 45-50, >50) for a series of understory heights. Returns an
+    ordered categorical series, see the UND_HT_RG rows of the class bin table.
+
+    Keyword Args:
+        height -- pandas series: understory heights
+    """
+    return range_classify(height, 'UND_HT_RG')
+
+
 def und_height_range_map(height):
-    if height < 2:
-        return '<2'
-    if 2 <= height < 5:
-        return '2-5'
-    if 5 <= height < 10:
-        return '5-10'
-    if 10 <= height < 15:
-        return '10-15'
-    if 15 <= height < 20:
-        return '15-20'
-    if 20 <= height < 25:
-        return '20-25'
-    if 25 <= height < 30:
-        return '25-30'
-    if 30 <= height < 35:
-        return '30-35'
-    if 35 <= height < 40:
-        return '35-40'
-    if 40 <= height < 45:
-        return '40-45'
-    if 45 <= height < 50:
-        return '45-50'
-    if height >= 50:
-        return '>50'
+    return class_values(und_height_range(pd.Series([height]))).iloc[0]
 
 
 # Assign tree type categorical variable column
+def tree_type(tr_dia):
+    """Vectorized tree type (Wildlife) for a series of tree diameters. Returns an ordered categorical series, see
+    the TR_TYPE rows of the class bin table.
+
+    Keyword Args:
+        tr_dia -- pandas series: tree diameters
+    """
+    return range_classify(tr_dia, 'TR_TYPE')
+
+
 def tree_type_map(tr_dia):
-    if tr_dia >= 30:
-        return 'Wildlife'
+    return class_values(tree_type(pd.Series([tr_dia]))).iloc[0]
 
 
 def overstory_sp_map(sp_rank):
@@ -484,17 +832,21 @@ def overstory_sp_map(sp_rank):
         return 'OV_SP5'
 
 
+# Assign health rank
+def health_rank(tr_hlth):
+    """Vectorized health rank for a series of tree health codes. Returns an ordered categorical series of health
+    codes, healthiest first, so sorting on the result sorts by rank. See the HLTH_RANK rows of the class bin table.
+
+    Keyword Args:
+        tr_hlth -- pandas series: tree health codes (H, S, SD, D, NT)
+    """
+    return code_classify(tr_hlth, 'HLTH_RANK')
+
+
 def health_rank_map(tr_hlth):
-    if tr_hlth == 'H':
-        return 1
-    if tr_hlth == 'S':
-        return 2
-    if tr_hlth == 'SD':
-        return 3
-    if tr_hlth == 'D':
-        return 4
-    if tr_hlth == 'NT':
-        return 5
+    rank = health_rank(pd.Series([tr_hlth])).cat.codes.iloc[0]
+    if rank >= 0:
+        return int(rank) + 1
 
 
 # Quadratic Mean Diameter at Breast Height (QM DBH)
@@ -579,7 +931,7 @@ def cover_pct(fixed, level):
     # Summarize
     level_cover_pct = (fixed
                        .groupby(level_field,
-                                as_index=False)["OV_CLSR_NUM"]
+                                as_index=False, observed=True)["OV_CLSR_NUM"]
                        .agg(["mean"])
                        .rename(columns={"mean": "canopy_per"})
                        .round({"canopy_per": 2}))
@@ -588,16 +940,19 @@ def cover_pct(fixed, level):
 
 
 # Create tree intermediate table
-def create_tree_table(prism_df):
+def create_tree_table(prism_df, categorical=False):
     """Creates the tree dataframe for use in downstream forest summaries by:
         Column TR_DIA is set to 0 for no tree rows
         Column TR_SIZE is added and populated with size class based on tree diameter ranges
         Column VERT_COMP is added and populated with vertical composition class based on canopy class
         Column TR_BA is added and populated with the eq (tree_count * BAF) / plot_count
         Column TR_DENS is added and populated with the eq (0.005454 * (tr_dia ** 2)) / plot_count
+        Column IS_TREE is added and populated with True for tree records, False for no tree records
 
     Keyword Args:
-        prism_df -- the prism plot feature class directly imported as a dataframe
+        prism_df    -- the prism plot feature class directly imported as a dataframe
+        categorical -- boolean: if True, category and hierarchy columns are stored as pandas categoricals,
+                       see encode_categories
 
     Details: None
     """
@@ -612,13 +967,13 @@ def create_tree_table(prism_df):
     tree_table.loc[tree_table.TR_SP.isin(["NONE", "NoTree", "NOTREE"]), 'TR_DIA'] = 0
 
     # Add a tree size class field (Sap, Pole, Saw, Mature, Over Mature)
-    tree_table['TR_SIZE'] = tree_table['TR_DIA'].map(size_class_map)
+    tree_table['TR_SIZE'] = class_values(size_class(tree_table['TR_DIA']))
 
     # Add a vertical composition field (Canopy, Midstory)
-    tree_table['VERT_COMP'] = tree_table['TR_CL'].map(vert_comp_class_map)
+    tree_table['VERT_COMP'] = class_values(vert_comp_class(tree_table['TR_CL']))
 
     # Add a tree type field (currently only wildlife)
-    tree_table['TR_TYPE'] = tree_table['TR_DIA'].map(tree_type_map)
+    tree_table['TR_TYPE'] = class_values(tree_type(tree_table['TR_DIA']))
 
     # Define constants for BA & Density calcs, assuming 1 tree, 1 plot
     tree_count = 1
@@ -636,38 +991,39 @@ def create_tree_table(prism_df):
                                      0)
     tree_table = tree_table.astype({'TR_DENS': 'float64'})
 
-    # Add SP_TYPE Column
-    try:
-        crosswalk_df = pd.read_csv('resources/MAST_SP_TYP_Crosswalk.csv')\
-            .filter(items=['TR_SP', 'TYP_FOR_MVR', 'SP_RICH_TYPE']) # used in ArcGIS Pro? Confirm with Alden.
-    except FileNotFoundError:
-        try:
-            crosswalk_df = pd.read_csv('./../../../resources/MAST_SP_TYP_Crosswalk.csv') \
-                .filter(items=['TR_SP', 'TYP_FOR_MVR', 'SP_RICH_TYPE']) # used when running an individual test file
-        except FileNotFoundError:
-            try:
-                crosswalk_df = pd.read_csv('./fmgpy/resources/MAST_SP_TYP_Crosswalk.csv') \
-                    .filter(items=['TR_SP', 'TYP_FOR_MVR', 'SP_RICH_TYPE']) # used when running in python console
-            except FileNotFoundError:
-                crosswalk_df = pd.read_csv('./../../../../../../../Users/b5ecdiws/Documents/FMG/FMG-toolbox/fmgpy/resources/MAST_SP_TYP_Crosswalk.csv') \
-                    .filter(items=['TR_SP', 'TYP_FOR_MVR', 'SP_RICH_TYPE'])  # used when running test suite on
-                                                                             # Isaiah's machine.
-
-    tree_table = tree_table\
-        .merge(right=crosswalk_df, how='left', on='TR_SP')\
-        .rename(columns={'TYP_FOR_MVR': 'SP_TYPE'})
+    # Add a tree flag field, summed in place of per group tree count callbacks
+    tree_table['IS_TREE'] = is_tree(tree_table['TR_SP'])
+
+    # Add SP_TYPE and SP_RICH_TYPE columns from the species crosswalk
+    crosswalk_df = crosswalk_lookup(tree_table['TR_SP'], columns=['TYP_FOR_MVR', 'SP_RICH_TYPE'])
+    tree_table = tree_table \
+        .assign(SP_TYPE=crosswalk_df['TYP_FOR_MVR'],
+                SP_RICH_TYPE=crosswalk_df['SP_RICH_TYPE']) \
+        .reset_index(drop=True)
+
+    # Report species codes missing from the crosswalk
+    unknown = unknown_species(tree_table['TR_SP'])
+    if len(unknown) > 0:
+        add_message("    Species codes not in crosswalk: {0}".format(", ".join(unknown)))
+
+    # Opt in to compact categorical columns
+    if categorical:
+        tree_table = encode_categories([tree_table])[0]
 
     return tree_table
 
 
 # Create plot intermediate table
-def create_plot_table(fixed_df, age_df):
+def create_plot_table(fixed_df, age_df, categorical=False, invasive_species=None):
     """ Create the plot dataframe for use in downstream summaries by:
             Combining Fixed and Age Plot dataframes
 
     Keyword Args:
-        fixed_df -- the fixed plot feature class directly imported as a dataframe
-        age_df   -- the age plot feature class directly imported as a dataframe
+        fixed_df         -- the fixed plot feature class directly imported as a dataframe
+        age_df           -- the age plot feature class directly imported as a dataframe
+        categorical      -- boolean: if True, category and hierarchy columns are stored as pandas categoricals,
+                            see encode_categories
+        invasive_species -- list: species codes reported in INV_SP and INV_PRESENT, defaults to INVASIVE_SPECIES
 
     Details: None
     """
@@ -691,68 +1047,844 @@ def create_plot_table(fixed_df, age_df):
         .merge(right=cleanage_df, how='left', left_on='PID', right_on='PID') \
         .reset_index()
 
-    # Define list of specific invasive species
-    invsp = ['HUJA', 'PHAR3', 'PHAU7']
-
-    # Drop shape from plot table
-    plot_table2 = plot_table.drop(columns=['SHAPE'])
-
-    # filter dataset to just records with invasive species
-    invsp_filter_df = plot_table2[plot_table['GRD_SP1'].isin(invsp) |
-                                  plot_table['GRD_SP2'].isin(invsp) |
-                                  plot_table['GRD_SP3'].isin(invsp) |
-                                  plot_table['NOT_SP1'].isin(invsp) |
-                                  plot_table['NOT_SP2'].isin(invsp) |
-                                  plot_table['NOT_SP3'].isin(invsp) |
-                                  plot_table['NOT_SP4'].isin(invsp) |
-                                  plot_table['NOT_SP5'].isin(invsp)] \
+    # Add invasive species columns, assigned by plot
+    inv_df = inv_sp_detect(plot_table, invasive_species)
+    plot_table = plot_table \
+        .assign(INV_SP=inv_df['INV_SP'],
+                INV_PRESENT=inv_df['INV_PRESENT']) \
+        .fillna(value={"AGE_MISC": ''})
+
+    # Opt in to compact categorical columns
+    if categorical:
+        plot_table = encode_categories([plot_table])[0]
+
+    return plot_table
+
+
+# Encode category and hierarchy columns as pandas categoricals
+def encode_categories(tables, columns=None):
+    """Converts string columns of one or more dataframes to pandas categoricals. The categories of each column are
+    the sorted union of its values across every dataframe supplied, so the dataframes share one dictionary per
+    column, i.e. PID codes match between the tree and plot tables. Sorted categories group, sort and join in the
+    same order as the strings they replace.
+
+    Keyword Args:
+        tables  -- list: dataframes to encode, i.e. [tree_table, plot_table]
+        columns -- list: columns to encode where present. If None, TR_SP, TR_HLTH, TR_CL, MAST_TYPE, SP_TYPE,
+                   SP_RICH_TYPE, VERT_COMP, TR_SIZE, TR_TYPE, POOL, COMP, UNIT, SITE, SID and PID are used.
+
+    Details: returns a list of encoded dataframes in the same order as tables, the input dataframes are not
+    modified. Categories keep the dtype of the strings they replace, decode_categories converts the columns
+    back to strings before export.
+    """
+    assert isinstance(tables, list), "tables must be a list of pandas DataFrames"
+
+    if columns is None:
+        columns = ['TR_SP', 'TR_HLTH', 'TR_CL', 'MAST_TYPE', 'SP_TYPE', 'SP_RICH_TYPE', 'VERT_COMP', 'TR_SIZE',
+                   'TR_TYPE', 'POOL', 'COMP', 'UNIT', 'SITE', 'SID', 'PID']
+
+    encoded = [{} for table in tables]
+    for column in columns:
+        values = [table[column] for table in tables if column in table.columns]
+        if len(values) == 0:
+            continue
+
+        # Build the shared, sorted dictionary, keeping the dtype of the first table's strings
+        if isinstance(values[0].dtype, pd.CategoricalDtype):
+            dtype = values[0].cat.categories.dtype
+        else:
+            dtype = values[0].dtype
+        unique_values = set()
+        for value in values:
+            unique_values.update(value.dropna().unique())
+        categories = pd.Index(sorted(unique_values), dtype=dtype)
+
+        for table, table_encoded in zip(tables, encoded):
+            if column in table.columns:
+                table_encoded[column] = pd.Categorical(table[column], categories=categories)
+
+    return [table.assign(**table_encoded) for table, table_encoded in zip(tables, encoded)]
+
+
+# Decode categorical columns back to strings
+def decode_categories(df):
+    """Converts every categorical column of a dataframe back to the dtype of its categories, i.e. string or
+    object. Used before summary tables are exported, dataframes without categorical columns are returned as is.
+
+    Keyword Args:
+        df -- dataframe: dataframe with columns encoded by encode_categories
+    """
+    decoded = {column: df[column].astype(df[column].cat.categories.dtype)
+               for column in df.columns
+               if isinstance(df[column].dtype, pd.CategoricalDtype)}
+
+    if len(decoded) == 0:
+        return df
+
+    return df.assign(**decoded)
+
+
+# Rebuild categorical codes of an empty grouped result
+def empty_categories(df):
+    """Rebuilds the categorical index and columns of an empty dataframe. Pandas returns empty groupby results
+    on categorical keys with int8 codes regardless of the number of categories, which then fail to join to the
+    full set of level polygons. Dataframes with rows are returned as is.
+
+    Keyword Args:
+        df -- dataframe: grouped result, i.e. a filtered tree table grouped by level
+    """
+    if len(df.index) > 0:
+        return df
+
+    rebuilt = {column: pd.Categorical([], dtype=df[column].dtype)
+               for column in df.columns
+               if isinstance(df[column].dtype, pd.CategoricalDtype)}
+    df = df.assign(**rebuilt)
+
+    if isinstance(df.index.dtype, pd.CategoricalDtype):
+        df.index = pd.CategoricalIndex([], dtype=df.index.dtype, name=df.index.name)
+
+    return df
+
+
+# Create plot level roll-up cube
+def create_tree_cube(tree_table, dims=None):
+    """Creates a plot level roll-up cube from the tree table by summing tree count, density and BA for each
+    unique combination of plot and tree categories. The cube keeps the tree table column names, so it can be
+    supplied as the tree_table argument to the tpa_ba_qmdbh_*, dominance_many and create_sp_richness functions,
+    which derive SID, SITE, UNIT, COMP and POOL values by summing the cube rows within each level polygon.
+
+    Keyword Args:
+        tree_table -- dataframe: input tree_table, produced by the create_tree_table function
+        dims       -- list: tree table columns kept as cube dimensions, any column used as a case column or in a
+                      filter statement must be included. If None, TR_SP, TR_HLTH, TR_CL, TR_DIA, TR_SIZE, TR_TYPE,
+                      MAST_TYPE, SP_TYPE, SP_RICH_TYPE and VERT_COMP are used.
+
+    Details: the cube has one row per plot and category combination, with the FMG hierarchy columns, the
+    dimension columns, the summed IS_TREE (count of trees), TR_DENS and TR_BA columns and a PLOT_COUNT column set
+    to 1 on the first row of each plot. Every plot in the tree table is kept, so plot counts summed from
+    PLOT_COUNT match the unique plot counts of the tree table when each plot belongs to a single polygon per
+    level. Columns not included in the cube, i.e. COL_DATE or MISC, must still be summarized from the tree table.
+    """
+    # Check input parameters are valid
+    assert isinstance(tree_table, pd.DataFrame), "must be a pandas DataFrame"
+    assert tree_table.columns.isin(["PID"]).any(), "df must contain column PID"
+
+    if dims is None:
+        dims = ['TR_SP', 'TR_HLTH', 'TR_CL', 'TR_DIA', 'TR_SIZE', 'TR_TYPE',
+                'MAST_TYPE', 'SP_TYPE', 'SP_RICH_TYPE', 'VERT_COMP']
+    assert tree_table.columns.isin(dims).sum() == len(dims), "df must contain columns specified as dims param"
+
+    # Group on the hierarchy and dimension columns, keeping nan categories
+    levels = [level for level in HIERARCHY_LEVELS if level in tree_table.columns]
+    group_columns = levels + list(dims)
+    if 'IS_TREE' in tree_table.columns:
+        tree_flag = tree_table['IS_TREE']
+    else:
+        tree_flag = is_tree(tree_table['TR_SP'])
+
+    tree_cube = tree_table[group_columns] \
+        .assign(IS_TREE=tree_flag.astype('float64'),
+                TR_DENS=tree_table['TR_DENS'],
+                TR_BA=tree_table['TR_BA']) \
+        .groupby(group_columns, as_index=False, dropna=False, sort=False, observed=True) \
+        .sum()
+
+    # Flag the first row of each plot, summed in place of counting unique plots
+    tree_cube['PLOT_COUNT'] = (~tree_cube.duplicated(subset=levels)).astype('float64')
+
+    return tree_cube
+
+
+# Enriched tables built from the FMG feature classes, see load_tables
+FMGTables = collections.namedtuple('FMGTables', ['plot_table', 'tree_table', 'fixed_df'])
+
+
+# Fingerprint of the code and resources that build the enriched tables and summaries
+def code_fingerprint(paths=None):
+    """Returns a hex digest of this module, the storage module, the crosswalk and class bin resources and any other
+    given files, so saved tables or summary state can be discarded when the code producing them changes.
+
+    Keyword Args:
+        paths -- list: further files to include, i.e. the forest_summaries module
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in [os.path.abspath(__file__), os.path.abspath(fstore.__file__),
+                 resource_path('MAST_SP_TYP_Crosswalk.csv'), resource_path('class_bins.csv')] + list(paths or []):
+        with open(path, 'rb') as code_file:
+            digest.update(code_file.read())
+
+    return digest.hexdigest()
+
+
+# Build or load the enriched FMG tables, reusing a cached copy while the inputs are unchanged
+def load_tables(prism_fc, fixed_fc, age_fc, cache_dir=None, categorical=False, partition=None, storage=None):
+    """Returns the FMGTables plot table (create_plot_table), tree table (create_tree_table) and fixed plot
+    dataframe built from the FMG feature classes. With a cache directory the tables are saved after they are
+    built and loaded from the cache on later calls while the inputs are unchanged.
+
+    Keyword Args:
+        prism_fc    -- string: path to the prism plot feature class
+        fixed_fc    -- string: path to the fixed plot feature class
+        age_fc      -- string: path to the age plot feature class
+        cache_dir   -- string: folder holding cached tables, created when missing. If None, tables are always built.
+        categorical -- boolean: if True, category and hierarchy columns are stored as pandas categoricals
+        partition   -- tuple: (level, value) pair limiting the tables to the rows of one level polygon, i.e.
+                       ('POOL', 'P1'), see partition_values. Partitions are not cached.
+        storage     -- Storage: backend reading the sources, i.e. GeoPackageStorage. If None, the sources are ESRI
+                       feature classes read with ArcpyStorage.
+
+    Details: the cache is keyed by the fingerprint of each source, the categorical option and a
+    digest of this module and the crosswalk and class bin resources, so edited plots or updated code invalidate
+    the cache automatically. Only the latest tables of the same sources and categorical option are kept, their
+    older cache files are removed when tables are saved, cache files of other sources are left in place. Cached
+    tables are pickles and loading a pickle can run code, so the cache directory must be a trusted folder that
+    only the user running the summaries can write to.
+    """
+    assert cache_dir is None or partition is None, "partitions are not cached"
+    storage = fstore.ArcpyStorage() if storage is None else storage
+
+    cache_path = None
+    if cache_dir is not None:
+        # Cache files are named by the sources, then by the source contents and code
+        sources_key = hashlib.blake2b(repr([type(storage).__name__, prism_fc, fixed_fc, age_fc, categorical])
+                                      .encode(), digest_size=8).hexdigest()
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr([storage.fingerprint(source) for source in [prism_fc, fixed_fc, age_fc]]).encode())
+        digest.update(repr([categorical, code_fingerprint()]).encode())
+        cache_path = os.path.join(cache_dir, 'fmg_tables_{0}_{1}.pkl'.format(sources_key, digest.hexdigest()))
+
+        if os.path.exists(cache_path):
+            add_message('    Inputs unchanged, loading tables from {0}'.format(cache_path))
+            return FMGTables(**pd.read_pickle(cache_path))
+
+    # Import the sources, or the rows of one partition, as pandas dataframes and build the enriched tables
+    fixed_df = storage.read_plots(fixed_fc, partition)
+    age_df = storage.read_plots(age_fc, partition)
+    prism_df = storage.read_trees(prism_fc, partition)
+    tables = FMGTables(plot_table=create_plot_table(fixed_df=fixed_df, age_df=age_df, categorical=categorical),
+                       tree_table=create_tree_table(prism_df=prism_df, categorical=categorical),
+                       fixed_df=fixed_df)
+
+    if cache_path is not None:
+        # Write to a temporary file first, so an interrupted run never leaves a partial cache file
+        os.makedirs(cache_dir, exist_ok=True)
+        pd.to_pickle(tables._asdict(), cache_path + '.tmp')
+        os.replace(cache_path + '.tmp', cache_path)
+        for old_path in glob.glob(os.path.join(cache_dir, 'fmg_tables_{0}_*.pkl'.format(sources_key))):
+            if old_path != cache_path:
+                os.remove(old_path)
+        add_message('    Tables cached to {0}'.format(cache_path))
+
+    return tables
+
+
+# Distinct values of a level field across the FMG feature classes
+def partition_values(sources, level, storage=None):
+    """Returns the sorted distinct values of a level field across feature classes, followed by None when any row
+    has no value, used to process the feature classes one level polygon at a time, see load_tables.
+
+    Keyword Args:
+        sources -- list: paths to the feature classes, i.e. the prism, fixed and age plot feature classes
+        level   -- string: field name of the partition level, i.e. POOL or COMP
+        storage -- Storage: backend reading the sources. If None, the sources are ESRI feature classes.
+    """
+    storage = fstore.ArcpyStorage() if storage is None else storage
+    values = set()
+    for source in sources:
+        values.update(storage.level_values(source, level))
+
+    return sorted(value for value in values if value is not None) + ([None] if None in values else [])
+
+
+# Content fingerprint of each stand
+def stand_fingerprints(tables):
+    """Returns a dataframe indexed by SID with the row count and a hash of the rows of each input table within each
+    stand, used to find stands whose inputs changed between summary runs, see changed_stands.
+
+    Keyword Args:
+        tables -- dictionary: input tables with a SID column by name, i.e. {'plot': plot_table, 'tree': tree_table}
+
+    Details: row hashes cover every column except SHAPE and are summed, so the stand hash does not depend on row
+    order. Rows without a SID are fingerprinted together, under a nan SID.
+    """
+    stand_dfs = []
+    for name, table in tables.items():
+        assert table.columns.isin(['SID']).any(), "{0} table must contain column SID".format(name)
+        row_hash = pd.util.hash_pandas_object(table.drop(columns=['SHAPE'], errors='ignore'), index=False)
+        stand_dfs.append(pd.DataFrame({'SID': table['SID'].astype('object').to_numpy(),
+                                       name + '_rows': np.ones(len(table.index), dtype='uint64'),
+                                       name + '_hash': row_hash.to_numpy()})
+                         .groupby('SID', dropna=False)
+                         .sum())
+
+    # Stands missing from a table have no rows there, reindexing keeps the exact uint64 hashes
+    sids = functools.reduce(pd.Index.union, [stand_df.index for stand_df in stand_dfs])
+    return pd.concat([stand_df.reindex(sids, fill_value=0) for stand_df in stand_dfs], axis='columns')
+
+
+# Stands added, removed or changed between two sets of stand fingerprints
+def changed_stands(old_fingerprints, new_fingerprints):
+    """Returns the sorted list of SIDs whose rows differ between two stand_fingerprints results, including stands
+    present in only one of them.
+
+    Keyword Args:
+        old_fingerprints -- dataframe: stand fingerprints of the previous run, produced by stand_fingerprints
+        new_fingerprints -- dataframe: stand fingerprints of the current run, produced by stand_fingerprints
+    """
+    assert list(old_fingerprints.columns) == list(new_fingerprints.columns), "fingerprints must have the same tables"
+
+    sids = old_fingerprints.index.union(new_fingerprints.index)
+    old_df = old_fingerprints.reindex(sids, fill_value=0)
+    new_df = new_fingerprints.reindex(sids, fill_value=0)
+
+    return list(sids[(old_df != new_df).any(axis='columns')])
+
+
+# Level polygons containing changed stands
+def affected_polygons(plot_tables, sids, levels):
+    """Returns a dictionary of level to the sorted list of polygons at that level holding any of the given stands,
+    i.e. the PIDs of the stands and their SITE, UNIT, COMP and POOL ancestors.
+
+    Keyword Args:
+        plot_tables -- list: plot tables, or their hierarchy columns, to look up stand members and ancestors in,
+                       i.e. the previous and current plot tables so removed plots and moved stands are included
+        sids        -- list: changed stands, produced by the changed_stands function
+        levels      -- list: field names for desired FMG levels, i.e. PID, SID, SITE, UNIT
+    """
+    member_df = pd.concat([plot_table[[level for level in HIERARCHY_LEVELS if level in plot_table.columns]]
+                           .astype('object')
+                           for plot_table in plot_tables])
+    # Missing SIDs compare unequal, the nan stand of stand_fingerprints matches plots without a SID
+    in_stands = member_df['SID'].isin([sid for sid in sids if not pd.isna(sid)])
+    if any(pd.isna(sid) for sid in sids):
+        in_stands = in_stands | member_df['SID'].isna()
+    member_df = member_df[in_stands]
+
+    return {level: sorted(member_df[level].dropna().unique()) for level in levels}
+
+
+# Per table state (fingerprint, filter bitsets) by table id, each entry is removed when its table is garbage collected
+_table_states = {}
+
+
+# Find or start the cached state for a table
+def _table_state(table):
+    """Returns the state dictionary for a table, starting a new one for new tables and for tables whose rows,
+    columns or column arrays changed. Values written in place into existing column arrays, i.e. with .loc, are not
+    detected, clear_memo must be called after such edits.
+    """
+    layout = (len(table.index), tuple(table.columns), tuple(id(values) for values in table._mgr.arrays))
+    key = id(table)
+    entry = _table_states.get(key)
+    if entry is None or entry[0]() is not table or entry[1] != layout:
+        entry = (weakref.ref(table), layout, {})
+        _table_states[key] = entry
+        weakref.finalize(table, _table_states.pop, key, None)
+
+    return entry[2]
+
+
+# Content fingerprint of a table, computed once per table
+def table_fingerprint(table):
+    """Returns a hex digest of the column names, dtypes, index and values of a dataframe. The digest is computed
+    once per table object and reused, so equal tables built separately share memoized results.
+
+    Keyword Args:
+        table -- dataframe: input table, i.e. a tree table produced by the create_tree_table function
+    """
+    assert isinstance(table, pd.DataFrame), "must be a pandas DataFrame"
+
+    state = _table_state(table)
+    if 'fingerprint' not in state:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr([(str(column), str(dtype)) for column, dtype in table.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(table, index=True).to_numpy().tobytes())
+        state['fingerprint'] = digest.hexdigest()
+
+    return state['fingerprint']
+
+
+# Result cache shared by memoized functions, off until switched on with set_memo
+_memo = {'enabled': False,
+         'max_bytes': 256 * 1024 ** 2,
+         'bytes': 0,
+         'hits': 0,
+         'misses': 0,
+         'entries': collections.OrderedDict()}
+
+
+# Switch the result cache on or off
+def set_memo(enabled=True, max_bytes=None):
+    """Switches memoization of forest_calcs results on or off for the current run. Switching the cache on or off
+    clears it and the per table fingerprints, filter bitsets and hierarchies, and resets the hit and miss counters.
+
+    Keyword Args:
+        enabled   -- boolean: if True, memoized functions reuse results for repeated calls
+        max_bytes -- integer: size cap for cached results, least recently used results are evicted first
+    """
+    if not (enabled and _memo['enabled']):
+        clear_memo()
+    _memo['enabled'] = enabled
+    if max_bytes is not None:
+        assert max_bytes >= 0, "max_bytes must not be negative"
+        _memo['max_bytes'] = max_bytes
+    _memo_evict()
+
+
+# Empty the result cache
+def clear_memo():
+    """Removes every cached result and per table state and resets the hit and miss counters. Call after modifying
+    a summarized table in place.
+    """
+    _table_states.clear()
+    _memo['entries'].clear()
+    _memo['bytes'] = 0
+    _memo['hits'] = 0
+    _memo['misses'] = 0
+
+
+# Report result cache usage
+def memo_stats():
+    """Returns a dictionary of result cache usage: enabled, hits, misses, entries, bytes and max_bytes."""
+    return {'enabled': _memo['enabled'],
+            'hits': _memo['hits'],
+            'misses': _memo['misses'],
+            'entries': len(_memo['entries']),
+            'bytes': _memo['bytes'],
+            'max_bytes': _memo['max_bytes']}
+
+
+# Evict least recently used results until the cache fits its size cap
+def _memo_evict():
+    entries = _memo['entries']
+    while _memo['bytes'] > _memo['max_bytes'] and entries:
+        _, (_, size) = entries.popitem(last=False)
+        _memo['bytes'] -= size
+
+
+# Build a hashable cache key part for an argument
+def _memo_key(value):
+    """Returns a hashable key for an argument. Tables are keyed by fingerprint and filter statements by a digest
+    of their values, raises TypeError for arguments that cannot be keyed.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, pd.DataFrame):
+        return 'table', table_fingerprint(value)
+    if isinstance(value, pd.Series):
+        digest = hashlib.blake2b(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes(), digest_size=16)
+        return 'series', str(value.dtype), digest.hexdigest()
+    if isinstance(value, np.ndarray):
+        digest = hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16)
+        return 'array', str(value.dtype), value.shape, digest.hexdigest()
+    if isinstance(value, (list, tuple)):
+        return 'list', tuple(_memo_key(item) for item in value)
+    if isinstance(value, dict):
+        return 'dict', tuple((key, _memo_key(item)) for key, item in value.items())
+    raise TypeError("cannot memoize argument of type {0}".format(type(value).__name__))
+
+
+# Decorator, reuses results for calls with the same tables and arguments while the cache is on
+def memoize(func):
+    """Wraps a forest_calcs function so repeated calls with the same table contents, level, case columns and
+    filter return a copy of the cached result instead of recomputing it. Calls pass straight through when the
+    cache is off or an argument cannot be keyed.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _memo['enabled']:
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        try:
+            key = (func.__name__,) + tuple((name, _memo_key(value)) for name, value in bound.arguments.items())
+        except TypeError:
+            return func(*args, **kwargs)
+
+        entries = _memo['entries']
+        if key in entries:
+            _memo['hits'] += 1
+            entries.move_to_end(key)
+            return entries[key][0].copy()
+
+        _memo['misses'] += 1
+        result = func(*args, **kwargs)
+
+        # Store a copy so callers can modify the returned result
+        size = int(np.sum(result.memory_usage(deep=True)))
+        if size <= _memo['max_bytes']:
+            entries[key] = (result.copy(), size)
+            _memo['bytes'] += size
+            _memo_evict()
+
+        return result
+
+    return wrapper
+
+
+# Named tree filters, each predicate takes the tree table and returns a boolean series
+TREE_FILTERS = {
+    'live': lambda df: ~df['TR_HLTH'].isin(["D", "DEAD"]),
+    'dead': lambda df: df['TR_HLTH'].isin(["D", "DEAD"]),
+    'hard_mast': lambda df: df['MAST_TYPE'] == 'Hard',
+    'soft_mast': lambda df: df['MAST_TYPE'] == 'Soft',
+    'lightseed_mast': lambda df: df['MAST_TYPE'] == 'Lightseed',
+    'wildlife': lambda df: df['TR_TYPE'] == 'Wildlife',
+    'large': lambda df: df['TR_DIA'] > 20
+}
+
+# Column filters, <prefix>:<value> keeps trees where the column equals the value, i.e. size:Saw
+TREE_FILTER_COLUMNS = {
+    'sp': 'TR_SP',
+    'hlth': 'TR_HLTH',
+    'cl': 'TR_CL',
+    'size': 'TR_SIZE',
+    'type': 'TR_TYPE',
+    'mast': 'MAST_TYPE',
+    'sp_type': 'SP_TYPE',
+    'vert': 'VERT_COMP'
+}
+
+
+# Resolve a named filter to a boolean mask, caching bitsets per tree table
+def tree_filter(tree_table, name):
+    """Returns a boolean numpy array selecting the rows of the tree table matched by a named filter. Names are keys
+    of TREE_FILTERS, i.e. live, dead, hard_mast, or column filters of the form <prefix>:<value> using the prefixes
+    in TREE_FILTER_COLUMNS, i.e. size:Saw, sp_type:Common. Names can be combined with & (and), | (or), ~ (not) and
+    parentheses, i.e. 'wildlife & ~live' or 'live & (size:Saw | size:Mature)'.
+
+    Keyword Args:
+        tree_table -- dataframe: input tree_table, produced by the create_tree_table or create_tree_cube functions
+        name       -- string: filter name or combination of filter names
+
+    Details: each filter and each combination is evaluated once per tree table and cached as a packed bitset, so
+    repeated requests for the same filter across summaries are free. The cache assumes the tree table is not
+    modified in place after filters have been requested from it.
+    """
+    # Check input parameters are valid
+    assert isinstance(tree_table, pd.DataFrame), "must be a pandas DataFrame"
+    assert isinstance(name, str), "filter name must be a string"
+
+    cache = _table_state(tree_table).setdefault('filters', {})
+    bits = _filter_bits(tree_table, _parse_filter(name), cache)
+
+    return np.unpackbits(bits, count=len(tree_table.index)).astype(bool)
+
+
+# Parse a filter name into a nested tuple expression
+def _parse_filter(name):
+    """Parses a filter name into nested tuples, ('name', n), ('not', x), ('and', x, y) or ('or', x, y), with ~
+    binding tightest and | loosest. The tuples are hashable and are used as bitset cache keys.
+    """
+    tokens = [token.strip() for token in re.findall(r'[()&|~]|[^()&|~]+', name) if token.strip()]
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or():
+        expr = parse_and()
+        while peek() == '|':
+            take()
+            expr = ('or', expr, parse_and())
+        return expr
+
+    def parse_and():
+        expr = parse_not()
+        while peek() == '&':
+            take()
+            expr = ('and', expr, parse_not())
+        return expr
+
+    def parse_not():
+        token = peek()
+        assert token is not None, "incomplete filter name: {0}".format(name)
+        if token == '~':
+            take()
+            return 'not', parse_not()
+        if token == '(':
+            take()
+            expr = parse_or()
+            assert peek() == ')', "unbalanced parentheses in filter name: {0}".format(name)
+            take()
+            return expr
+        assert token not in ')&|', "unexpected {0} in filter name: {1}".format(token, name)
+        return 'name', take()
+
+    expr = parse_or()
+    assert peek() is None, "unexpected {0} in filter name: {1}".format(peek(), name)
+
+    return expr
+
+
+# Evaluate a parsed filter expression to a packed bitset
+def _filter_bits(tree_table, expr, cache):
+    """Returns the packed bitset for a parsed filter expression, evaluating and caching each sub expression."""
+    if expr in cache:
+        return cache[expr]
+
+    if expr[0] == 'not':
+        bits = ~_filter_bits(tree_table, expr[1], cache)
+    elif expr[0] == 'and':
+        bits = _filter_bits(tree_table, expr[1], cache) & _filter_bits(tree_table, expr[2], cache)
+    elif expr[0] == 'or':
+        bits = _filter_bits(tree_table, expr[1], cache) | _filter_bits(tree_table, expr[2], cache)
+    else:
+        name = expr[1]
+        if name in TREE_FILTERS:
+            mask = TREE_FILTERS[name](tree_table)
+        else:
+            prefix, sep, value = name.partition(':')
+            assert sep and prefix in TREE_FILTER_COLUMNS, "unknown tree filter: {0}".format(name)
+            column = TREE_FILTER_COLUMNS[prefix]
+            assert tree_table.columns.isin([column]).any(), "df must contain column {0}".format(column)
+            mask = tree_table[column] == value
+        bits = np.packbits(pd.Series(mask).fillna(False).to_numpy(dtype=bool))
+
+    cache[expr] = bits
+
+    return bits
+
+
+# Single pass TPA, BA, QM DBH engine used by the tpa_ba_qmdbh_* functions
+@memoize
+def tpa_ba_qmdbh(tree_table, filter_statement, level, case_columns=None, wide=False, sum_tr_ba=False):
+    """Creates a dataframe with tree count, stand density, plot count, TPA, BA and QM DBH columns for each
+    level polygon, or for each level polygon and combination of case column values. Every sum is produced by a
+    single groupby().sum() over precomputed numeric columns, replacing the per-group agg_tree_count and
+    agg_plot_count callbacks.
+
+    Keyword Args:
+        tree_table       -- dataframe: input tree_table, produced by the create_tree_table function
+        filter_statement -- pandas series: filter statement to be used on the input dataframe, should be a full filter
+                            statement i.e. dataframe.field.filter. If no filter is required, None should be supplied.
+        level            -- string: field name for desired FMG level, i.e. PID, SID, SITE, UNIT
+        case_columns     -- list: field names for the groupby, ba, tpa and qm dbh will be calculated for each
+                            combination of categories in these fields. None or an empty list groups on level only.
+        wide             -- boolean: if True, pivots the single case column to BA_<case>_<value>,
+                            QM_DBH_<case>_<value> and TPA_<case>_<value> columns, one row per level polygon
+        sum_tr_ba        -- boolean: if True, BA is the sum of TR_BA for each group (plot level functions),
+                            otherwise BA is (tree_count * BAF) / plot_count
+
+    Details: plot_count is the unfiltered count of unique plots in each level polygon. Only groups present after
+    the filter is applied are returned, joining back to the full set of level polygons is left to the caller. In
+    long form the returned columns are level, case columns, tree_count, stand_dens, plot_count, TPA, BA, QM_DBH.
+    """
+    # Check input parameters are valid
+    assert isinstance(tree_table, pd.DataFrame), "must be a pandas DataFrame"
+    assert tree_table.columns.isin([level]).any(), "df must contain column specified as level param"
+    assert tree_table.columns.isin(["PID"]).any(), "df must contain column PID"
+
+    case_columns = [] if case_columns is None else list(case_columns)
+    assert tree_table.columns.isin(case_columns).sum() == len(case_columns), \
+        "df must contain columns specified as case columns param"
+    assert not wide or len(case_columns) == 1, "wide output requires a single case column"
+
+    # Single grouped sum of every numeric column
+    group_columns = [level] + case_columns
+    out_df = _tpa_sums(tree_table, filter_statement, group_columns)
+
+    return _tpa_metrics(tree_table, out_df, level, case_columns, wide, sum_tr_ba)
+
+
+# Single pass TPA, BA, QM DBH engine for many filters
+def tpa_ba_qmdbh_many(tree_table, filter_statements, level, case_columns=None, wide=False, sum_tr_ba=False):
+    """Creates the tpa_ba_qmdbh dataframe of each of several filters in a single pass. The rows selected by each
+    filter are stacked with a filter number as an extra grouping column, so every filter is summed by one
+    groupby().sum() instead of one per filter.
+
+    Keyword Args:
+        tree_table        -- dataframe: input tree_table, produced by the create_tree_table function
+        filter_statements -- list: filter names (see tree_filter), boolean series or None (all trees)
+        level             -- string: field name for desired FMG level, i.e. PID, SID, SITE, UNIT
+        case_columns      -- list: field names for the groupby, see tpa_ba_qmdbh
+        wide              -- boolean: if True, pivots the single case column to columns, see tpa_ba_qmdbh
+        sum_tr_ba         -- boolean: if True, BA is the sum of TR_BA for each group, see tpa_ba_qmdbh
+
+    Details: returns a list of dataframes in the order of filter_statements, each equal to the tpa_ba_qmdbh
+    result for that filter.
+    """
+    # Check input parameters are valid
+    assert isinstance(tree_table, pd.DataFrame), "must be a pandas DataFrame"
+    assert tree_table.columns.isin([level]).any(), "df must contain column specified as level param"
+    assert tree_table.columns.isin(["PID"]).any(), "df must contain column PID"
+
+    case_columns = [] if case_columns is None else list(case_columns)
+    assert tree_table.columns.isin(case_columns).sum() == len(case_columns), \
+        "df must contain columns specified as case columns param"
+    assert not wide or len(case_columns) == 1, "wide output requires a single case column"
+
+    # One grouped sum over the stacked filters
+    group_columns = [level] + case_columns
+    stack_df = _tpa_sums(tree_table, filter_statements, group_columns, stacked=True)
+
+    # Split the sums by filter and finish each as tpa_ba_qmdbh does
+    filter_numbers = stack_df.pop('FILTER').to_numpy()
+    out_dfs = []
+    for number in range(len(filter_statements)):
+        out_df = stack_df[filter_numbers == number].reset_index(drop=True)
+        out_dfs.append(_tpa_metrics(tree_table, out_df, level, case_columns, wide, sum_tr_ba))
+
+    return out_dfs
+
+
+# Row positions selected by each of many filters, stacked, with the filter number of each row
+def _filter_stack(tree_table, filter_statements):
+    positions = [np.arange(len(tree_table.index)) if mask is None
+                 else np.flatnonzero(tree_filter(tree_table, mask)) if isinstance(mask, str)
+                 else np.flatnonzero(pd.Series(mask).fillna(False).to_numpy(dtype=bool))
+                 for mask in filter_statements]
+
+    return np.concatenate(positions), np.repeat(np.arange(len(positions)), [len(p) for p in positions])
+
+
+# Grouped tree count, stand density and BA sums of a filter, or of many filters stacked
+def _tpa_sums(tree_table, filter_statement, group_columns, stacked=False):
+    # Precompute numeric columns, one row per tree record
+    if 'IS_TREE' in tree_table.columns:
+        tree_flag = tree_table['IS_TREE']
+    else:
+        tree_flag = is_tree(tree_table['TR_SP'])
+
+    sum_df = tree_table[group_columns] \
+        .assign(tree_count=tree_flag.astype('float64'),
+                stand_dens=tree_table['TR_DENS'],
+                TR_BA=tree_table['TR_BA'])
+
+    if not stacked:
+        # Resolve named filters, see tree_filter
+        if isinstance(filter_statement, str):
+            filter_statement = tree_filter(tree_table, filter_statement)
+
+        if filter_statement is not None:
+            sum_df = sum_df[filter_statement]
+
+        # Single grouped sum of every numeric column
+        return sum_df \
+            .groupby(group_columns, as_index=False, observed=True) \
+            .sum()
+
+    # Stack the rows selected by each filter, tagging each row with its filter number
+    rows, filter_numbers = _filter_stack(tree_table, filter_statement)
+    sum_df = sum_df \
+        .iloc[rows] \
+        .assign(FILTER=filter_numbers)
+
+    return sum_df \
+        .groupby(['FILTER'] + group_columns, as_index=False, observed=True) \
+        .sum()
+
+
+# Plot count, TPA, BA and QM DBH from grouped sums, pivoted to wide on request
+def _tpa_metrics(tree_table, out_df, level, case_columns, wide, sum_tr_ba):
+    # Add unfiltered plot count for each level polygon
+    plot_count = level_plot_count(tree_table, level)
+    out_df['plot_count'] = out_df[level].map(plot_count).astype('float64')
+
+    # Add and calculate TPA, BA, QM_DBH
+    baf = 10
+    out_df['TPA'] = out_df['stand_dens'] / out_df['plot_count']
+    if sum_tr_ba:
+        out_df['BA'] = out_df['TR_BA']
+    else:
+        out_df['BA'] = (out_df['tree_count'] * baf) / out_df['plot_count']
+    out_df['QM_DBH'] = np.where(out_df['tree_count'] > 0,
+                                (np.sqrt((out_df['BA'] / out_df['TPA']) / 0.005454154)),
+                                0)
+    out_df = out_df.drop(columns=['TR_BA'])
+
+    if not wide:
+        return out_df
+
+    # Pivot metrics to columns, one set per case
+    case_column = case_columns[0]
+    pivot_df = out_df \
+        .pivot_table(
+            index=level,
+            columns=case_column,
+            values=['BA', 'TPA', 'QM_DBH'],
+            fill_value=0,
+            observed=True) \
         .reset_index()
 
-    # Count the rows in the filtered dataset
-    invsp_filter_df_len = len(invsp_filter_df)
+    # Flatten column multi index
+    pivot_df.columns = list(map(str("_" + case_column + "_").join, pivot_df.columns))
+    pivot_df = pivot_df.rename(columns={str(level + "_" + case_column + "_"): level})
+
+    return pivot_df
 
-    # do the invasive species operations only if there are invasive species present
 
-    if invsp_filter_df_len == 0:
+# Unfiltered plot count by level
+@memoize
+def level_plot_count(tree_table, level):
+    """Creates a series of unique plot counts, indexed by level polygon, from the unfiltered tree table. When the
+    tree table is a roll-up cube from create_tree_cube, the PLOT_COUNT column is summed instead.
 
-        # Add and populate invasive species columns
-        plot_table['INV_SP'] = ''
-        plot_table['INV_PRESENT'] = 'No'
+    Keyword Args:
+        tree_table -- dataframe: input tree_table, produced by the create_tree_table function
+        level      -- string: field name for desired FMG level, i.e. PID, SID, SITE, UNIT
+    """
+    if 'PLOT_COUNT' in tree_table.columns:
+        plot_count = tree_table \
+            .groupby(level, observed=True)['PLOT_COUNT'] \
+            .sum()
+    else:
+        plot_count = tree_table \
+            .groupby(level, observed=True)['PID'] \
+            .nunique()
 
-        # Clean up plot table
-        plot_table = plot_table\
-            .reset_index() \
-            .drop(columns=['index', 'level_0'], errors='ignore') \
-            .astype(dtype={"INV_SP": 'string', "INV_PRESENT": 'string'}) \
-            .fillna(value={"AGE_MISC": ''})
+    plot_count = plot_count \
+        .astype('float64') \
+        .rename('plot_count')
 
-    elif invsp_filter_df_len != 0:
+    return plot_count
 
-        # add and populate invasive presence column
-        invsp_filter_df['INV_PRESENT'] = 'Yes'
 
-        # add and populate invasive species present column
-        invsp_filter_df['INV_SP'] = invsp_filter_df \
-            .apply(lambda x: inv_sp_list([x['GRD_SP1'], x['GRD_SP2'], x['GRD_SP3'],
-                                          x['NOT_SP1'], x['NOT_SP2'], x['NOT_SP3'],
-                                          x['NOT_SP4'], x['NOT_SP5']]), axis=1)
+# Join results back to the full set of level polygons
+def level_join(tree_table, summary_df, level, how='left', fill=True):
+    """Joins a summary dataframe back to the full, unfiltered set of level polygons in the tree table. Mirrors the
+    legacy join pattern used by the tpa_ba_qmdbh_* functions, including the leading index column.
 
-        # Set indices for merge
-        plot_table.set_index('PID')
-        invsp_filter_df.set_index('PID')
+    Keyword Args:
+        tree_table -- dataframe: input tree_table, produced by the create_tree_table function
+        summary_df -- dataframe: summary rows, containing a column named for the level
+        level      -- string: field name for desired FMG level, i.e. PID, SID, SITE, UNIT
+        how        -- string: merge type, left keeps every level polygon, inner keeps only summarized polygons
+        fill       -- boolean: if True, nans in the joined dataframe are filled with 0
+    """
+    levels_df = level_plot_count(tree_table, level) \
+        .to_frame() \
+        .drop(columns=['plot_count'])
+
+    out_df = levels_df \
+        .merge(right=summary_df,
+               how=how,
+               on=level) \
+        .reset_index()
 
-        plot_table = plot_table \
-            .merge(right=invsp_filter_df,
-                   how='left')\
-            .reset_index()\
-            .drop(columns=['index', 'level_0']) \
-            .astype(dtype={"INV_SP": 'string', "INV_PRESENT": 'string'}) \
-            .fillna(value={"AGE_MISC": '', "INV_SP": '', "INV_PRESENT": 'No'})
+    # Test merged df for data, then fillna if data
+    if fill and len(out_df.index) > 0:
+        # Categoricals only accept existing categories, decode columns with nans and leave the rest unfilled
+        nan_columns = [column for column in out_df.columns
+                       if isinstance(out_df[column].dtype, pd.CategoricalDtype) and out_df[column].isna().any()]
+        out_df = out_df.assign(**decode_categories(out_df[nan_columns]))
+        out_df = out_df.fillna({column: 0 for column in out_df.columns
+                                if not isinstance(out_df[column].dtype, pd.CategoricalDtype)})
 
-    return plot_table
+    return out_df
 
 
 # Generate TPA, BA, QM DBH at PID level
+@memoize
 def tpa_ba_qmdbh_plot(tree_table, filter_statement):
     """Creates a dataframe with BA, TPA and QM DBH columns at the plot level, based on the specified filter.
 
@@ -761,101 +1893,43 @@ def tpa_ba_qmdbh_plot(tree_table, filter_statement):
         filter_statement -- pandas series: filter statement to be used on the input dataframe, should be a full filter
                             statement i.e. dataframe.field.filter. If no filter is required, None should be supplied.
 
-    Details: filter statement should not be a string, rather just the pandas dataframe filter statement:
-    for live trees use: ~tree_table.TR_HLTH.isin(["D", "DEAD"])
-    for dead trees use: tree_table.TR_HLTH.isin(["D", "DEAD"])
+    Details: filter statement should be a filter name, see tree_filter, or the pandas dataframe filter statement:
+    for live trees use: 'live' or ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    for dead trees use: 'dead' or tree_table.TR_HLTH.isin(["D", "DEAD"])
     if no filter is required, None should be passed in as the keyword argument.
     """
     # Check input parameters are valid
     assert isinstance(tree_table, pd.DataFrame), "must be a pandas DataFrame"
     assert tree_table.columns.isin(["PID"]).any(), "df must contain column PID"
 
-    # Create data frame that preserves unfiltered count of plots by level
-    plotcount_df = tree_table \
-        .groupby('PID', as_index=False) \
-        .agg(plot_count=('PID', agg_plot_count))\
-        .set_index('PID')
+    # Group and sum tree table
+    filtered_df = tpa_ba_qmdbh(tree_table, filter_statement, 'PID', sum_tr_ba=True)
 
-    # Test for filter statement and run script based on filter or no filter
-    if filter_statement is not None:
+    return _tpa_plot_join(tree_table, filtered_df, filter_statement)
+
+
+# Enforce plot TPA, BA, QM DBH dtypes and join back to the full set of PIDs
+def _tpa_plot_join(tree_table, filtered_df, filter_statement):
+    filtered_df = filtered_df.drop(columns=['stand_dens'])
 
-        # Filter, group and sum tree table
-        filtered_df = tree_table[filter_statement] \
-            .groupby(['PID'], as_index=False) \
-            .agg(
-                tree_count=('TR_SP', agg_tree_count),
-                plot_count=('PID', agg_plot_count),
-                TPA=('TR_DENS', sum),
-                BA=('TR_BA', sum)
-            )
-
-        # Add and Calculate QM DBH
-        filtered_df['QM_DBH'] = np.where(filtered_df['tree_count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Enforce dtypes
+    # Enforce dtypes, counts are only cast to integers when filtered
+    if filter_statement is not None:
         filtered_df = filtered_df.astype({'tree_count': 'int32',
                                           'plot_count': 'int32',
                                           'TPA': 'float64',
                                           'BA': 'float64',
                                           'QM_DBH': 'float64'})
-
-        # Set index for merge
-        filtered_df.set_index('PID')
-
-        # Join results back to full set of PIDs and fill nans with 0
-        merge_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=filtered_df,
-                   how='left',
-                   on='PID') \
-            .reset_index()
-
-        # Test merged df for data, then fillna if data
-        if len(merge_df.index) > 0:
-            out_df = merge_df.fillna(0)
-        else:
-            out_df = merge_df
-
-        return out_df
-
-    elif filter_statement is None:
-
-        # Group and sum tree table
-        filtered_df = tree_table \
-            .groupby(['PID'], as_index=False) \
-            .agg(
-                tree_count=('TR_SP', agg_tree_count),
-                plot_count=('PID', agg_plot_count),
-                TPA=('TR_DENS', sum),
-                BA=('TR_BA', sum)
-            )
-
-        # Add and Calculate QM DBH
-        filtered_df['QM_DBH'] = np.where(filtered_df['tree_count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Enforce QM_DBH dtype
+    else:
         filtered_df = filtered_df.astype({'QM_DBH': 'float64'})
 
-        # Set index for merge
-        filtered_df.set_index('PID')
+    # Join results back to full set of PIDs and fill nans with 0
+    out_df = level_join(tree_table, filtered_df, 'PID', how='left')
 
-        # Join results back to full set of PIDs and fill nans with 0
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=filtered_df,
-                   how='left',
-                   on='PID') \
-            .fillna(0) \
-            .reset_index()
-
-        return out_df
+    return out_df
 
 
 # Generate TPA, BA, QM DBH given a case field at PID level (pivots on case field to wide)
+@memoize
 def tpa_ba_qmdbh_plot_by_case(tree_table, filter_statement, case_column):
     """Creates a dataframe with BA, TPA and QM DBH columns at the plot level. The function pivots on the
     case column supplied resulting in BA, TPA and QM DBH columns for each category in the case column.
@@ -869,108 +1943,28 @@ def tpa_ba_qmdbh_plot_by_case(tree_table, filter_statement, case_column):
         case_column      -- string: column name for groupby and pivot_table methods, ba, tpa and qm dbh will be calculated
                             for each case in this column
 
-    Details: filter statement should not be a string, rather just the pandas dataframe filter statement:
-    for live trees use: ~tree_table.TR_HLTH.isin(["D", "DEAD"])
-    for dead trees use: tree_table.TR_HLTH.isin(["D", "DEAD"])
+    Details: filter statement should be a filter name, see tree_filter, or the pandas dataframe filter statement:
+    for live trees use: 'live' or ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    for dead trees use: 'dead' or tree_table.TR_HLTH.isin(["D", "DEAD"])
     if no filter is required, None should be passed in as the keyword argument.
     """
     # Check input parameters are valid
     assert isinstance(tree_table, pd.DataFrame), "must be a pandas DataFrame"
-    print(tree_table.columns)
     assert tree_table.columns.isin([case_column]).any(), "df must contain column specified as group column param"
     assert tree_table.columns.isin(["PID"]).any(), "df must contain column PID"
 
-    # Create data frame that preserves unfiltered count of plots by level
-    plotcount_df = tree_table \
-        .groupby('PID', as_index=False) \
-        .agg(plot_count=('PID', agg_plot_count))\
+    # Group, sum and pivot tree table
+    pivot_df = tpa_ba_qmdbh(tree_table, filter_statement, 'PID', [case_column], wide=True, sum_tr_ba=True) \
         .set_index('PID')
 
-    # Test for filter statement and run script based on filter or no filter
-    if filter_statement is not None:
-
-        # Filter, group and sum tree table
-        filtered_df = tree_table[filter_statement] \
-            .groupby(['PID', case_column], as_index=False) \
-            .agg(
-                tree_count=('TR_SP', agg_tree_count),
-                plot_count=('PID', agg_plot_count),
-                TPA=('TR_DENS', sum),
-                BA=('TR_BA', sum)
-            )
-
-        # Add and Calculate QM DBH
-        filtered_df['QM_DBH'] = np.where(filtered_df['tree_count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Pivot sizes and metrics to columns
-        pivot_df = filtered_df\
-            .pivot_table(
-                index='PID',
-                columns=case_column,
-                values=['BA', 'TPA', 'QM_DBH'],
-                fill_value=0)\
-            .reset_index()
-
-        # flatten column multi index and set index for merge
-        pivot_df.columns = list(map(str("_" + case_column + "_").join, pivot_df.columns))
-        fixpivot_df = pivot_df.rename(columns={str('PID' + "_" + case_column + "_"): 'PID'}).set_index('PID')
-
-        # Join results back to full set of PIDs and fill nans with 0
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=fixpivot_df,
-                   how='left',
-                   on='PID') \
-            .fillna(0) \
-            .reset_index()
+    # Join results back to full set of PIDs and fill nans with 0
+    out_df = level_join(tree_table, pivot_df, 'PID', how='left')
 
-        return out_df
-
-    elif filter_statement is None:
-
-        # Group and sum tree table
-        filtered_df = tree_table \
-            .groupby(['PID', case_column], as_index=False) \
-            .agg(
-                tree_count=('TR_SP', agg_tree_count),
-                plot_count=('PID', agg_plot_count),
-                TPA=('TR_DENS', sum),
-                BA=('TR_BA', sum)
-            )
-
-        # Add and Calculate QM DBH
-        filtered_df['QM_DBH'] = np.where(filtered_df['tree_count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Pivot sizes and metrics to columns
-        pivot_df = filtered_df \
-            .pivot_table(
-                index='PID',
-                columns=case_column,
-                values=['BA', 'TPA', 'QM_DBH'],
-                fill_value=0) \
-            .reset_index()
-
-        # flatten column multi index and set index for merge
-        pivot_df.columns = list(map(str("_" + case_column + "_").join, pivot_df.columns))
-        fixpivot_df = pivot_df.rename(columns={str('PID' + "_" + case_column + "_"): 'PID'}).set_index('PID')
-
-        # Join results back to full set of PIDs and fill nans with 0
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=fixpivot_df,
-                   how='left',
-                   on='PID') \
-            .fillna(0) \
-            .reset_index()
-
-        return out_df
+    return out_df
 
 
 # Generate TPA, BA, QM DBH given a case field at PID level (no pivot, stays long)
+@memoize
 def tpa_ba_qmdbh_plot_by_case_long(tree_table, filter_statement, case_column):
     """Creates a dataframe with BA, TPA and QM DBH columns at the plot level. The function does not pivot
     on the case field, instead leaving it in long form. Each row of the resulting data frame will be a
@@ -983,9 +1977,9 @@ def tpa_ba_qmdbh_plot_by_case_long(tree_table, filter_statement, case_column):
         case_column      -- string: column name for groupby and pivot_table methods, ba, tpa and qm dbh will be calculated
                             for each case in this column
 
-    Details: filter statement should not be a string, rather just the pandas dataframe filter statement:
-    for live trees use: ~tree_table.TR_HLTH.isin(["D", "DEAD"])
-    for dead trees use: tree_table.TR_HLTH.isin(["D", "DEAD"])
+    Details: filter statement should be a filter name, see tree_filter, or the pandas dataframe filter statement:
+    for live trees use: 'live' or ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    for dead trees use: 'dead' or tree_table.TR_HLTH.isin(["D", "DEAD"])
     if no filter is required, None should be passed in as the keyword argument.
     """
     # Check input parameters are valid
@@ -993,69 +1987,18 @@ def tpa_ba_qmdbh_plot_by_case_long(tree_table, filter_statement, case_column):
     assert tree_table.columns.isin([case_column]).any(), "df must contain column specified as group column param"
     assert tree_table.columns.isin(["PID"]).any(), "df must contain column PID"
 
-    # Create data frame that preserves unfiltered count of plots by level
-    plotcount_df = tree_table \
-        .groupby('PID', as_index=False) \
-        .agg(plot_count=('PID', agg_plot_count))\
-        .set_index('PID')
-
-    # Test for filter statement and run script based on filter or no filter
-    if filter_statement is not None:
-
-        # Filter, group and sum tree table
-        filtered_df = tree_table[filter_statement] \
-            .groupby(['PID', case_column], as_index=False) \
-            .agg(
-                tree_count=('TR_SP', agg_tree_count),
-                plot_count=('PID', agg_plot_count),
-                TPA=('TR_DENS', sum),
-                BA=('TR_BA', sum)
-            )
-
-        # Add and Calculate QM DBH
-        filtered_df['QM_DBH'] = np.where(filtered_df['tree_count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Join results back to full set of PIDs
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=filtered_df,
-                   how='inner',
-                   on='PID') \
-            .reset_index()
+    # Group and sum tree table
+    filtered_df = tpa_ba_qmdbh(tree_table, filter_statement, 'PID', [case_column], sum_tr_ba=True) \
+        .drop(columns=['stand_dens'])
 
-        return out_df
-
-    elif filter_statement is None:
-
-        # Group and sum tree table
-        filtered_df = tree_table \
-            .groupby(['PID', case_column], as_index=False) \
-            .agg(
-                tree_count=('TR_SP', agg_tree_count),
-                plot_count=('PID', agg_plot_count),
-                TPA=('TR_DENS', sum),
-                BA=('TR_BA', sum)
-            )
-
-        # Add and Calculate QM DBH
-        filtered_df['QM_DBH'] = np.where(filtered_df['tree_count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Join results back to full set of PIDs
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=filtered_df,
-                   how='inner',
-                   on='PID') \
-            .reset_index()
+    # Join results back to full set of PIDs
+    out_df = level_join(tree_table, filtered_df, 'PID', how='inner', fill=False)
 
-        return out_df
+    return out_df
 
 
 # Generate TPA, BA, QM DBH given multiple case fields at PID level (no pivot, stays long)
+@memoize
 def tpa_ba_qmdbh_plot_by_multi_case_long(tree_table, filter_statement, case_columns):
     """Creates a dataframe with BA, TPA and QM DBH columns at the plot level. The function does not pivot
     on the case field, instead leaving it in long form. Each row of the resulting data frame will be a
@@ -1068,9 +2011,9 @@ def tpa_ba_qmdbh_plot_by_multi_case_long(tree_table, filter_statement, case_colu
         case_column      -- list: column names for groupby and pivot_table methods, ba, tpa and qm dbh will be calculated
                             for each case in this column
 
-    Details: filter statement should not be a string, rather just the pandas dataframe filter statement:
-    for live trees use: ~tree_table.TR_HLTH.isin(["D", "DEAD"])
-    for dead trees use: tree_table.TR_HLTH.isin(["D", "DEAD"])
+    Details: filter statement should be a filter name, see tree_filter, or the pandas dataframe filter statement:
+    for live trees use: 'live' or ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    for dead trees use: 'dead' or tree_table.TR_HLTH.isin(["D", "DEAD"])
     if no filter is required, None should be passed in as the keyword argument.
     """
     # Check input parameters are valid
@@ -1078,82 +2021,24 @@ def tpa_ba_qmdbh_plot_by_multi_case_long(tree_table, filter_statement, case_colu
     assert tree_table.columns.isin(case_columns).any(), "df must contain columns specified as group column param"
     assert tree_table.columns.isin(["PID"]).any(), "df must contain column PID"
 
-    # Create data frame that preserves unfiltered count of plots by level
-    plotcount_df = tree_table \
-        .groupby('PID', as_index=False) \
-        .agg(plot_count=('PID', agg_plot_count)) \
-        .set_index('PID')
-
-    # Add level to case columns
-    case_columns.insert(0, 'PID')
-
-    # Test for filter statement and run script based on filter or no filter
-    if filter_statement is not None:
-
-        # Filter, group and sum tree table
-        filtered_df = tree_table[filter_statement] \
-            .groupby(by=case_columns, as_index=False) \
-            .agg(
-                Tree_Count=('TR_SP', agg_tree_count),
-                Plot_Count=('PID', agg_plot_count),
-                TPA=('TR_DENS', sum),
-                BA=('TR_BA', sum)
-            )
-
-        # Add and Calculate QM DBH
-        filtered_df['QM_DBH'] = np.where(filtered_df['Tree_Count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Join results back to full set of PIDs
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=filtered_df,
-                   how='inner',
-                   on='PID') \
-            .reset_index()
-
-        # Set dtypes
-        out_df = out_df.astype({'TPA': 'float64', 'QM_DBH': 'float64'})\
-                       .fillna(value={'QM_DBH': 0})\
-                       .drop(columns=['index'])
+    # Group and sum tree table
+    filtered_df = tpa_ba_qmdbh(tree_table, filter_statement, 'PID', case_columns, sum_tr_ba=True) \
+        .drop(columns=['stand_dens']) \
+        .rename(columns={'tree_count': 'Tree_Count', 'plot_count': 'Plot_Count'})
 
-        return out_df
+    # Join results back to full set of PIDs
+    out_df = level_join(tree_table, filtered_df, 'PID', how='inner', fill=False)
 
-    elif filter_statement is None:
-
-        # Group and sum tree table
-        filtered_df = tree_table \
-            .groupby(by=case_columns, as_index=False) \
-            .agg(
-                Tree_Count=('TR_SP', agg_tree_count),
-                Plot_Count=('PID', agg_plot_count),
-                TPA=('TR_DENS', sum),
-                BA=('TR_BA', sum)
-            )
-
-        # Add and Calculate QM DBH
-        filtered_df['QM_DBH'] = np.where(filtered_df['Tree_Count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Join results back to full set of PIDs
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=filtered_df,
-                   how='inner',
-                   on='PID') \
-            .reset_index()
-
-        # Set dtypes
-        out_df = out_df.astype({'TPA': 'float64', 'QM_DBH': 'float64'})\
-                       .fillna(value={'QM_DBH': 0})\
-                       .drop(columns=['index'])
+    # Set dtypes
+    out_df = out_df.astype({'TPA': 'float64', 'QM_DBH': 'float64'})\
+                   .fillna(value={'QM_DBH': 0})\
+                   .drop(columns=['index'])
 
-        return out_df
+    return out_df
 
 
 # Generate TPA, BA, QM DBH at non-PID levels
+@memoize
 def tpa_ba_qmdbh_level(tree_table, filter_statement, level):
     """Creates a dataframe with BA, TPA and QM DBH columns at a specified level based on the provided filter.
 
@@ -1163,99 +2048,27 @@ def tpa_ba_qmdbh_level(tree_table, filter_statement, level):
                             statement i.e. dataframe.field.filter. If no filter is required, None should be supplied.
         level            -- string: field name for desired FMG level, i.e. SID, SITE, UNIT
 
-    Details: filter statement should not be a string, rather just the pandas dataframe filter statement:
-    for live trees use: ~tree_table.TR_HLTH.isin(["D", "DEAD"])
-    for dead trees use: tree_table.TR_HLTH.isin(["D", "DEAD"])
+    Details: filter statement should be a filter name, see tree_filter, or the pandas dataframe filter statement:
+    for live trees use: 'live' or ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    for dead trees use: 'dead' or tree_table.TR_HLTH.isin(["D", "DEAD"])
     if no filter is required, None should be passed in as the keyword argument.
     """
 
-    # Check input parameters are valid
-    assert isinstance(tree_table, pd.DataFrame), "must be a pandas DataFrame"
-    assert tree_table.columns.isin([level]).any(), "df must contain column specified as level param"
-
-    # Create data frame that preserves unfiltered count of plots by level
-    plotcount_df = tree_table \
-        .groupby(level, as_index=False) \
-        .agg(plot_count=('PID', agg_plot_count)) \
-        .set_index(level)
-
-    # Test for filter statement and run script based on filter or no filter
-    if filter_statement is not None:
-
-        # Filter, group and sum tree table, add unfiltered plot count field
-        filtered_df = tree_table[filter_statement] \
-            .groupby([level], as_index=False) \
-            .agg(
-                tree_count=('TR_SP', agg_tree_count),
-                stand_dens=('TR_DENS', sum)
-            ) \
-            .set_index(level) \
-            .merge(right=plotcount_df,
-                   how='left',
-                   on=level) \
-            .reset_index()
-
-        # Add and calculate TPA, BA, QM_DBH
-        baf = 10
-        filtered_df['TPA'] = filtered_df['stand_dens'] / filtered_df['plot_count']
-        filtered_df['BA'] = (filtered_df['tree_count'] * baf) / filtered_df['plot_count']
-        filtered_df['QM_DBH'] = np.where(filtered_df['tree_count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Set index for merge
-        filtered_df.set_index(level)
-
-        # Join results back to full set of level polygons and fill nans with 0
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=filtered_df,
-                   how='left',
-                   on=level) \
-            .fillna(0) \
-            .reset_index()
+    # Check input parameters are valid
+    assert isinstance(tree_table, pd.DataFrame), "must be a pandas DataFrame"
+    assert tree_table.columns.isin([level]).any(), "df must contain column specified as level param"
 
-        return out_df
+    # Group and sum tree table
+    filtered_df = tpa_ba_qmdbh(tree_table, filter_statement, level)
 
-    elif filter_statement is None:
-
-        # Group and sum tree table
-        filtered_df = tree_table \
-            .groupby([level], as_index=False) \
-            .agg(
-                tree_count=('TR_SP', agg_tree_count),
-                stand_dens=('TR_DENS', sum),
-            ) \
-            .set_index(level) \
-            .merge(right=plotcount_df,
-                   how='left',
-                   on=level) \
-            .reset_index()
-
-        # Add and calculate TPA, BA, QM_DBH
-        baf = 10
-        filtered_df['TPA'] = filtered_df['stand_dens'] / filtered_df['plot_count']
-        filtered_df['BA'] = (filtered_df['tree_count'] * baf) / filtered_df['plot_count']
-        filtered_df['QM_DBH'] = np.where(filtered_df['tree_count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Set index for merge
-        filtered_df.set_index(level)
-
-        # Join results back to full set of level polygons and fill nan with 0
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=filtered_df,
-                   how='left',
-                   on=level) \
-            .fillna(0) \
-            .reset_index()
+    # Join results back to full set of level polygons and fill nans with 0
+    out_df = level_join(tree_table, filtered_df, level, how='left')
 
-        return out_df
+    return out_df
 
 
 # Generate TPA, BA, QM DBH given a case field at non-PID levels (pivots on case field to wide)
+@memoize
 def tpa_ba_qmdbh_level_by_case(tree_table, filter_statement, case_column, level):
     """Creates a dataframe with BA, TPA and QM DBH columns at a specified level. The function pivots on the
     case column supplied resulting in BA, TPA and QM DBH columns for each category in the case column.
@@ -1270,9 +2083,9 @@ def tpa_ba_qmdbh_level_by_case(tree_table, filter_statement, case_column, level)
                             calculated for each category in this field
         level            -- string: field name for desired FMG level, i.e. SID, SITE, UNIT
 
-    Details: filter statement should not be a string, rather just the pandas dataframe filter statement:
-    for live trees use: ~tree_table.TR_HLTH.isin(["D", "DEAD"])
-    for dead trees use: tree_table.TR_HLTH.isin(["D", "DEAD"])
+    Details: filter statement should be a filter name, see tree_filter, or the pandas dataframe filter statement:
+    for live trees use: 'live' or ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    for dead trees use: 'dead' or tree_table.TR_HLTH.isin(["D", "DEAD"])
     if no filter is required, None should be passed in as the keyword argument.
     """
 
@@ -1281,109 +2094,18 @@ def tpa_ba_qmdbh_level_by_case(tree_table, filter_statement, case_column, level)
     assert tree_table.columns.isin([case_column]).any(), "df must contain column specified as group column param"
     assert tree_table.columns.isin([level]).any(), "df must contain column specified as level param"
 
-    # Create data frame that preserves unfiltered count of plots by level
-    plotcount_df = tree_table \
-        .groupby(level, as_index=False) \
-        .agg(plot_count=('PID', agg_plot_count)) \
+    # Group, sum and pivot tree table
+    pivot_df = tpa_ba_qmdbh(tree_table, filter_statement, level, [case_column], wide=True) \
         .set_index(level)
 
-    # Test for filter statement and run script based on filter or no filter
-    if filter_statement is not None:
-
-        # Filter, group and sum tree table, add unfiltered plot count field
-        filtered_df = tree_table[filter_statement] \
-            .groupby([level, case_column], as_index=False) \
-            .agg(
-                tree_count=('TR_SP', agg_tree_count),
-                stand_dens=('TR_DENS', sum)
-            ) \
-            .set_index(level) \
-            .merge(right=plotcount_df,
-                   how='left',
-                   on=level) \
-            .reset_index()
-
-        # Add and calculate TPA, BA, QM_DBH
-        baf = 10
-        filtered_df['TPA'] = filtered_df['stand_dens'] / filtered_df['plot_count']
-        filtered_df['BA'] = (filtered_df['tree_count'] * baf) / filtered_df['plot_count']
-        filtered_df['QM_DBH'] = np.where(filtered_df['tree_count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Pivot sizes and metrics to columns
-        pivot_df = filtered_df \
-            .pivot_table(
-                index=level,
-                columns=case_column,
-                values=['BA', 'TPA', 'QM_DBH'],
-                fill_value=0) \
-            .reset_index()
-
-        # flatten column to multi index
-        pivot_df.columns = list(map(str("_" + case_column + "_").join, pivot_df.columns))
-        fixpivot_df = pivot_df.rename(columns={str(level + "_" + case_column + "_"): level}).set_index(level)
-
-        # Join results back to full set of level polygons and fill nans with 0
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=fixpivot_df,
-                   how='left',
-                   on=level) \
-            .fillna(0) \
-            .reset_index()
-
-        return out_df
-
-    elif filter_statement is None:
-
-        # Group and sum tree table
-        filtered_df = tree_table \
-            .groupby([level, case_column], as_index=False) \
-            .agg(
-                tree_count=('TR_SP', agg_tree_count),
-                stand_dens=('TR_DENS', sum),
-            ) \
-            .set_index(level) \
-            .merge(right=plotcount_df,
-                   how='left',
-                   on=level) \
-            .reset_index()
-
-        # Add and calculate TPA, BA, QM_DBH
-        baf = 10
-        filtered_df['TPA'] = filtered_df['stand_dens'] / filtered_df['plot_count']
-        filtered_df['BA'] = (filtered_df['tree_count'] * baf) / filtered_df['plot_count']
-        filtered_df['QM_DBH'] = np.where(filtered_df['tree_count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Pivot sizes and metrics to columns
-        pivot_df = filtered_df \
-            .pivot_table(
-                index=level,
-                columns=case_column,
-                values=['BA', 'TPA', 'QM_DBH'],
-                fill_value=0) \
-            .reset_index()
-
-        # flatten column to multi index
-        pivot_df.columns = list(map(str("_" + case_column + "_").join, pivot_df.columns))
-        fixpivot_df = pivot_df.rename(columns={str(level + "_" + case_column + "_"): level}).set_index(level)
-
-        # Join results back to full set of level polygons and fill nan with 0
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=fixpivot_df,
-                   how='left',
-                   on=level) \
-            .fillna(0) \
-            .reset_index()
+    # Join results back to full set of level polygons and fill nans with 0
+    out_df = level_join(tree_table, pivot_df, level, how='left')
 
-        return out_df
+    return out_df
 
 
 # Generate TPA, BA, QM DBH given a case field at non-PID level (no pivot, stays long)
+@memoize
 def tpa_ba_qmdbh_level_by_case_long(tree_table, filter_statement, case_column, level):
     """Creates a dataframe with BA, TPA and QM DBH columns at a specified level. The function does not pivot
     on the case field, instead leaving it in long form. Each row of the resulting dataframe will be a single
@@ -1397,9 +2119,9 @@ def tpa_ba_qmdbh_level_by_case_long(tree_table, filter_statement, case_column, l
                             calculated for each category in this field
         level            -- string: field name for desired FMG level, i.e. SID, SITE, UNIT
 
-    Details: filter statement should not be a string, rather just the pandas dataframe filter statement:
-    for live trees use: ~tree_table.TR_HLTH.isin(["D", "DEAD"])
-    for dead trees use: tree_table.TR_HLTH.isin(["D", "DEAD"])
+    Details: filter statement should be a filter name, see tree_filter, or the pandas dataframe filter statement:
+    for live trees use: 'live' or ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    for dead trees use: 'dead' or tree_table.TR_HLTH.isin(["D", "DEAD"])
     if no filter is required, None should be passed in as the keyword argument.
     """
 
@@ -1408,81 +2130,18 @@ def tpa_ba_qmdbh_level_by_case_long(tree_table, filter_statement, case_column, l
     assert tree_table.columns.isin([case_column]).any(), "df must contain column specified as group column param"
     assert tree_table.columns.isin([level]).any(), "df must contain column specified as level param"
 
-    # Create data frame that preserves unfiltered count of plots by level
-    plotcount_df = tree_table \
-        .groupby(level, as_index=False) \
-        .agg(plot_count=('PID', agg_plot_count)) \
-        .set_index(level)
-
-    # Test for filter statement and run script based on filter or no filter
-    if filter_statement is not None:
-
-        # Filter, group and sum tree table, add unfiltered plot count field
-        filtered_df = tree_table[filter_statement] \
-            .groupby([level, case_column], as_index=False) \
-            .agg(
-                tree_count=('TR_SP', agg_tree_count),
-                stand_dens=('TR_DENS', sum)
-            ) \
-            .set_index(level) \
-            .merge(right=plotcount_df,
-                   how='left',
-                   on=level) \
-            .reset_index()
-
-        # Add and calculate TPA, BA, QM_DBH
-        baf = 10
-        filtered_df['TPA'] = filtered_df['stand_dens'] / filtered_df['plot_count']
-        filtered_df['BA'] = (filtered_df['tree_count'] * baf) / filtered_df['plot_count']
-        filtered_df['QM_DBH'] = np.where(filtered_df['tree_count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Join results back to full set of level polygons
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=filtered_df,
-                   how='inner',
-                   on=level) \
-            .reset_index()
-
-        return out_df
+    # Group and sum tree table
+    filtered_df = tpa_ba_qmdbh(tree_table, filter_statement, level, [case_column])
 
-    elif filter_statement is None:
-
-        # Group and sum tree table
-        filtered_df = tree_table \
-            .groupby([level, case_column], as_index=False) \
-            .agg(
-                tree_count=('TR_SP', agg_tree_count),
-                stand_dens=('TR_DENS', sum),
-            ) \
-            .set_index(level) \
-            .merge(right=plotcount_df,
-                   how='left',
-                   on=level) \
-            .reset_index()
-
-        # Add and calculate TPA, BA, QM_DBH
-        baf = 10
-        filtered_df['TPA'] = filtered_df['stand_dens'] / filtered_df['plot_count']
-        filtered_df['BA'] = (filtered_df['tree_count'] * baf) / filtered_df['plot_count']
-        filtered_df['QM_DBH'] = np.where(filtered_df['tree_count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Join results back to full set of level polygons and fill nan with 0
-        out_df = plotcount_df \
-            .drop(columns=['plot_count']) \
-            .merge(right=filtered_df,
-                   how='left',
-                   on=level) \
-            .reset_index()
+    # Join results back to level polygons, only polygons with filtered trees are kept when filtered
+    how = 'inner' if filter_statement is not None else 'left'
+    out_df = level_join(tree_table, filtered_df, level, how=how, fill=False)
 
-        return out_df
+    return out_df
 
 
 # Generate TPA, BA, QM DBH given a case field at non-PID level (no pivot, stays long)
+@memoize
 def tpa_ba_qmdbh_level_by_multi_case_long(tree_table, filter_statement, case_columns, level):
     """Creates a dataframe with BA, TPA and QM DBH columns at a specified level. The function does not pivot
     on the case field, instead leaving it in long form. Each row of the resulting dataframe will be a single
@@ -1496,9 +2155,9 @@ def tpa_ba_qmdbh_level_by_multi_case_long(tree_table, filter_statement, case_col
                             calculated for each category in this field
         level            -- string: field name for desired FMG level, i.e. SID, SITE, UNIT
 
-    Details: filter statement should not be a string, rather just the pandas dataframe filter statement:
-    for live trees use: ~tree_table.TR_HLTH.isin(["D", "DEAD"])
-    for dead trees use: tree_table.TR_HLTH.isin(["D", "DEAD"])
+    Details: filter statement should be a filter name, see tree_filter, or the pandas dataframe filter statement:
+    for live trees use: 'live' or ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    for dead trees use: 'dead' or tree_table.TR_HLTH.isin(["D", "DEAD"])
     if no filter is required, None should be passed in as the keyword argument.
     """
 
@@ -1507,94 +2166,61 @@ def tpa_ba_qmdbh_level_by_multi_case_long(tree_table, filter_statement, case_col
     assert tree_table.columns.isin(case_columns).any(), "df must contain column specified as group column param"
     assert tree_table.columns.isin([level]).any(), "df must contain column specified as level param"
 
-    # Create data frame that preserves unfiltered count of plots by level
-    plotcount_df = tree_table \
-        .groupby(level, as_index=False) \
-        .agg(Plot_Count=('PID', agg_plot_count)) \
-        .set_index(level)
+    # Group and sum tree table
+    filtered_df = tpa_ba_qmdbh(tree_table, filter_statement, level, case_columns) \
+        .rename(columns={'tree_count': 'Tree_Count', 'stand_dens': 'Stand_Dens', 'plot_count': 'Plot_Count'})
 
-    # Add level to case columns
-    case_columns.insert(0, level)
+    # Join results back to level polygons, only polygons with filtered trees are kept when filtered
+    how = 'inner' if filter_statement is not None else 'left'
+    out_df = level_join(tree_table, filtered_df, level, how=how, fill=False)
 
-    # Test for filter statement and run script based on filter or no filter
-    if filter_statement is not None:
+    # Handle dtypes
+    out_df = out_df.astype({'TPA': 'float64', 'QM_DBH': 'float64'})\
+                   .fillna(value={'QM_DBH': 0})\
+                   .drop(columns=['index'])
 
-        # Filter, group and sum tree table, add unfiltered plot count field
-        filtered_df = tree_table[filter_statement] \
-            .groupby(by=case_columns, as_index=False) \
-            .agg(
-            Tree_Count=('TR_SP', agg_tree_count),
-            Stand_Dens=('TR_DENS', sum)
-        ) \
-            .set_index(level) \
-            .merge(right=plotcount_df,
-                   how='left',
-                   on=level) \
-            .reset_index()
-
-        # Add and calculate TPA, BA, QM_DBH
-        baf = 10
-        filtered_df['TPA'] = filtered_df['Stand_Dens'] / filtered_df['Plot_Count']
-        filtered_df['BA'] = (filtered_df['Tree_Count'] * baf) / filtered_df['Plot_Count']
-        filtered_df['QM_DBH'] = np.where(filtered_df['Tree_Count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Join results back to full set of level polygons
-        out_df = plotcount_df \
-            .drop(columns=['Plot_Count']) \
-            .merge(right=filtered_df,
-                   how='inner',
-                   on=level) \
-            .reset_index()
-
-        # Handle Dtypes
-        out_df = out_df.astype({'TPA': 'float64', 'QM_DBH': 'float64'})\
-                       .fillna(value={'QM_DBH': 0})\
-                       .drop(columns=['index'])
+    return out_df
 
-        return out_df
 
-    elif filter_statement is None:
-
-        # Group and sum tree table
-        filtered_df = tree_table \
-            .groupby(by=case_columns, as_index=False) \
-            .agg(
-                Tree_Count=('TR_SP', agg_tree_count),
-                Stand_Dens=('TR_DENS', sum),
-            ) \
-            .set_index(level) \
-            .merge(right=plotcount_df,
-                   how='left',
-                   on=level) \
-            .reset_index()
-
-        # Add and calculate TPA, BA, QM_DBH
-        baf = 10
-        filtered_df['TPA'] = filtered_df['Stand_Dens'] / filtered_df['Plot_Count']
-        filtered_df['BA'] = (filtered_df['Tree_Count'] * baf) / filtered_df['Plot_Count']
-        filtered_df['QM_DBH'] = np.where(filtered_df['Tree_Count'] > 0,
-                                         (np.sqrt((filtered_df['BA'] / filtered_df['TPA']) / 0.005454154)),
-                                         0)
-
-        # Join results back to full set of level polygons and fill nan with 0
-        out_df = plotcount_df \
-            .drop(columns=['Plot_Count'])\
-            .merge(right=filtered_df,
-                   how='left',
-                   on=level) \
-            .reset_index()
-
-        # Handle dtypes
-        out_df = out_df.astype({'TPA': 'float64', 'QM_DBH': 'float64'})\
-                       .fillna(value={'QM_DBH': 0})\
-                       .drop(columns=['index'])
+# Generate long TPA, BA, QM DBH tables for many case column combinations and levels from one grouped pass
+def tpa_ba_qmdbh_grouping_sets(tree_table, grouping_sets, levels):
+    """Creates the long form TPA, BA and QM DBH dataframes of several case column combinations (grouping sets) at
+    several levels from a single pass over the tree table. The tree table is grouped once at the finest grain, plot
+    by every case column in any grouping set (see create_tree_cube), and each requested combination and level is
+    re-aggregated from that small roll-up.
 
-        return out_df
+    Keyword Args:
+        tree_table    -- dataframe: input tree_table, produced by the create_tree_table function
+        grouping_sets -- list: lists of case columns, i.e. [['TR_SP'], ['TR_SP', 'MAST_TYPE'], ['TR_HLTH']]
+        levels        -- list: field names for desired FMG levels, i.e. PID, SID, SITE, UNIT
+
+    Details: returns a dictionary of (level, tuple of case columns) to the dataframe produced by
+    tpa_ba_qmdbh_plot_by_multi_case_long (PID) or tpa_ba_qmdbh_level_by_multi_case_long (other levels) without a
+    filter. Values equal those functions run on the tree table up to floating point summation order.
+    """
+    # Check input parameters are valid
+    assert isinstance(tree_table, pd.DataFrame), "must be a pandas DataFrame"
+    assert len(grouping_sets) > 0, "grouping_sets must not be empty"
+
+    # Group once at the finest requested grain
+    dims = list(dict.fromkeys(column for case_columns in grouping_sets for column in case_columns))
+    tree_cube = create_tree_cube(tree_table, dims=dims)
+
+    # Re-aggregate each grouping set at each level from the roll-up
+    out_dfs = {}
+    for level in levels:
+        for case_columns in grouping_sets:
+            if level == 'PID':
+                out_df = tpa_ba_qmdbh_plot_by_multi_case_long(tree_cube, None, list(case_columns))
+            else:
+                out_df = tpa_ba_qmdbh_level_by_multi_case_long(tree_cube, None, list(case_columns), level)
+            out_dfs[(level, tuple(case_columns))] = out_df
+
+    return out_dfs
 
 
 # Generate dominate health and percent composition for plot summaries
+@memoize
 def health_dom_plot(tree_table, filter_statement):
     """Creates a dataframe with most dominant health and percentage of total that health category comprises
      for the plot level - these metrics are based on TPA for each health category and the subset of trees defined
@@ -1606,9 +2232,9 @@ def health_dom_plot(tree_table, filter_statement):
         filter_statement -- pandas method: filter statement to be used on the input dataframe, should be a full filter
                             statement i.e. dataframe.field.filter. If no filter is required, None should be supplied.
 
-    Details: filter statement should not be a string, rather just the pandas dataframe filter statement:
-    for live trees use: ~tree_table.TR_HLTH.isin(["D", "DEAD"])
-    for dead trees use: tree_table.TR_HLTH.isin(["D", "DEAD"])
+    Details: filter statement should be a filter name, see tree_filter, or the pandas dataframe filter statement:
+    for live trees use: 'live' or ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    for dead trees use: 'dead' or tree_table.TR_HLTH.isin(["D", "DEAD"])
     if no filter is required, None should be passed in as the keyword argument.
     """
     # Create DF with filtered TPA at specified level, ignoring health categories
@@ -1635,7 +2261,7 @@ def health_dom_plot(tree_table, filter_statement):
 
     # Create DF with max TPA for each level
     health_max_df = health_base_df \
-        .groupby('PID') \
+        .groupby('PID', observed=True) \
         .agg(TPA=('TPA', 'max')) \
         .reset_index()
 
@@ -1658,7 +2284,7 @@ def health_dom_plot(tree_table, filter_statement):
     # the least healthy
 
     # Assign Numeric codes to health categories
-    health_join_df['TR_HLTH_NUM'] = health_join_df['TR_HLTH'].map(health_rank_map)
+    health_join_df['TR_HLTH_NUM'] = health_rank(health_join_df['TR_HLTH'])
 
     # Sort dataframe by numeric ranking codes
     health_dom_df = health_join_df \
@@ -1704,6 +2330,7 @@ def health_dom_plot(tree_table, filter_statement):
 
 
 # Generate dominate health and percent composition for level summaries
+@memoize
 def health_dom_level(tree_table, filter_statement, level):
     """Creates a dataframe with dominant health and percentage of total that health category comprises
      for specified level - these metrics are based on TPA for each health category and the subset of trees defined
@@ -1716,9 +2343,9 @@ def health_dom_level(tree_table, filter_statement, level):
                             statement i.e. dataframe.field.filter. If no filter is required, None should be supplied.
         level            -- string: field name for desired FMG level, i.e. SID, SITE, UNIT
 
-    Details: filter statement should not be a string, rather just the pandas dataframe filter statement:
-    for live trees use: ~tree_table.TR_HLTH.isin(["D", "DEAD"])
-    for dead trees use: tree_table.TR_HLTH.isin(["D", "DEAD"])
+    Details: filter statement should be a filter name, see tree_filter, or the pandas dataframe filter statement:
+    for live trees use: 'live' or ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    for dead trees use: 'dead' or tree_table.TR_HLTH.isin(["D", "DEAD"])
     if no filter is required, None should be passed in as the keyword argument.
     """
     # Create DF with filtered TPA at specified level, ignoring health categories
@@ -1748,7 +2375,7 @@ def health_dom_level(tree_table, filter_statement, level):
 
     # Create DF with max TPA for each level
     health_max_df = health_base_df \
-        .groupby(level) \
+        .groupby(level, observed=True) \
         .agg(TPA=('TPA', 'max')) \
         .reset_index()
 
@@ -1771,7 +2398,7 @@ def health_dom_level(tree_table, filter_statement, level):
     # the least healthy
 
     # Assign numeric ranking codes to each health category
-    health_join_df['TR_HLTH_NUM'] = health_join_df['TR_HLTH'].map(health_rank_map)
+    health_join_df['TR_HLTH_NUM'] = health_rank(health_join_df['TR_HLTH'])
 
     # Sort dataframe by numeric ranking codes
     health_dom_df = health_join_df \
@@ -1818,6 +2445,7 @@ def health_dom_level(tree_table, filter_statement, level):
 
 
 # Generate dominant health percent composition for plot summaries
+@memoize
 def species_dom_plot(tree_table, filter_statement):
     """Creates a dataframe with dominant species and percentage of total that species comprises
      for the plot level - these metrics are based on TPA for each species and the subset of trees defined
@@ -1829,9 +2457,9 @@ def species_dom_plot(tree_table, filter_statement):
         filter_statement -- pandas method: filter statement to be used on the input dataframe, should be a full filter
                             statement i.e. dataframe.field.filter. If no filter is required, None should be supplied.
 
-    Details: filter statement should not be a string, rather just the pandas dataframe filter statement:
-    for live trees use: ~tree_table.TR_HLTH.isin(["D", "DEAD"])
-    for dead trees use: tree_table.TR_HLTH.isin(["D", "DEAD"])
+    Details: filter statement should be a filter name, see tree_filter, or the pandas dataframe filter statement:
+    for live trees use: 'live' or ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    for dead trees use: 'dead' or tree_table.TR_HLTH.isin(["D", "DEAD"])
     if no filter is required, None should be passed in as the keyword argument.
     """
     # Create DF with filtered TPA at specified level, ignoring health categories
@@ -1858,7 +2486,7 @@ def species_dom_plot(tree_table, filter_statement):
 
     # Create DF with max TPA for each level
     species_max_df = species_base_df \
-        .groupby('PID') \
+        .groupby('PID', observed=True) \
         .agg(TPA=('TPA', 'max')) \
         .reset_index()
 
@@ -1922,6 +2550,7 @@ def species_dom_plot(tree_table, filter_statement):
 
 
 # Generate dominant species percent composition for level summaries
+@memoize
 def species_dom_level(tree_table, filter_statement, level):
     """Creates a dataframe with dominant species and percentage of total that species category comprises
      for specified level - these metrics are based on TPA for each species and the subset of trees defined
@@ -1934,9 +2563,9 @@ def species_dom_level(tree_table, filter_statement, level):
                             statement i.e. dataframe.field.filter. If no filter is required, None should be supplied.
         level            -- string: field name for desired FMG level, i.e. SID, SITE, UNIT
 
-    Details: filter statement should not be a string, rather just the pandas dataframe filter statement:
-    for live trees use: ~tree_table.TR_HLTH.isin(["D", "DEAD"])
-    for dead trees use: tree_table.TR_HLTH.isin(["D", "DEAD"])
+    Details: filter statement should be a filter name, see tree_filter, or the pandas dataframe filter statement:
+    for live trees use: 'live' or ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    for dead trees use: 'dead' or tree_table.TR_HLTH.isin(["D", "DEAD"])
     if no filter is required, None should be passed in as the keyword argument.
     """
 
@@ -1967,7 +2596,7 @@ def species_dom_level(tree_table, filter_statement, level):
 
     # Create DF with max TPA for each level
     species_max_df = species_base_df \
-        .groupby(level) \
+        .groupby(level, observed=True) \
         .agg(TPA=('TPA', 'max')) \
         .reset_index()
 
@@ -2031,22 +2660,112 @@ def species_dom_level(tree_table, filter_statement, level):
     return species_dom_pct_df
 
 
-# Determine top 5 overstory species and generate associated statistics for level summaries
-def top5_ov_species_level(tree_table, level):
+# Generate dominant case and percent composition for many filters at any level
+@memoize
+def dominance_many(tree_table, level, case_column, filters):
+    """Creates a wide dataframe with the dominant category of the case column and the percentage of total TPA that
+    category comprises, for each of several subsets of trees, at the specified level. The filters are stacked as
+    a filter dimension so every subset is summarized by a single grouped TPA computation.
+
+    Keyword Args:
+        tree_table  -- dataframe: input tree_table, produced by the create_tree_table function
+        level       -- string: field name for desired FMG level, i.e. PID, SID, SITE, UNIT
+        case_column -- string: field name to determine dominance on, i.e. TR_SP, TR_HLTH
+        filters     -- dictionary: output column name as key, filter statement as value. Filter statements follow
+                       the same rules as the species_dom_* and health_dom_* functions, None uses all trees.
+
+    Details: ties on TPA are broken with the same rules as health_dom_* and species_dom_*, TR_HLTH ties are
+    weighted toward the healthiest health rank, any other case column is weighted toward the beginning of the
+    alphabet. The returned dataframe is indexed by level, with a <name> and <name>_PCMP column for each filter,
+    i.e. filters={'DEAD_DOM_SP': tree_table['TR_HLTH'] == 'D'} returns DEAD_DOM_SP and DEAD_DOM_SP_PCMP.
+    Level polygons without trees in a filter are nan for that filter's columns.
+    """
+    # Check input parameters are valid
+    assert isinstance(tree_table, pd.DataFrame), "must be a pandas DataFrame"
+    assert tree_table.columns.isin([level]).any(), "df must contain column specified as level param"
+    assert tree_table.columns.isin([case_column]).any(), "df must contain column specified as case column param"
+    assert isinstance(filters, dict) and len(filters) > 0, "filters must be a non-empty dictionary"
+
+    # Stack the rows selected by each filter, tagging each row with its filter number
+    names = list(filters.keys())
+    rows, filter_numbers = _filter_stack(tree_table, list(filters.values()))
+    stack_df = tree_table[[level, case_column, 'TR_DENS']] \
+        .iloc[rows] \
+        .assign(FILTER=filter_numbers)
+
+    # One grouped TPA computation for all filters, by case and overall
+    plot_count = level_plot_count(tree_table, level)
+
+    case_df = stack_df \
+        .groupby(['FILTER', level, case_column], as_index=False, observed=True)['TR_DENS'] \
+        .sum()
+    case_df['TPA'] = case_df['TR_DENS'] / case_df[level].map(plot_count).astype('float64')
+
+    overall_df = stack_df \
+        .groupby(['FILTER', level], as_index=False, observed=True)['TR_DENS'] \
+        .sum()
+    overall_df['OVERALL_TPA'] = overall_df['TR_DENS'] / overall_df[level].map(plot_count).astype('float64')
+
+    # Keep the max TPA category for each filter and level, breaking ties as health_dom_* and species_dom_* do
+    sort_columns = ['FILTER', level, 'TPA', case_column]
+    if case_column == 'TR_HLTH':
+        case_df['TR_HLTH_NUM'] = health_rank(case_df['TR_HLTH'])
+        sort_columns.insert(3, 'TR_HLTH_NUM')
+
+    dom_df = case_df \
+        .sort_values(by=sort_columns,
+                     ascending=[True, True, False] + [True] * (len(sort_columns) - 3)) \
+        .drop_duplicates(subset=['FILTER', level],
+                         keep='first') \
+        .merge(right=overall_df[['FILTER', level, 'OVERALL_TPA']],
+               how='left',
+               on=['FILTER', level])
+
+    # Calculate percent composition column
+    dom_df['PCMP'] = (dom_df['TPA'] / dom_df['OVERALL_TPA']) * 100
+
+    # Pivot filters to columns, one dominant and percent composition column per filter
+    if len(dom_df.index) > 0:
+        wide_df = dom_df \
+            .set_index([level, 'FILTER'])[[case_column, 'PCMP']] \
+            .unstack('FILTER')
+    else:
+        wide_df = empty_categories(dom_df.set_index(level)[[]])
+
+    out_df = pd.DataFrame(index=wide_df.index)
+    for number, name in enumerate(names):
+        out_df[name] = wide_df.get((case_column, number))
+        out_df[name + '_PCMP'] = wide_df.get(('PCMP', number), np.nan)
+        out_df[name + '_PCMP'] = out_df[name + '_PCMP'].astype('float64')
+
+    return out_df
+
+
+# Determine top 5 overstory species and generate associated statistics for any level
+@memoize
+def top5_ov_species(tree_table, level):
     """ Creates a dataframe with the top 5 overstory species and associated statistics (BA, TPA, QM DBH, Dom. Health,
-    Dom. Health % Composition, Dom. Health TPA, and Dead TPA) for each of the top 5 species
+    Dom. Health % Composition, Dom. Health TPA, and Dead TPA) for each of the top 5 species, for every level polygon
+    at once
 
     Keyword Args:
           tree_table -- dataframe: input tree_table, produced by create_tree_table function
-          level      -- string: field name for desired FMG level, i.e. SID, SITE, UNIT
+          level      -- string: field name for desired FMG level, i.e. PID, SID, SITE, UNIT
 
-    Details: None
+    Details: species are ranked by TPA within each level polygon, ties keep alphabetical species order. Dominant
+    health is the health category with the highest TPA for the species, ties are resolved toward the healthiest
+    category using health_rank, the same rule as health_dom_level and health_dom_plot.
     """
     # Create table with TPA for each unique species per given level
-    species_df = tpa_ba_qmdbh_level_by_case_long(tree_table=tree_table,
-                                                 filter_statement=None,
-                                                 case_column='TR_SP',
-                                                 level=level)
+    if level == 'PID':
+        species_df = tpa_ba_qmdbh_plot_by_case_long(tree_table=tree_table,
+                                                    filter_statement=None,
+                                                    case_column='TR_SP')
+    else:
+        species_df = tpa_ba_qmdbh_level_by_case_long(tree_table=tree_table,
+                                                     filter_statement=None,
+                                                     case_column='TR_SP',
+                                                     level=level)
 
     # Remove rows with a tree species of None or NoTree
     species_df = species_df[species_df.TR_SP != "NONE"]
@@ -2055,7 +2774,7 @@ def top5_ov_species_level(tree_table, level):
     species_df = species_df.sort_values(by=[level, 'TPA'], ascending=False)
 
     # Rank each species within a single level group, based on sort
-    species_df['SP_RANK'] = species_df.groupby([level]).cumcount().add(1)
+    species_df['SP_RANK'] = species_df.groupby([level], observed=True).cumcount().add(1)
 
     # Filter on keep species rank where the value is less than or equal to 5
     species_df = species_df[species_df.SP_RANK <= 5]
@@ -2063,118 +2782,51 @@ def top5_ov_species_level(tree_table, level):
     # Assign categorical variable for species rank to assist in pivot column naming
     species_df['OV_SP_RANK'] = species_df['SP_RANK'].map(overstory_sp_map)
 
+    # Create table with TPA for each health category of each species per given level, in one grouped pass
+    health_df = tpa_ba_qmdbh(tree_table=tree_table,
+                             filter_statement=None,
+                             level=level,
+                             case_columns=['TR_SP', 'TR_HLTH'])
+    health_df = health_df[[level, 'TR_SP', 'TR_HLTH', 'TPA']]
+
+    # Dead TPA for each species
+    dead_df = health_df[health_df.TR_HLTH == 'D'] \
+        .drop(columns=['TR_HLTH']) \
+        .rename(columns={'TPA': 'D_TPA'})
+
+    # Dominant health for each species: max TPA, ties go to the healthiest category
+    health_df['TR_HLTH_NUM'] = health_rank(health_df['TR_HLTH'])
+    dom_hlth_df = health_df \
+        .sort_values(by=[level, 'TR_SP', 'TPA', 'TR_HLTH_NUM'],
+                     ascending=[True, True, False, True]) \
+        .drop_duplicates(subset=[level, 'TR_SP'], keep='first') \
+        .drop(columns=['TR_HLTH_NUM']) \
+        .rename(columns={'TR_HLTH': 'DOM_HLTH', 'TPA': 'DOM_HLTH_TPA'})
+
+    # Join dominant health and dead TPA to the top 5 species
+    species_df = species_df \
+        .merge(right=dom_hlth_df, how='left', on=[level, 'TR_SP']) \
+        .merge(right=dead_df, how='left', on=[level, 'TR_SP'])
+
+    # Calculate dominant health percent composition of species TPA, fill dead TPA where a species is present
+    species_df['DOM_HLTH_PCMP'] = (species_df['DOM_HLTH_TPA'] / species_df['TPA']) * 100
+    species_df['D_TPA'] = species_df['D_TPA'].where(species_df['TR_SP'].isna() | species_df['D_TPA'].notna(), 0)
+
     # Pivot variables based on sp rank field
-    species_pivot_df2 = species_df.pivot(index=level, columns='OV_SP_RANK', values=['TR_SP', 'BA', 'TPA', 'QM_DBH'])
+    species_pivot_df = species_df.pivot(index=level,
+                                        columns='OV_SP_RANK',
+                                        values=['TR_SP', 'BA', 'TPA', 'QM_DBH',
+                                                'DOM_HLTH', 'DOM_HLTH_PCMP', 'DOM_HLTH_TPA', 'D_TPA'])
 
-    # flatten multi index and rename columns
-    species_pivot_df2.columns = ['_'.join(col) for col in species_pivot_df2.columns.values]
+    # Flatten multi index and rename columns, i.e. TR_SP -> OV_SP1, BA -> OV_SP1_BA, QM_DBH -> OV_SP1_QMDBH
+    value_names = {'TR_SP': '', 'QM_DBH': '_QMDBH'}
+    species_pivot_df.columns = [col[1] + value_names.get(col[0], '_' + col[0])
+                                for col in species_pivot_df.columns.values]
 
-    # reset index
-    species_pivot_df2 = species_pivot_df2\
-        .reset_index()\
+    ov_species = species_pivot_df \
+        .reset_index() \
         .infer_objects()
 
-    # Rename columns
-    ov_species = species_pivot_df2 \
-        .rename(columns={
-                'TR_SP_OV_SP1': 'OV_SP1',
-                'BA_OV_SP1': 'OV_SP1_BA',
-                'TPA_OV_SP1': 'OV_SP1_TPA',
-                'QM_DBH_OV_SP1': 'OV_SP1_QMDBH',
-                'TR_SP_OV_SP2': 'OV_SP2',
-                'BA_OV_SP2': 'OV_SP2_BA',
-                'TPA_OV_SP2': 'OV_SP2_TPA',
-                'QM_DBH_OV_SP2': 'OV_SP2_QMDBH',
-                'TR_SP_OV_SP3': 'OV_SP3',
-                'BA_OV_SP3': 'OV_SP3_BA',
-                'TPA_OV_SP3': 'OV_SP3_TPA',
-                'QM_DBH_OV_SP3': 'OV_SP3_QMDBH',
-                'TR_SP_OV_SP4': 'OV_SP4',
-                'BA_OV_SP4': 'OV_SP4_BA',
-                'TPA_OV_SP4': 'OV_SP4_TPA',
-                'QM_DBH_OV_SP4': 'OV_SP4_QMDBH',
-                'TR_SP_OV_SP5': 'OV_SP5',
-                'BA_OV_SP5': 'OV_SP5_BA',
-                'TPA_OV_SP5': 'OV_SP5_TPA',
-                'QM_DBH_OV_SP5': 'OV_SP5_QMDBH'})
-
-    # Create iterator dict for sp 1-5
-    species_columns = ['OV_SP1', 'OV_SP2', 'OV_SP3', 'OV_SP4', 'OV_SP5']
-    iterator_lists = []
-    for sp in species_columns:
-        # filter out nan values
-        ov_species_filtered = ov_species.dropna(subset=[sp])
-
-        # Convert filtered df to a list of lists
-        iterator = ov_species_filtered[[level, sp]].values.tolist()
-
-        # Append list to the iterator list
-        iterator_lists.append(iterator)
-
-    # Convert iterator list to dict so lists can be accessed by species rank
-    iterator_dict = dict(zip(species_columns, iterator_lists))
-
-    # iterate through the dict doing a bunch of stuff
-    for key, value in iterator_dict.items():
-
-        # Create empty list to hold results of loop
-        health_dom_list = []
-
-        # Iterate through value list
-        for item in value:
-
-            # filter tree table to a single stand
-            tree_table_level = tree_table.loc[tree_table[level] == item[0]]
-
-            # Run health prev level function with single stand associated species
-            health_dom_level_df = health_dom_level(tree_table=tree_table_level,
-                                                   filter_statement=tree_table_level['TR_SP'] == item[1],
-                                                   level=level)
-
-            # Convert dataframe to list - contains level, dom health, % comp
-            health_dom_level_list = health_dom_level_df.values.tolist()[0]
-
-            # Calculate TPA for just dom health trees
-            dom_hlth_tpa = tpa_ba_qmdbh_level(tree_table=tree_table_level,
-                                              filter_statement=
-                                              (tree_table_level['TR_HLTH'] == health_dom_level_list[1]) &
-                                              (tree_table_level['TR_SP'] == item[1]),
-                                              level=level)
-
-            # Convert dom health tpa dataframe to list and insert into dom health list
-            if len(dom_hlth_tpa.index) == 0:
-                health_dom_level_list.insert(3, 0)
-            else:
-                dom_hlth_tpa_list = dom_hlth_tpa.values.tolist()[0]
-                health_dom_level_list.insert(3, dom_hlth_tpa_list[5])
-
-            # Calcualte TPA for just dead trees
-            dead_hlth_tpa = tpa_ba_qmdbh_level(tree_table=tree_table_level,
-                                               filter_statement=(tree_table_level['TR_HLTH'] == 'D') &
-                                                                (tree_table_level['TR_SP'] == item[1]),
-                                               level=level)
-
-            # Convert dead health tpa dataframe to list
-            if len(dead_hlth_tpa.index) == 0:
-                health_dom_level_list.insert(4, 0)
-            else:
-                dead_hlth_tpa_list = dead_hlth_tpa.values.tolist()[0]
-                health_dom_level_list.insert(4, dead_hlth_tpa_list[5])
-
-            # Add health prev list to loop result list
-            health_dom_list.append(health_dom_level_list)
-
-        # convert loop result list to dataframe
-        health_dom_ovsp = pd.DataFrame(health_dom_list, columns=[level,
-                                                                 key+'_DOM_HLTH',
-                                                                 key+'_DOM_HLTH_PCMP',
-                                                                 key+'_DOM_HLTH_TPA',
-                                                                 key+'_D_TPA'])
-
-        # Join dataframe to OV_SPECIES dataframe
-        ov_species = ov_species.set_index(level).join(health_dom_ovsp.set_index(level), how='left')
-        ov_species = ov_species.reset_index()
-
     # Re order columns
     ov_species = ov_species.reindex([level,
                                      'OV_SP1', 'OV_SP1_BA', 'OV_SP1_TPA', 'OV_SP1_QMDBH',
@@ -2192,8 +2844,8 @@ def top5_ov_species_level(tree_table, level):
     return ov_species
 
 
-# Determine top 5 overstory species and generate associated statistics for plot summaries
-def top5_ov_species_plot(tree_table):
+# Determine top 5 overstory species and generate associated statistics for level summaries
+def top5_ov_species_level(tree_table, level):
     """ Creates a dataframe with the top 5 overstory species and associated statistics (BA, TPA, QM DBH, Dom. Health,
     Dom. Health % Composition, Dom. Health TPA, and Dead TPA) for each of the top 5 species
 
@@ -2203,149 +2855,20 @@ def top5_ov_species_plot(tree_table):
 
     Details: None
     """
-    # Create table with TPA for each unique species per given level
-    species_df = tpa_ba_qmdbh_plot_by_case_long(tree_table=tree_table,
-                                                filter_statement=None,
-                                                case_column='TR_SP')
-
-    # Remove rows with a tree species of None or NoTree
-    species_df = species_df[species_df.TR_SP != "NONE"]
-
-    # Sort species_df by plot and TPA
-    species_df = species_df.sort_values(by=['PID', 'TPA'], ascending=False)
-
-    # Rank each species within a single plot group, based on sort
-    species_df['SP_RANK'] = species_df.groupby(['PID']).cumcount().add(1)
-
-    # Filter on keep flag field where the value is less than or equal to 5
-    species_df = species_df[species_df.SP_RANK <= 5]
-
-    # Assign categorical variable for species rank to assist in pivot column naming
-    species_df['OV_SP_RANK'] = species_df['SP_RANK'].map(overstory_sp_map)
-
-    # Pivot variables based on sp rank field
-    species_pivot_df2 = species_df.pivot(index='PID', columns='OV_SP_RANK', values=['TR_SP', 'BA', 'TPA', 'QM_DBH'])
-
-    # flatten multi index and rename columns
-    species_pivot_df2.columns = ['_'.join(col) for col in species_pivot_df2.columns.values]
-
-    # reset index
-    species_pivot_df2 = species_pivot_df2.reset_index()
-
-    # Rename columns
-    ov_species = species_pivot_df2 \
-        .rename(columns={
-                'TR_SP_OV_SP1': 'OV_SP1',
-                'BA_OV_SP1': 'OV_SP1_BA',
-                'TPA_OV_SP1': 'OV_SP1_TPA',
-                'QM_DBH_OV_SP1': 'OV_SP1_QMDBH',
-                'TR_SP_OV_SP2': 'OV_SP2',
-                'BA_OV_SP2': 'OV_SP2_BA',
-                'TPA_OV_SP2': 'OV_SP2_TPA',
-                'QM_DBH_OV_SP2': 'OV_SP2_QMDBH',
-                'TR_SP_OV_SP3': 'OV_SP3',
-                'BA_OV_SP3': 'OV_SP3_BA',
-                'TPA_OV_SP3': 'OV_SP3_TPA',
-                'QM_DBH_OV_SP3': 'OV_SP3_QMDBH',
-                'TR_SP_OV_SP4': 'OV_SP4',
-                'BA_OV_SP4': 'OV_SP4_BA',
-                'TPA_OV_SP4': 'OV_SP4_TPA',
-                'QM_DBH_OV_SP4': 'OV_SP4_QMDBH',
-                'TR_SP_OV_SP5': 'OV_SP5',
-                'BA_OV_SP5': 'OV_SP5_BA',
-                'TPA_OV_SP5': 'OV_SP5_TPA',
-                'QM_DBH_OV_SP5': 'OV_SP5_QMDBH'})
-
-    # Create iterator dict for sp 1-5
-    species_columns = ['OV_SP1', 'OV_SP2', 'OV_SP3', 'OV_SP4', 'OV_SP5']
-    iterator_lists = []
-    for sp in species_columns:
-        # filter out nan values
-        ov_species_filtered = ov_species.dropna(subset=[sp])
-
-        # Convert filtered df to a list of lists
-        iterator = ov_species_filtered[['PID', sp]].values.tolist()
-
-        # Append list to the iterator list
-        iterator_lists.append(iterator)
-
-    # Convert iterator list to dict so lists can be accessed by species rank
-    iterator_dict = dict(zip(species_columns, iterator_lists))
-
-    # iterate through the dict doing a bunch of stuff
-    for key, value in iterator_dict.items():
-
-        # Create empty list to hold results of loop
-        health_dom_list = []
-
-        # Iterate through value list
-        for item in value:
-
-            # filter tree table to a single stand
-            tree_table_plot = tree_table.loc[tree_table['PID'] == item[0]]
-
-            # Run health prev plot function with single stand associated species
-            health_dom_plot_df = health_dom_plot(tree_table=tree_table_plot,
-                                                 filter_statement=tree_table_plot['TR_SP'] == item[1])
-
-            # Convert dataframe to list - contains pid, dom health, % comp
-            health_dom_plot_list = health_dom_plot_df.values.tolist()[0]
-
-            # Calculate TPA for just dom health trees
-            dom_hlth_tpa = tpa_ba_qmdbh_plot(tree_table=tree_table_plot,
-                                             filter_statement=
-                                             (tree_table_plot['TR_HLTH'] == health_dom_plot_list[1]) &
-                                             (tree_table_plot['TR_SP'] == item[1]))
-
-            # Convert dom health tpa dataframe to list and insert into dom health list
-            if len(dom_hlth_tpa.index) == 0:
-                health_dom_plot_list.insert(3, 0)
-            else:
-                dom_hlth_tpa_list = dom_hlth_tpa.values.tolist()[0]
-                health_dom_plot_list.insert(3, dom_hlth_tpa_list[5])
-
-            # Calcualte TPA for just dead trees
-            dead_hlth_tpa = tpa_ba_qmdbh_plot(tree_table=tree_table_plot,
-                                              filter_statement=
-                                              (tree_table_plot['TR_HLTH'] == 'D') &
-                                              (tree_table_plot['TR_SP'] == item[1]))
-
-            # Convert dead health tpa dataframe to list
-            if len(dead_hlth_tpa.index) == 0:
-                health_dom_plot_list.insert(4, 0)
-            else:
-                dead_hlth_tpa_list = dead_hlth_tpa.values.tolist()[0]
-                health_dom_plot_list.insert(4, dead_hlth_tpa_list[5])
-
-            # Add health prev list to loop result list
-            health_dom_list.append(health_dom_plot_list)
+    return top5_ov_species(tree_table=tree_table, level=level)
 
-        # convert loop result list to dataframe
-        health_dom_ovsp = pd.DataFrame(health_dom_list, columns=['PID',
-                                                                 key+'_HLTH_DOM',
-                                                                 key+'_HLTH_DOM_PCMP',
-                                                                 key+ '_HLTH_DOM_TPA',
-                                                                 key+ '_D_TPA'])
 
-        # Join dataframe to OV_SPECIES dataframe
-        ov_species = ov_species.set_index('PID').join(health_dom_ovsp.set_index('PID'), how='left')
-        ov_species = ov_species.reset_index()
+# Determine top 5 overstory species and generate associated statistics for plot summaries
+def top5_ov_species_plot(tree_table):
+    """ Creates a dataframe with the top 5 overstory species and associated statistics (BA, TPA, QM DBH, Dom. Health,
+    Dom. Health % Composition, Dom. Health TPA, and Dead TPA) for each of the top 5 species
 
-    # Re order columns
-    ov_species = ov_species.reindex(['PID',
-                                     'OV_SP1', 'OV_SP1_BA', 'OV_SP1_TPA', 'OV_SP1_QMDBH',
-                                     'OV_SP1_DOM_HLTH', 'OV_SP1_DOM_HLTH_PCMP', 'OV_SP1_DOM_HLTH_TPA', 'OV_SP1_D_TPA',
-                                     'OV_SP2', 'OV_SP2_BA', 'OV_SP2_TPA', 'OV_SP2_QMDBH',
-                                     'OV_SP2_DOM_HLTH', 'OV_SP2_DOM_HLTH_PCMP', 'OV_SP2_DOM_HLTH_TPA', 'OV_SP2_D_TPA',
-                                     'OV_SP3', 'OV_SP3_BA', 'OV_SP3_TPA', 'OV_SP3_QMDBH',
-                                     'OV_SP3_DOM_HLTH', 'OV_SP3_DOM_HLTH_PCMP', 'OV_SP3_DOM_HLTH_TPA', 'OV_SP3_D_TPA',
-                                     'OV_SP4', 'OV_SP4_BA', 'OV_SP4_TPA', 'OV_SP4_QMDBH',
-                                     'OV_SP4_DOM_HLTH', 'OV_SP4_DOM_HLTH_PCMP', 'OV_SP4_DOM_HLTH_TPA', 'OV_SP4_D_TPA',
-                                     'OV_SP5', 'OV_SP5_BA', 'OV_SP5_TPA', 'OV_SP5_QMDBH',
-                                     'OV_SP5_DOM_HLTH', 'OV_SP5_DOM_HLTH_PCMP', 'OV_SP5_DOM_HLTH_TPA', 'OV_SP5_D_TPA'],
-                                    axis="columns")
+    Keyword Args:
+          tree_table -- dataframe: input tree_table, produced by create_tree_table function
 
-    return ov_species
+    Details: None
+    """
+    return top5_ov_species(tree_table=tree_table, level='PID')
 
 
 # Determine most common und and grnd species
@@ -2406,6 +2929,8 @@ def get_groupby_modes(source, keys, values, dropna=True, return_counts=False):
 
     def _get_counts(df, keys, v, dropna):
         c = df.value_counts(keys + v, dropna=dropna)
+        # Drop unobserved combinations of categorical keys
+        c = c[c > 0]
         return c[~c.droplevel(v).index.duplicated()]
 
     counts = _get_counts(source, keys, values[:1], dropna)
@@ -2429,54 +2954,194 @@ def get_groupby_modes(source, keys, values, dropna=True, return_counts=False):
     return final
 
 
-# Create both species richness metrics
-def create_sp_richness(tree_table, plot_table, level):
-    # Create base df
-    base_df = create_level_df(level, plot_table)
-
-    # Filter Tree Table
-    tree_table_live = tree_table[(tree_table['TR_HLTH'] != 'D') & (tree_table['TR_SP'] != 'NONE')]
+# Batched modes of many columns by group
+def get_groupby_modes_many(source, keys, values, exclude=None, dropna=True, return_counts=False, top_k=1):
+    """Groups a dataframe by its key columns and returns the most common value of each group for many value
+    columns in a single pass. The value columns are stacked into one long column, tagged with the column they came
+    from, and counted together, in place of a filter, value_counts and sort for each column. Ties are always broken
+    toward the lowest value, using a stable sort on count then value.
 
-    # Create Single Number Sp Rich (count of unique species
-    sp_rich_ct = tree_table_live \
-        .groupby(level) \
-        .agg(SP_RICH=('TR_SP', 'nunique')) \
+    Keyword Args:
+        source        -- dataframe: input dataframe containing the key and value columns
+        keys          -- list: column names used to determine the groups
+        values        -- list: column names to find the most common value of
+        exclude       -- dictionary: value column name as key, list of values to ignore for that column as value,
+                         i.e. {'UND_SP1': ['NONE']}, or a list of values ignored in every value column
+        dropna        -- boolean: if True, rows with nan keys or values are not counted, otherwise nan keys and
+                         values are counted
+        return_counts -- boolean: if True, adds a <column>_count column with the count of each mode
+        top_k         -- integer: number of modes returned per group and column, ranked by count then value
+
+    Details: the returned dataframe is indexed by the key columns, with one column per value column, named as the
+    value column when top_k is 1 and <column>_1 to <column>_<top_k> otherwise. Groups without any counted value
+    for a column are nan for that column.
+    """
+    # Check input parameters are valid
+    assert isinstance(source, pd.DataFrame), "must be a pandas DataFrame"
+    assert source.columns.isin(keys + values).sum() == len(keys + values), "df must contain key and value columns"
+    assert top_k >= 1, "top_k must be at least 1"
+
+    if exclude is None:
+        exclude = {}
+    elif not isinstance(exclude, dict):
+        exclude = {column: exclude for column in values}
+
+    # Stack the value columns into one long array, tagging each value with its column number
+    row_count = len(source.index)
+    stacked = np.concatenate([source[column].to_numpy(dtype=object) for column in values])
+    column_number = np.repeat(np.arange(len(values)), row_count)
+    keep = np.ones(len(stacked), dtype=bool)
+    for number, column in enumerate(values):
+        if len(exclude.get(column, [])) > 0:
+            positions = slice(number * row_count, (number + 1) * row_count)
+            keep[positions] = ~source[column].isin(exclude[column]).to_numpy(dtype=bool)
+
+    # Sorted integer codes, so the lowest code is the lowest value
+    value_codes, value_uniques = pd.factorize(stacked, sort=True, use_na_sentinel=dropna)
+    key_codes = []
+    key_uniques = []
+    for key in keys:
+        codes, uniques = pd.factorize(source[key], sort=True, use_na_sentinel=dropna)
+        key_codes.append(np.tile(codes, len(values)))
+        key_uniques.append(uniques)
+    keep &= value_codes >= 0
+    for codes in key_codes:
+        keep &= codes >= 0
+
+    # One count over every column, group and value
+    key_names = ['KEY_{0}'.format(number) for number in range(len(keys))]
+    long_df = pd.DataFrame(dict(zip(key_names, [codes[keep] for codes in key_codes]),
+                                COLUMN=column_number[keep],
+                                VALUE=value_codes[keep]))
+    count_df = long_df \
+        .groupby(['COLUMN'] + key_names + ['VALUE'], sort=False) \
+        .size() \
+        .rename('COUNT') \
         .reset_index() \
-        .set_index(level)
+        .sort_values(by=['COLUMN'] + key_names + ['COUNT', 'VALUE'],
+                     ascending=[True] * (len(keys) + 1) + [False, True],
+                     kind='stable')
+
+    # Rank modes within each column and group, keeping the top k
+    count_df['RANK'] = count_df.groupby(['COLUMN'] + key_names, sort=False).cumcount() + 1
+    count_df = count_df[count_df['RANK'] <= top_k]
+
+    # Pivot ranked modes to one column per value column and rank
+    count_df['MODE'] = value_uniques.take(count_df['VALUE'].to_numpy()) if len(count_df.index) > 0 \
+        else pd.Series(dtype=object)
+    wide_df = count_df \
+        .set_index(key_names + ['COLUMN', 'RANK'])[['MODE', 'COUNT']] \
+        .unstack(['COLUMN', 'RANK'])
+
+    out_index = pd.MultiIndex.from_arrays(
+        [key_uniques[number].take(wide_df.index.get_level_values(name).to_numpy())
+         for number, name in enumerate(key_names)],
+        names=keys) if len(keys) > 1 else \
+        pd.Index(key_uniques[0].take(wide_df.index.to_numpy()), name=keys[0])
+
+    out_df = pd.DataFrame(index=out_index)
+    for number, column in enumerate(values):
+        for rank in range(1, top_k + 1):
+            name = column if top_k == 1 else '{0}_{1}'.format(column, rank)
+            out_df[name] = wide_df.get(('MODE', number, rank), pd.Series(np.nan, index=wide_df.index)).to_numpy()
+            if return_counts:
+                out_df[name + '_count'] = wide_df.get(('COUNT', number, rank),
+                                                      pd.Series(np.nan, index=wide_df.index)).to_numpy()
+
+    return out_df
+
+
+# Per level and species sufficient statistics, shared by species richness and importance values
+@memoize
+def species_stats(tree_table, level):
+    """Creates a dataframe with one row per level polygon and species, holding every sum species richness and
+    species importance values are derived from, in a single groupby over the tree table.
 
-    # Create compound species richness: 3 digit 'number' = CT Uniq SP Hard Mast, CT Uniq SP Other, CT Uniq SP Typical
-    # Count unique species for each SP richness category (Hard Mast, Other, Typical)
-    comp_sp_rich_ct = tree_table_live \
-        .groupby([level, 'SP_RICH_TYPE'], as_index=False) \
-        .agg(COMP_SP_CT=('TR_SP', 'nunique'))
-
-    # pivot count table to wide
-    comp_sp_pivot = comp_sp_rich_ct \
-        .pivot_table(index=level,
-                     columns='SP_RICH_TYPE',
-                     values=['COMP_SP_CT'],
-                     fill_value=0) \
+    Keyword Args:
+        tree_table -- dataframe: input tree_table, produced by the create_tree_table function, or a roll-up cube
+                      from create_tree_cube that includes the TR_SP, TR_HLTH and SP_RICH_TYPE dimensions
+        level      -- string: field name for desired FMG level, i.e. PID, SID, SITE, UNIT
+
+    Details: the returned columns are level, TR_SP, SP_RICH_TYPE, tree_count, stand_dens, TR_BA (sums over the
+    species records), sp_plot_count (count of unique plots the species was recorded on) and LIVE (True where
+    the species has a record that is not dead and not NONE). Rows are sorted by level and TR_SP, rows with a nan
+    level or species are dropped.
+    """
+    # Check input parameters are valid
+    assert isinstance(tree_table, pd.DataFrame), "must be a pandas DataFrame"
+    assert tree_table.columns.isin([level]).any(), "df must contain column specified as level param"
+    assert tree_table.columns.isin(['PID', 'TR_SP', 'TR_HLTH', 'SP_RICH_TYPE']).sum() == 4, \
+        "df must contain columns PID, TR_SP, TR_HLTH and SP_RICH_TYPE"
+
+    # Precompute numeric columns, one row per tree record
+    if 'IS_TREE' in tree_table.columns:
+        tree_flag = tree_table['IS_TREE']
+    else:
+        tree_flag = is_tree(tree_table['TR_SP'])
+
+    live_flag = (tree_table['TR_HLTH'] != 'D') & (tree_table['TR_SP'] != 'NONE')
+    group_columns = list(dict.fromkeys([level, 'TR_SP', 'SP_RICH_TYPE']))
+
+    # Species rich type follows the species, grouping on it keeps it without adding rows
+    stats_df = tree_table[list(dict.fromkeys(group_columns + ['PID']))] \
+        .assign(tree_count=tree_flag.astype('float64'),
+                stand_dens=tree_table['TR_DENS'],
+                TR_BA=tree_table['TR_BA'],
+                LIVE=live_flag.fillna(False).astype(bool)) \
+        .groupby(group_columns, dropna=False, observed=True) \
+        .agg(tree_count=('tree_count', 'sum'),
+             stand_dens=('stand_dens', 'sum'),
+             TR_BA=('TR_BA', 'sum'),
+             sp_plot_count=('PID', 'nunique'),
+             LIVE=('LIVE', 'any')) \
         .reset_index()
 
-    # Flatten multiindex and rename columns
-    comp_sp_pivot.columns = ["_".join(col) for col in comp_sp_pivot.columns.to_flat_index()]
+    stats_df = stats_df[stats_df[level].notna() & stats_df['TR_SP'].notna()] \
+        .reset_index(drop=True)
+    stats_df['sp_plot_count'] = stats_df['sp_plot_count'].astype('float64')
 
-    # set string dtypes
-    level_col_name = level + '_'
-    comp_sp_rich = comp_sp_pivot \
-        .astype(dtype={'COMP_SP_CT_Hard': 'string',
-                       'COMP_SP_CT_Other': 'string',
-                       'COMP_SP_CT_Typical': 'string'}) \
-        .rename(columns={level_col_name: level}) \
-        .set_index(level)
+    return stats_df
 
-    # Concatenate counts into 3 digit string
-    comp_sp_rich['COMP_SP_RICH'] = comp_sp_rich.COMP_SP_CT_Hard.str.cat([comp_sp_rich.COMP_SP_CT_Other,
-                                                                         comp_sp_rich.COMP_SP_CT_Typical])
 
-    # Drop individual count cols from comp sp richness
-    comp_sp_rich = comp_sp_rich \
-        .drop(columns=['COMP_SP_CT_Hard', 'COMP_SP_CT_Other', 'COMP_SP_CT_Typical'])
+# Create both species richness metrics
+def create_sp_richness(tree_table, plot_table, level):
+    """Creates a dataframe with the species richness (SP_RICH, count of live species) and the compound species
+    richness (COMP_SP_RICH, 3 digit string of live species counts: Hard Mast, Other, Typical) of every level
+    polygon in the plot table, from the species_stats table.
+
+    Keyword Args:
+        tree_table -- dataframe: input tree_table, produced by the create_tree_table function
+        plot_table -- dataframe: input plot_table, produced by the create_plot_table function
+        level      -- string: field name for desired FMG level, i.e. PID, SID, SITE, UNIT
+
+    Details: level polygons without live species have a SP_RICH of 0 and a COMP_SP_RICH of NONE.
+    """
+    # Create base df
+    base_df = create_level_df(level, plot_table)
+
+    # Live species of each level polygon
+    live_df = species_stats(tree_table, level)
+    live_df = live_df[live_df['LIVE']]
+
+    # Create Single Number Sp Rich (count of unique species)
+    sp_rich_ct = live_df \
+        .groupby(level, observed=True) \
+        .size() \
+        .rename('SP_RICH')
+
+    # Create compound species richness: count unique species for each SP richness category (Hard, Other, Typical)
+    comp_sp_ct = live_df \
+        .groupby([level, 'SP_RICH_TYPE'], observed=True) \
+        .size() \
+        .unstack('SP_RICH_TYPE') \
+        .reindex(columns=['Hard', 'Other', 'Typical']) \
+        .fillna(0) \
+        .astype('int64') \
+        .astype('string')
+
+    # Concatenate counts into 3 digit string
+    comp_sp_rich = (comp_sp_ct['Hard'] + comp_sp_ct['Other'] + comp_sp_ct['Typical']) \
+        .rename('COMP_SP_RICH')
 
     # Combine dfs into single df
     sp_richness = base_df.join(other=[sp_rich_ct, comp_sp_rich], how='left')
@@ -2540,50 +3205,69 @@ def remove_esri_big_int(in_feature_class):
     arcpy.AddMessage('Complete, check output')
 
 
-# Create species importance values at plot level
-def sp_importance_vals_plot(tree_table):
+# Create species importance values at any level
+def sp_importance_vals(tree_table, level):
+    """Creates a dataframe of species importance values, one row per level polygon and species, from the
+    species_stats table. Works at every level, PID included.
 
-    # Create DF for level metrics
-    iv_level_df = tpa_ba_qmdbh_plot(tree_table=tree_table,
-                                    filter_statement=None)
+    Keyword Args:
+        tree_table -- dataframe: input tree_table, produced by the create_tree_table function
+        level      -- string: field name for desired FMG level, i.e. PID, SID, SITE, UNIT
 
-    iv_level_df = iv_level_df\
-        .rename(columns={'BA': 'Level_BA',
-                         'TPA': 'Level_TPA'})\
-        .drop(columns=['index', 'tree_count', 'plot_count', 'QM_DBH'],
-              errors='ignore')\
-        .set_index('PID')
+    Details: species importance value is the sum of relative frequency, relative BA and relative TPA, each the
+    species share (percent) of the level polygon. Species frequency is the share of the level polygon plots the
+    species was recorded on, level frequency is the sum of the species frequencies.
+    """
+    # Check input parameters are valid
+    assert isinstance(tree_table, pd.DataFrame), "must be a pandas DataFrame"
+    assert tree_table.columns.isin([level]).any(), "df must contain column specified as level param"
 
-    # Create DF for species metrics
-    iv_species_df = tpa_ba_qmdbh_plot_by_case_long(tree_table=tree_table,
-                                                   filter_statement=None,
-                                                   case_column='TR_SP')
+    # Species metrics
+    stats_df = species_stats(tree_table, level)
 
-    iv_species_df = iv_species_df\
-        .rename(columns={'BA': 'Species_BA',
-                         'TPA': 'Species_TPA'})\
-        .drop(columns=['index', 'plot_count', 'tree_count', 'QM_DBH'],
-              errors='ignore')\
-        .set_index('PID')
+    # Level metrics, looked up by level polygon
+    level_df = tpa_ba_qmdbh(tree_table, None, level) \
+        .set_index(level)
+    level_keys = stats_df[level]
 
-    # Join level metrics to species metrics DF by PID
-    iv_df = iv_species_df\
-        .join([iv_level_df],
-              how='left')\
-        .reset_index()
+    baf = 10
+    iv_df = pd.DataFrame({level: stats_df[level],
+                          'TR_SP': stats_df['TR_SP']})
+    iv_df['Species_TPA'] = stats_df['stand_dens'] / level_keys.map(level_df['plot_count']).astype('float64')
+    iv_df['Species_BA'] = (stats_df['tree_count'] * baf) / level_keys.map(level_df['plot_count']).astype('float64')
+    iv_df['Species_PLT_CT'] = stats_df['sp_plot_count']
+    iv_df['Level_PLT_CT'] = level_keys.map(level_df['plot_count']).astype('float64')
+    iv_df['Level_TPA'] = level_keys.map(level_df['TPA']).astype('float64')
+    iv_df['Level_BA'] = level_keys.map(level_df['BA']).astype('float64')
+
+    # Add & populate species and level frequency
+    iv_df['Species_FREQ'] = (iv_df['Species_PLT_CT'] / iv_df['Level_PLT_CT'])
+    iv_df['Level_FREQ'] = iv_df.groupby(level, observed=True)['Species_FREQ'].transform('sum')
 
-    # Add & populate relative BA col
+    # Calc importance value
+    iv_df['Relative_FREQ'] = ((iv_df['Species_FREQ'] / iv_df['Level_FREQ']) * 100)
     iv_df['Relative_BA'] = ((iv_df['Species_BA'] / iv_df['Level_BA']) * 100)
-
-    # Add and populate relative TPA col
     iv_df['Relative_TPA'] = ((iv_df['Species_TPA'] / iv_df['Level_TPA']) * 100)
+    iv_df['SP_IMP_VAL'] = (iv_df['Relative_FREQ'] + iv_df['Relative_BA'] + iv_df['Relative_TPA'])
+
+    return iv_df
+
+
+# Create species importance values at plot level
+def sp_importance_vals_plot(tree_table):
+    """Creates a dataframe of species plot importance values (PLOT_IMPVAL, relative BA plus relative TPA), one row
+    per plot and species, from the sp_importance_vals results at PID.
+
+    Keyword Args:
+        tree_table -- dataframe: input tree_table, produced by the create_tree_table function
+    """
+    iv_df = sp_importance_vals(tree_table, 'PID')
 
     # Add and populate Plot Importance Val Column
     iv_df['PLOT_IMPVAL'] = (iv_df['Relative_BA'] + iv_df['Relative_TPA'])
 
-    # Tweak dtypes
-    iv_df = iv_df.astype(dtype={'Level_TPA': 'float64', 'PLOT_IMPVAL': 'float64', 'Relative_TPA': 'float64',
-                                'Species_TPA': 'float64'})
+    iv_df = iv_df[['PID', 'TR_SP', 'Species_TPA', 'Species_BA', 'Level_TPA', 'Level_BA',
+                   'Relative_BA', 'Relative_TPA', 'PLOT_IMPVAL']]
 
     # Fill NAs
     iv_df = iv_df.fillna(value={'Relative_BA': 0, 'Relative_TPA': 0, 'PLOT_IMPVAL': 0})
@@ -2593,67 +3277,424 @@ def sp_importance_vals_plot(tree_table):
 
 # Create species importance values for non-plot levels
 def sp_importance_vals_level(tree_table, level):
+    """Creates a dataframe of species importance values (SP_IMP_VAL), one row per level polygon and species, from
+    the sp_importance_vals results.
+
+    Keyword Args:
+        tree_table -- dataframe: input tree_table, produced by the create_tree_table function
+        level      -- string: field name for desired FMG level, i.e. SID, SITE, UNIT
+    """
+    iv_df = sp_importance_vals(tree_table, level)
 
-    # Create DF for level metrics
-    iv_level_df = tpa_ba_qmdbh_level(tree_table=tree_table, filter_statement=None, level=level)
+    # Tweak dtypes
+    iv_df = iv_df.astype(dtype={'TR_SP': 'string'})
 
-    iv_level_df = iv_level_df\
-        .rename(columns={'BA': 'Level_BA',
-                         'TPA': 'Level_TPA',
-                         'plot_count': 'Level_PLT_CT'})\
-        .drop(columns=['index', 'tree_count', 'QM_DBH', 'stand_dens'],
-              errors='ignore')\
-        .set_index(level)
+    return iv_df
 
-    # Create DF for species BA & TPA metrics
-    iv_species_ba_df = tpa_ba_qmdbh_level_by_case_long(tree_table=tree_table,
-                                                       filter_statement=None,
-                                                       case_column='TR_SP',
-                                                       level=level)
-
-    iv_species_ba_df = iv_species_ba_df\
-        .rename(columns={'BA': 'Species_BA',
-                         'TPA': 'Species_TPA'})\
-        .drop(columns=['index', 'tree_count', 'stand_dens', 'plot_count', 'QM_DBH'],
-              errors='ignore')\
-        .set_index([level, 'TR_SP'])
-
-    # Create Species plot count DF
-    iv_species_pltct_df = tree_table\
-        .groupby([level, 'TR_SP'], as_index=False)\
-        .agg(Species_PLT_CT=('PID', agg_plot_count))\
-        .set_index([level, 'TR_SP'])
-
-    # Combine component species tables
-    iv_species_df = iv_species_ba_df\
-        .join([iv_species_pltct_df],
-              how='left')\
-        .reset_index()\
-        .set_index(level)
 
-    # Join level metrics to species metrics DF by level
-    iv_df = iv_species_df\
-        .join([iv_level_df],
-              how='left')
+# Summary metric, a grouped computation and the output columns taken from it, see plan_summaries
+SummaryMetric = collections.namedtuple('SummaryMetric', ['metric', 'case_column', 'filter', 'rename'],
+                                       defaults=[None, None, None])
+
+# Summary specification, the metrics joined onto the level polygons, the tree table read and the output schema
+SummarySpec = collections.namedtuple('SummarySpec', ['table_name', 'col_csv', 'metrics', 'tree', 'base', 'replace'],
+                                     defaults=['cube', None, None])
+
+
+# Summary computation: TPA, BA, QM DBH for a batch of filters, wide by case column when one is given
+def _summary_tpa(tables, level, case_column, filter_statements):
+    tree_table = tables['tree']
+    case_columns = None if case_column is None else [case_column]
+    tpa_dfs = tpa_ba_qmdbh_many(tree_table=tree_table,
+                                filter_statements=filter_statements,
+                                level=level,
+                                case_columns=case_columns,
+                                wide=case_column is not None,
+                                sum_tr_ba=level == 'PID')
+
+    # Join each filter back to the level polygons as the tpa_ba_qmdbh_plot* and tpa_ba_qmdbh_level* functions do
+    out_dfs = []
+    for filter_statement, tpa_df in zip(filter_statements, tpa_dfs):
+        if case_column is None and level == 'PID':
+            tpa_df = _tpa_plot_join(tree_table, tpa_df, filter_statement)
+        elif case_column is None:
+            tpa_df = level_join(tree_table, tpa_df, level, how='left')
+        else:
+            tpa_df = level_join(tree_table, tpa_df.set_index(level), level, how='left')
+        out_dfs.append(tpa_df.set_index(level))
 
-    # Add & populate species frequency
-    iv_df['Species_FREQ'] = (iv_df['Species_PLT_CT'] / iv_df['Level_PLT_CT'])
+    return out_dfs
 
-    # Create level frequency
-    iv_level_freq = iv_df.groupby(level).agg(Level_FREQ=('Species_FREQ', 'sum'))
 
-    # Join level freq to back to iv df
-    iv_df = iv_df.join([iv_level_freq], how='left').reset_index()
+# Summary computation: dominant case and percent composition for a batch of filters, one frame per filter
+def _summary_dominance(tables, level, case_column, filter_statements):
+    names = ['FILTER_{0}'.format(number) for number in range(len(filter_statements))]
+    dom_df = dominance_many(tree_table=tables['tree'],
+                            level=level,
+                            case_column=case_column,
+                            filters=dict(zip(names, filter_statements)))
 
-    # Calc importance value
-    iv_df['Relative_FREQ'] = ((iv_df['Species_FREQ'] / iv_df['Level_FREQ']) * 100)
-    iv_df['Relative_BA'] = ((iv_df['Species_BA'] / iv_df['Level_BA']) * 100)
-    iv_df['Relative_TPA'] = ((iv_df['Species_TPA'] / iv_df['Level_TPA']) * 100)
-    iv_df['SP_IMP_VAL'] = (iv_df['Relative_FREQ'] + iv_df['Relative_BA'] + iv_df['Relative_TPA'])
+    return [dom_df[[name, name + '_PCMP']].set_axis(['DOM', 'DOM_PCMP'], axis='columns') for name in names]
 
-    # Tweak dtypes
-    iv_df = iv_df.astype(dtype={'Species_TPA': 'float64', 'Level_TPA': 'float64', 'Relative_TPA': 'float64',
-                                'SP_IMP_VAL': 'float64', 'TR_SP': 'string'})
 
-    return iv_df
+# Summary computation: tree count for a batch of filters
+def _summary_tree_count(tables, level, case_column, filter_statements):
+    tree_table = tables['tree']
+    rows, filter_numbers = _filter_stack(tree_table, filter_statements)
+
+    count_df = tree_table[[level, 'IS_TREE']] \
+        .iloc[rows] \
+        .assign(FILTER=filter_numbers) \
+        .groupby(['FILTER', level], as_index=False, observed=True)['IS_TREE'] \
+        .sum()
+
+    out_dfs = []
+    for number in range(len(filter_statements)):
+        tree_count = count_df[count_df['FILTER'] == number].set_index(level)['IS_TREE']
+        out_dfs.append(empty_categories(tree_count.to_frame('TR_CT')))
+
+    return out_dfs
+
+
+# Summary computation: average mean diameter and max DBH
+def _summary_diameter(tables, level, case_column, filter_statement):
+    tree_table = tables['tree']
+    if filter_statement is not None:
+        tree_table = tree_table[tree_filter(tree_table, filter_statement)]
+
+    diam_df = tree_table \
+        .groupby([level], observed=True) \
+        .agg(AMD=('TR_DIA', 'mean'),
+             MAX_DBH=('TR_DIA', 'max'))
+
+    return empty_categories(diam_df)
+
+
+# Summary computation: inventory year or range of years from tree collection dates
+def _summary_inventory_years(tables, level, case_column, filter_statement):
+    date_df = tables['tree'] \
+        .groupby([level], as_index=False, observed=True) \
+        .agg(min_date=('COL_DATE', 'min'),
+             max_date=('COL_DATE', 'max'))
+    date_df['min_year'] = date_df['min_date'].dt.year
+    date_df['max_year'] = date_df['max_date'].dt.year
+    date_df['INVT_YEAR'] = date_df.apply(lambda x: date_range(x['min_year'], x['max_year']), axis=1)
+
+    return date_df[[level, 'INVT_YEAR']].set_index(level)
+
+
+# Summary computation: plot counts, overstory and understory statistics, notes and invasives from the plot table
+def _summary_plot_description(tables, level, case_column, filter_statement):
+    plot_table = tables['plot']
+    plot_flags = plot_table \
+        .assign(FX_NOTE_FLAG=has_note(plot_table['FX_MISC']),
+                AGE_NOTE_FLAG=has_note(plot_table['AGE_MISC']))
+
+    gendesc = plot_flags \
+        .groupby([level], observed=True) \
+        .agg(PLOT_CT=('PID', 'nunique'),
+             TR_AGE_CT=('AGE_SP', 'count'),
+             OV_CLSR_MEAN=('OV_CLSR', 'mean'),
+             OV_CLSR_STD=('OV_CLSR', 'std'),
+             OV_HT_MEAN=('OV_HT', 'mean'),
+             OV_HT_STD=('OV_HT', 'std'),
+             UND_COV_MEAN=('UND_COV', 'mean'),
+             UND_COV_STD=('UND_COV', 'std'),
+             UND_HT_MEAN=('UND_HT2', 'mean'),
+             UND_HT_STD=('UND_HT2', 'std'),
+             NUM_FIX_NOTES=('FX_NOTE_FLAG', 'sum'),
+             NUM_AGE_NOTES=('AGE_NOTE_FLAG', 'sum'))
+
+    gendesc['INV_PRESENT'] = inv_present_any(plot_table, level)
+    gendesc['INV_SP'] = inv_sp_union(plot_table, level)
+    gendesc['UND_HT_RG'] = class_values(und_height_range(gendesc['UND_HT_MEAN']))
+
+    return gendesc
+
+
+# Summary computation: plot table attributes of each plot, with output names
+def _summary_plot_attributes(tables, level, case_column, filter_statement):
+    assert level == 'PID', "plot attributes are only available at PID"
+
+    plot_metrics = tables['plot'] \
+        .drop(columns=['UND_SP1', 'UND_SP2', 'UND_SP3',
+                       'GRD_SP1', 'GRD_SP2', 'GRD_SP3',
+                       'NOT_SP1', 'NOT_SP2', 'NOT_SP3',
+                       'NOT_SP4', 'NOT_SP5',
+                       'COL_CREW', 'AGENCY', 'DISTRICT',
+                       'ITERATION', 'SHAPE'],
+              errors='ignore') \
+        .rename(columns={'AGE_MISC': 'AGE_NOTE',
+                         'FX_MISC': 'FIXED_NOTE',
+                         'UND_HT': 'UND_HT_RG',
+                         'UND_HT2': 'UND_HT_MEAN',
+                         'MAST_TYPE': 'AGE_MAST_TYPE'})
+
+    plot_metrics['INVT_YEAR'] = plot_metrics['COL_DATE'].dt.year
+
+    return plot_metrics.set_index('PID')
+
+
+# Summary computation: mean age tree statistics, mean age only when filtered to case column values
+def _summary_age(tables, level, case_column, filter_statement):
+    age_plots = tables['plot'].query("AGE_ORIG==AGE_ORIG")
+
+    if filter_statement is None:
+        age_df = age_plots \
+            .groupby([level], observed=True) \
+            .agg(AGE_ORIG=('AGE_ORIG', 'mean'),
+                 AGE_DBH=('AGE_DIA', 'mean'),
+                 AGE_GRW=('AGE_GRW', 'mean'),
+                 AGE_UND_COV=('UND_COV', 'mean')) \
+            .astype({'AGE_ORIG': 'int', 'AGE_UND_COV': 'int'})
+        return age_df
+
+    age_df = age_plots[age_plots[case_column].isin(filter_statement)] \
+        .groupby([level], observed=True) \
+        .agg(AGE_ORIG=('AGE_ORIG', 'mean')) \
+        .astype({'AGE_ORIG': 'int'})
+
+    return empty_categories(age_df)
+
+
+# Summary computation: most frequent understory, ground and notable species, as recorded at PID
+def _summary_understory_species(tables, level, case_column, filter_statement):
+    sp_columns = ['UND_SP1', 'UND_SP2', 'UND_SP3',
+                  'GRD_SP1', 'GRD_SP2', 'GRD_SP3',
+                  'NOT_SP1', 'NOT_SP2', 'NOT_SP3']
+    fixed_df = tables['fixed']
+
+    if level == 'PID':
+        return fixed_df[['PID'] + sp_columns].set_index('PID')
+
+    return get_groupby_modes_many(source=fixed_df,
+                                  keys=[level],
+                                  values=sp_columns,
+                                  exclude={column: ['NONE'] for column in sp_columns},
+                                  dropna=True,
+                                  return_counts=False)
+
+
+# Summary computation: top 5 overstory species statistics
+def _summary_overstory_species(tables, level, case_column, filter_statement):
+    return top5_ov_species(tree_table=tables['tree'], level=level).set_index(level)
+
+
+# Summary computation: species richness
+def _summary_species_richness(tables, level, case_column, filter_statement):
+    return create_sp_richness(tree_table=tables['tree'], plot_table=tables['plot'], level=level).set_index(level)
+
+
+# Stocking percent from a TPA, BA, QM DBH computation
+def _stocking_frame(tpa_df):
+    return stocking_pct(tpa_df['TPA'], tpa_df['QM_DBH']).rename('STOCK_PCT').to_frame()
+
+
+# Grouped computations available to summary specifications, batched computations take a list of filters
+SUMMARY_COMPUTATIONS = {'tpa': _summary_tpa,
+                        'dominance': _summary_dominance,
+                        'tree_count': _summary_tree_count,
+                        'diameter': _summary_diameter,
+                        'inventory_years': _summary_inventory_years,
+                        'plot_description': _summary_plot_description,
+                        'plot_attributes': _summary_plot_attributes,
+                        'age': _summary_age,
+                        'understory_species': _summary_understory_species,
+                        'overstory_species': _summary_overstory_species,
+                        'species_richness': _summary_species_richness}
+
+# Computations run as one stacked pass per batch of filters, the others run once per filter
+_BATCHED_COMPUTATIONS = {'tpa', 'dominance', 'tree_count'}
+
+# Table each computation reads, tree computations read the tree table of the summary specification
+_COMPUTATION_SOURCES = {'plot_description': 'plot',
+                        'plot_attributes': 'plot',
+                        'age': 'plot',
+                        'understory_species': 'fixed'}
+
+# Metrics available to summary specifications, the computation each reads and an optional derivation
+SUMMARY_METRICS = {'tpa_ba_qmdbh': ('tpa', None),
+                   'stocking': ('tpa', _stocking_frame)}
+SUMMARY_METRICS.update({name: (name, None) for name in SUMMARY_COMPUTATIONS if name != 'tpa'})
+
+
+# Key of the grouped computation result a metric reads
+def _summary_key(spec, metric, level):
+    assert metric.metric in SUMMARY_METRICS, "unknown summary metric {0}".format(metric.metric)
+    computation = SUMMARY_METRICS[metric.metric][0]
+    return computation, spec.tree, level, metric.case_column, metric.filter
+
+
+# Compile summary specifications into the grouped computations needed at a level
+def plan_summaries(specs, level, plan=None):
+    """Compiles summary specifications into the fewest grouped computations for a level. Metric requests are
+    grouped by grouping key (computation, tree table, level and case column), within and across summaries.
+    Each group of a batched computation (tpa, dominance, tree_count) is one pass over its table, with the
+    group's filters stacked as an extra dimension, other computations run once per distinct filter.
+
+    Keyword Args:
+        specs -- list: SummarySpec specifications, see forest_summaries.SUMMARY_SPECS
+        level -- string: field name for desired FMG level, i.e. PID, SID, SITE, UNIT
+        plan  -- dictionary: an existing plan to add the requests to, so the requests of every level of a run
+                 can be collected into one plan. If None, a new plan is started.
+
+    Details: the plan is a dictionary with (computation, tree, level, case column) grouping keys and the list of
+    distinct filters requested for each key as values. See describe_summary_plan for a readable plan.
+    """
+    plan = {} if plan is None else plan
+    for spec in specs:
+        metrics = list(spec.metrics) + ([spec.base] if spec.base is not None else [])
+        for metric in metrics:
+            computation, tree, level, case_column, filter_statement = _summary_key(spec, metric, level)
+            group = plan.setdefault((computation, tree, level, case_column), [])
+            if filter_statement not in group:
+                group.append(filter_statement)
+
+    return plan
+
+
+# Describe the passes of a summary plan
+def describe_summary_plan(plan, tables):
+    """Creates a dataframe describing a plan from plan_summaries, one row per grouping key with the number of
+    filters, the number of passes over the source table and the number of rows those passes group.
+
+    Keyword Args:
+        plan   -- dictionary: summary plan, produced by the plan_summaries function
+        tables -- dictionary: input tables, see run_summary_plan
+
+    Details: a batched group is one pass over its filters' stacked rows, every other group is one pass over the
+    whole source table per filter.
+    """
+    rows = []
+    for (computation, tree, level, case_column), filter_statements in plan.items():
+        source = _COMPUTATION_SOURCES.get(computation, tree)
+        source_rows = len(tables[source].index)
+
+        if computation in _BATCHED_COMPUTATIONS:
+            passes = 1
+            rows_scanned = len(_filter_stack(tables[source], filter_statements)[0])
+        else:
+            passes = len(filter_statements)
+            rows_scanned = source_rows * passes
+
+        rows.append({'computation': computation,
+                     'source': source,
+                     'level': level,
+                     'case_column': case_column,
+                     'filters': len(filter_statements),
+                     'passes': passes,
+                     'rows_scanned': rows_scanned})
+
+    return pd.DataFrame(rows, columns=['computation', 'source', 'level', 'case_column', 'filters', 'passes',
+                                       'rows_scanned'])
+
+
+# Run one grouped computation of a summary plan, one result per filter
+def _run_summary_pass(key, filter_statements, tables):
+    computation, tree, level, case_column = key
+    source = dict(tables, tree=tables[tree])
+
+    if computation in _BATCHED_COMPUTATIONS:
+        return SUMMARY_COMPUTATIONS[computation](source, level, case_column, filter_statements)
+    return [SUMMARY_COMPUTATIONS[computation](source, level, case_column, filter_statement)
+            for filter_statement in filter_statements]
+
+
+# Input tables of a summary worker process, shipped once per worker by _init_summary_worker
+_WORKER_TABLES = {}
+
+
+# Summary worker process initializer
+def _init_summary_worker(tables):
+    _WORKER_TABLES.update(tables)
+
+
+# Run one grouped computation of a summary plan in a summary worker process
+def _run_summary_pass_worker(key, filter_statements):
+    return _run_summary_pass(key, filter_statements, _WORKER_TABLES)
+
+
+# Run the grouped computations of a summary plan
+def run_summary_plan(plan, tables, workers=1):
+    """Runs each pass of a plan from plan_summaries once, scattering the results back to one result per
+    requested computation, tree table, level, case column and filter.
+
+    Keyword Args:
+        plan    -- dictionary: summary plan, produced by the plan_summaries function
+        tables  -- dictionary: input tables, 'plot' (create_plot_table), 'tree' (create_tree_table), 'cube'
+                   (create_tree_cube) and 'fixed' (fixed plot dataframe) keys
+        workers -- integer: number of worker processes running the passes concurrently. Defaults to 1, running
+                   every pass in this process.
+
+    Details: with more than one worker the input tables are sent to each worker process once, when the worker
+    starts, and only pass keys and results travel per pass. Results are gathered in plan order, so the output
+    does not depend on the number of workers. Scripts running more than one worker on Windows must run under a
+    __name__ == '__main__' guard and, inside ArcGIS Pro, point multiprocessing.set_executable at python.exe.
+    """
+    assert isinstance(workers, int) and workers >= 1, "workers must be a positive integer"
+
+    if workers == 1 or len(plan) < 2:
+        passes = [_run_summary_pass(key, filter_statements, tables) for key, filter_statements in plan.items()]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(plan)),
+                                                    initializer=_init_summary_worker,
+                                                    initargs=(tables,)) as executor:
+            futures = [executor.submit(_run_summary_pass_worker, key, filter_statements)
+                       for key, filter_statements in plan.items()]
+            passes = [future.result() for future in futures]
+
+    results = {}
+    for (key, filter_statements), frames in zip(plan.items(), passes):
+        for filter_statement, frame in zip(filter_statements, frames):
+            results[key + (filter_statement,)] = frame
+
+    return results
+
+
+# Output columns of a metric, derived and renamed from its computation result
+def _summary_metric_frame(spec, metric, level, results):
+    metric_df = results[_summary_key(spec, metric, level)]
+    derive = SUMMARY_METRICS[metric.metric][1]
+    if derive is not None:
+        metric_df = derive(metric_df)
+
+    # Rename keys select the output columns, columns of categories without trees are left to the schema
+    if metric.rename is not None:
+        metric_df = metric_df[[column for column in metric.rename if column in metric_df.columns]] \
+            .rename(columns=metric.rename)
+
+    return metric_df
+
+
+# Build a summary dataframe from the results of a summary plan
+def assemble_summary(spec, level, results, plot_table):
+    """Joins the metrics of a summary specification onto the level polygons and enforces the output schema.
+
+    Keyword Args:
+        spec       -- SummarySpec: summary specification, see forest_summaries.SUMMARY_SPECS
+        level      -- string: field name for desired FMG level, i.e. PID, SID, SITE, UNIT
+        results    -- dictionary: computation results, produced by the run_summary_plan function
+        plot_table -- dataframe: input plot_table, produced by the create_plot_table function
+    """
+    if spec.base is None:
+        base_df = create_level_df(level, plot_table)
+    else:
+        base_df = _summary_metric_frame(spec, spec.base, level, results)
+
+    # Merge metric dataframes onto the base dataframe
+    out_df = base_df \
+        .join(other=[_summary_metric_frame(spec, metric, level, results) for metric in spec.metrics],
+              how='left') \
+        .reset_index()
+
+    # Decode categorical columns for output
+    out_df = decode_categories(out_df)
+
+    # Replace blank values
+    if spec.replace is not None:
+        out_df = out_df.replace(spec.replace)
+
+    # Reorder columns, fill nans and enforce ESRI compatible dtypes
+    out_df = fmg_enforce_schema(df=out_df, level=level, col_csv=spec.col_csv)
 
+    return out_df
@@ -0,0 +1,496 @@
+# FMG storage backends, reading the plot feature classes and writing the summary outputs
+
+import os
+import abc
+import hashlib
+import collections
+import sqlite3
+import struct
+import contextlib
+import pandas as pd
+
+# ArcGIS is optional, only ArcpyStorage requires it
+try:
+    import arcpy
+    from arcgis.features import GeoAccessor, GeoSeriesAccessor
+except ImportError:
+    arcpy = None
+
+# Fingerprint of a source feature class, see Storage.fingerprint
+SourceFingerprint = collections.namedtuple('SourceFingerprint', ['row_count', 'last_edited', 'content_hash'])
+
+
+# Storage backends, reading the FMG plot feature classes and writing summary tables and feature classes
+class Storage(abc.ABC):
+    """Interface of the FMG storage backends. Sources are the input plot datasets named as the backend expects,
+    i.e. feature class paths for ArcpyStorage, and outputs are written by table name to the backend workspace.
+    Subclasses implement every abstract method.
+
+    Attributes:
+        threaded_writes -- boolean: if True, summary tables may be written from a background writer thread while
+                           the next summary is assembled, see forest_summaries.run_summaries
+    """
+
+    threaded_writes = True
+
+    @abc.abstractmethod
+    def read_plots(self, source, partition=None):
+        """Returns a dataframe of the rows of a plot dataset, geometry in the SHAPE column, limited to the rows of
+        one level polygon when partition is a (level, value) pair, see forest_calcs.partition_values."""
+
+    def read_trees(self, source, partition=None):
+        """Returns a dataframe of the tallied trees of a prism plot dataset, see read_plots."""
+        return self.read_plots(source, partition)
+
+    @abc.abstractmethod
+    def write_table(self, df, name):
+        """Writes a dataframe to a table of the workspace, replacing any existing table, and returns its path."""
+
+    @abc.abstractmethod
+    def write_features(self, df, name):
+        """Writes a dataframe with a SHAPE column to a feature class of the workspace, replacing any existing
+        feature class, and returns its path."""
+
+    @abc.abstractmethod
+    def table_path(self, name):
+        """Returns the path of a table of the workspace."""
+
+    @abc.abstractmethod
+    def exists(self, name):
+        """Returns True when the workspace holds a table of this name."""
+
+    @abc.abstractmethod
+    def patch_table(self, df, name, level, patch_values):
+        """Deletes the rows of a table with a level value in patch_values, None matching rows without a value,
+        and appends the rows of a dataframe."""
+
+    @abc.abstractmethod
+    def field_names(self, source):
+        """Returns the field names of a source."""
+
+    @abc.abstractmethod
+    def level_values(self, source, level):
+        """Returns the set of values of a level field in a source, None when a row has no value."""
+
+    @abc.abstractmethod
+    def fingerprint(self, source):
+        """Returns the SourceFingerprint of a source."""
+
+
+class ArcpyStorage(Storage):
+    """Storage backend reading ESRI feature classes and writing to a file geodatabase, requires arcpy and arcgis.
+    arcpy is not thread safe, so tables are written from the calling thread.
+
+    Keyword Args:
+        workspace -- string: path to the output geodatabase, may be None when only reading
+    """
+
+    threaded_writes = False
+
+    def __init__(self, workspace=None):
+        assert arcpy is not None, "ArcpyStorage requires arcpy"
+        self.workspace = workspace
+
+    def read_plots(self, source, partition=None):
+        if partition is None:
+            return pd.DataFrame.spatial.from_featureclass(source)
+        return pd.DataFrame.spatial.from_featureclass(source, where_clause=self.partition_where(source, *partition))
+
+    def write_table(self, df, name):
+        table_path = self.table_path(name)
+        df.spatial.to_table(location=table_path, sanitize_columns=False)
+        return table_path
+
+    def write_features(self, df, name):
+        table_path = self.table_path(name)
+        df.spatial.to_featureclass(location=table_path, sanitize_columns=False)
+        return table_path
+
+    def table_path(self, name):
+        return os.path.join(self.workspace, name)
+
+    def exists(self, name):
+        return arcpy.Exists(self.table_path(name))
+
+    def patch_table(self, df, name, level, patch_values):
+        table_path = self.table_path(name)
+        patch_values = set(patch_values)
+        if len(patch_values) > 0:
+            with arcpy.da.UpdateCursor(table_path, [level]) as cursor:
+                for row in cursor:
+                    if row[0] in patch_values:
+                        cursor.deleteRow()
+
+        if len(df.index) > 0:
+            patch_path = os.path.join('memory', 'fmg_summary_patch')
+            df.spatial.to_table(location=patch_path, sanitize_columns=False)
+            arcpy.management.Append(inputs=patch_path, target=table_path, schema_type='NO_TEST')
+            arcpy.management.Delete(patch_path)
+
+    def field_names(self, source):
+        return [field.name for field in arcpy.ListFields(source)]
+
+    def level_values(self, source, level):
+        with arcpy.da.SearchCursor(source, [level]) as cursor:
+            return set(row[0] for row in cursor)
+
+    def fingerprint(self, source):
+        return self.source_fingerprint(source)
+
+    # Fingerprint a source feature class without building a dataframe
+    def source_fingerprint(self, source):
+        """Returns a SourceFingerprint of the row count, the latest editor tracking edit date (None when editor
+        tracking is off) and a hex digest of the field names and row values, geometry included, of a feature class.
+
+        Keyword Args:
+            source -- string: path to the feature class or table, i.e. the prism plot feature class
+
+        Details: rows are read with a search cursor in object id order, which is much faster than from_featureclass
+        as no geometry objects are built.
+        """
+        describe = arcpy.Describe(source)
+        fields = [field.name for field in arcpy.ListFields(source) if field.type not in ('Geometry', 'Raster', 'Blob')]
+        if getattr(describe, 'shapeFieldName', None):
+            fields.append('SHAPE@WKB')
+
+        edit_position = None
+        if getattr(describe, 'editorTrackingEnabled', False) and describe.editedAtFieldName in fields:
+            edit_position = fields.index(describe.editedAtFieldName)
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(fields).encode())
+        row_count = 0
+        last_edited = None
+        order_by = 'ORDER BY {0}'.format(describe.OIDFieldName) if getattr(describe, 'hasOID', False) else None
+        with arcpy.da.SearchCursor(source, fields, sql_clause=(None, order_by)) as cursor:
+            for row in cursor:
+                row_count += 1
+                digest.update(repr(row).encode())
+                if edit_position is not None and row[edit_position] is not None:
+                    last_edited = row[edit_position] if last_edited is None else max(last_edited, row[edit_position])
+
+        return SourceFingerprint(row_count, last_edited, digest.hexdigest())
+
+    # SQL where clause selecting the rows of one level polygon
+    def partition_where(self, source, level, value):
+        """Returns a where clause selecting the rows of a feature class with a level value, or without a level value
+        when value is None.
+
+        Keyword Args:
+            source -- string: path to the feature class, used to delimit the field name
+            level  -- string: field name of the partition level, i.e. POOL or COMP
+            value  -- string: level value to select
+        """
+        field = arcpy.AddFieldDelimiters(source, level)
+        if value is None:
+            return '{0} IS NULL'.format(field)
+
+        return "{0} = '{1}'".format(field, str(value).replace("'", "''"))
+
+
+# Quote a table or column name for SQLite
+def _sql_name(name):
+    return '"{0}"'.format(str(name).replace('"', '""'))
+
+
+# Rows of a dataframe as python values for SQLite, missing values as None and dates as GeoPackage date times
+def _sql_rows(df):
+    values = df.copy()
+    for column in values.columns:
+        if pd.api.types.is_datetime64_any_dtype(values[column]):
+            values[column] = values[column].dt.strftime('%Y-%m-%dT%H:%M:%S.%f').str[:-3] + 'Z'
+    values = values.astype('object')
+
+    return list(values.where(values.notna(), None).itertuples(index=False, name=None))
+
+
+class GeoPackageStorage(Storage):
+    """Storage backend over OGC GeoPackages using the sqlite3 module, no ArcGIS or geospatial libraries required.
+    Sources are layer names in the workspace GeoPackage or paths to a layer of another GeoPackage, i.e.
+    C:/FMG/field.gpkg/Prism. Geometries are kept as GeoPackage geometry blobs in the SHAPE column.
+
+    Keyword Args:
+        path -- string: path to the output GeoPackage, created on the first write when missing
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._srs = {}
+
+    # GeoPackage and table name of a source
+    def _source(self, source):
+        gpkg_path, name = os.path.split(source)
+        if not gpkg_path.lower().endswith('.gpkg'):
+            gpkg_path, name = self.path, source
+        return gpkg_path, name[len('main.'):] if name.startswith('main.') else name
+
+    # Connection to the output GeoPackage, creating the GeoPackage tables when missing
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        with connection:
+            if connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'gpkg_contents'").fetchone() is None:
+                connection.execute('PRAGMA application_id = 1196444487')
+                connection.execute('PRAGMA user_version = 10300')
+                connection.execute('CREATE TABLE gpkg_spatial_ref_sys (srs_name TEXT NOT NULL, '
+                                   'srs_id INTEGER PRIMARY KEY, organization TEXT NOT NULL, '
+                                   'organization_coordsys_id INTEGER NOT NULL, definition TEXT NOT NULL, '
+                                   'description TEXT)')
+                connection.executemany('INSERT INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)',
+                                       [('Undefined cartesian SRS', -1, 'NONE', -1, 'undefined', None),
+                                        ('Undefined geographic SRS', 0, 'NONE', 0, 'undefined', None),
+                                        ('WGS 84 geodetic', 4326, 'EPSG', 4326,
+                                         'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,'
+                                         '298.257223563]],PRIMEM["Greenwich",0],UNIT["degree",0.0174532925199433]]',
+                                         None)])
+                connection.execute("CREATE TABLE gpkg_contents (table_name TEXT NOT NULL PRIMARY KEY, "
+                                   "data_type TEXT NOT NULL, identifier TEXT UNIQUE, description TEXT DEFAULT '', "
+                                   "last_change DATETIME NOT NULL DEFAULT "
+                                   "(strftime('%Y-%m-%dT%H:%M:%fZ', 'now')), min_x DOUBLE, min_y DOUBLE, "
+                                   "max_x DOUBLE, max_y DOUBLE, srs_id INTEGER)")
+                connection.execute('CREATE TABLE gpkg_geometry_columns (table_name TEXT NOT NULL, '
+                                   'column_name TEXT NOT NULL, geometry_type_name TEXT NOT NULL, '
+                                   'srs_id INTEGER NOT NULL, z TINYINT NOT NULL, m TINYINT NOT NULL, '
+                                   'PRIMARY KEY (table_name, column_name))')
+        return connection
+
+    # Declared types of the columns of a table, the primary key and the geometry column name
+    @staticmethod
+    def _columns(connection, name):
+        table_info = connection.execute('PRAGMA table_info({0})'.format(_sql_name(name))).fetchall()
+        assert len(table_info) > 0, "{0} is not a table of the GeoPackage".format(name)
+        geometry = connection.execute('SELECT column_name FROM gpkg_geometry_columns WHERE table_name = ?',
+                                      (name,)).fetchone()
+        primary_keys = [row[1] for row in table_info if row[5] > 0]
+        return ({row[1]: row[2].upper() for row in table_info},
+                primary_keys[0] if len(primary_keys) == 1 else None,
+                geometry[0] if geometry is not None else None)
+
+    def read_plots(self, source, partition=None):
+        gpkg_path, name = self._source(source)
+        with contextlib.closing(sqlite3.connect(gpkg_path)) as connection:
+            column_types, primary_key, geometry = self._columns(connection, name)
+            sql, params = 'SELECT * FROM {0}'.format(_sql_name(name)), ()
+            if partition is not None:
+                level, value = partition
+                if value is None:
+                    sql += ' WHERE {0} IS NULL'.format(_sql_name(level))
+                else:
+                    sql, params = sql + ' WHERE {0} = ?'.format(_sql_name(level)), (value,)
+            df = pd.read_sql_query(sql, connection, params=params)
+
+            # Remember the spatial reference of the geometries, so written feature classes can register it
+            if geometry is not None:
+                self._srs.update((row[1], row) for row in connection.execute(
+                    'SELECT * FROM gpkg_spatial_ref_sys WHERE srs_id IN '
+                    '(SELECT srs_id FROM gpkg_geometry_columns WHERE table_name = ?)', (name,)))
+
+        # Parse dates and name the key and geometry columns as ESRI feature classes do
+        for column, column_type in column_types.items():
+            if column_type in ('DATE', 'DATETIME'):
+                df[column] = pd.to_datetime(df[column], utc=True, format='ISO8601').dt.tz_localize(None)
+
+        return df.rename(columns={primary_key: 'OBJECTID', geometry: 'SHAPE'})
+
+    def write_table(self, df, name):
+        return self._write(df, name, geometry=False)
+
+    def write_features(self, df, name):
+        return self._write(df, name, geometry=True)
+
+    # Create a table, or a feature class with the SHAPE column as its geometry column, and insert the rows
+    def _write(self, df, name, geometry):
+        df = df.drop(columns=['OBJECTID'], errors='ignore')
+        assert not geometry or 'SHAPE' in df.columns, "features require a SHAPE column"
+        column_types = []
+        for column, dtype in df.dtypes.items():
+            if column == 'SHAPE' and geometry:
+                column_types.append('GEOMETRY')
+            elif pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+                column_types.append('INTEGER')
+            elif pd.api.types.is_float_dtype(dtype):
+                column_types.append('REAL')
+            elif pd.api.types.is_datetime64_any_dtype(dtype):
+                column_types.append('DATETIME')
+            else:
+                column_types.append('TEXT')
+        table = _sql_name(name)
+
+        with contextlib.closing(self._connect()) as connection, connection:
+            connection.execute('DROP TABLE IF EXISTS {0}'.format(table))
+            connection.execute('CREATE TABLE {0} (fid INTEGER PRIMARY KEY AUTOINCREMENT{1})'.format(
+                table, ''.join(', {0} {1}'.format(_sql_name(column), column_type)
+                               for column, column_type in zip(df.columns, column_types))))
+            self._insert(connection, df, name)
+
+            # Register the table, and its geometry column with the spatial reference of the first geometry
+            srs_id = None
+            if geometry:
+                blobs = df['SHAPE'].dropna()
+                srs_id = 0
+                if len(blobs.index) > 0:
+                    blob = bytes(blobs.iloc[0])
+                    srs_id = struct.unpack('<i' if blob[3] & 1 else '>i', blob[4:8])[0]
+                if connection.execute('SELECT 1 FROM gpkg_spatial_ref_sys WHERE srs_id = ?',
+                                      (srs_id,)).fetchone() is None:
+                    connection.execute('INSERT INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)',
+                                       self._srs.get(srs_id, ('Unknown', srs_id, 'NONE', srs_id, 'undefined', None)))
+            connection.execute('DELETE FROM gpkg_geometry_columns WHERE table_name = ?', (name,))
+            connection.execute('INSERT OR REPLACE INTO gpkg_contents (table_name, data_type, identifier, srs_id) '
+                               'VALUES (?, ?, ?, ?)', (name, 'features' if geometry else 'attributes', name, srs_id))
+            if geometry:
+                connection.execute('INSERT INTO gpkg_geometry_columns VALUES (?, ?, ?, ?, ?, ?)',
+                                   (name, 'SHAPE', 'GEOMETRY', srs_id, 0, 0))
+
+        return self.table_path(name)
+
+    # Insert the rows of a dataframe and record the change time of the table
+    @staticmethod
+    def _insert(connection, df, name):
+        connection.executemany('INSERT INTO {0} ({1}) VALUES ({2})'.format(
+            _sql_name(name), ', '.join(_sql_name(column) for column in df.columns), ', '.join('?' * len(df.columns))),
+            _sql_rows(df))
+        connection.execute("UPDATE gpkg_contents SET last_change = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') "
+                           "WHERE table_name = ?", (name,))
+
+    def table_path(self, name):
+        return os.path.join(self.path, name)
+
+    def exists(self, name):
+        if not os.path.exists(self.path):
+            return False
+        with contextlib.closing(sqlite3.connect(self.path)) as connection:
+            return connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                      (name,)).fetchone() is not None
+
+    def patch_table(self, df, name, level, patch_values):
+        if not self.exists(name):
+            self.write_table(df, name)
+            return
+
+        patch_values = set(patch_values)
+        values = [value for value in patch_values if value is not None]
+        with contextlib.closing(self._connect()) as connection, connection:
+            if len(values) > 0:
+                connection.execute('DELETE FROM {0} WHERE {1} IN ({2})'.format(
+                    _sql_name(name), _sql_name(level), ', '.join('?' * len(values))), values)
+            if None in patch_values:
+                connection.execute('DELETE FROM {0} WHERE {1} IS NULL'.format(_sql_name(name), _sql_name(level)))
+            if len(df.index) > 0:
+                self._insert(connection, df.drop(columns=['OBJECTID'], errors='ignore'), name)
+
+    def field_names(self, source):
+        gpkg_path, name = self._source(source)
+        with contextlib.closing(sqlite3.connect(gpkg_path)) as connection:
+            column_types, primary_key, geometry = self._columns(connection, name)
+        renames = {primary_key: 'OBJECTID', geometry: 'SHAPE'}
+        return [renames.get(column, column) for column in column_types]
+
+    def level_values(self, source, level):
+        gpkg_path, name = self._source(source)
+        with contextlib.closing(sqlite3.connect(gpkg_path)) as connection:
+            return set(row[0] for row in connection.execute('SELECT DISTINCT {0} FROM {1}'.format(
+                _sql_name(level), _sql_name(name))))
+
+    def fingerprint(self, source):
+        gpkg_path, name = self._source(source)
+        digest = hashlib.blake2b(digest_size=16)
+        row_count = 0
+        with contextlib.closing(sqlite3.connect(gpkg_path)) as connection:
+            cursor = connection.execute('SELECT * FROM {0} ORDER BY rowid'.format(_sql_name(name)))
+            digest.update(repr([column[0] for column in cursor.description]).encode())
+            for row in cursor:
+                row_count += 1
+                digest.update(repr(row).encode())
+            last_edited = connection.execute('SELECT last_change FROM gpkg_contents WHERE table_name = ?',
+                                             (name,)).fetchone()
+
+        return SourceFingerprint(row_count, last_edited[0] if last_edited is not None else None, digest.hexdigest())
+
+
+class ParquetStorage(Storage):
+    """Storage backend over a folder of Parquet files, one file per table, requires pyarrow or fastparquet.
+    Sources are table names in the workspace folder or paths to Parquet files. Geometries are kept as the bytes
+    of the SHAPE column, i.e. WKB.
+
+    Keyword Args:
+        folder -- string: path to the output folder, created on the first write when missing
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    # Parquet file of a source
+    def _source(self, source):
+        return source if source.lower().endswith('.parquet') else self.table_path(source)
+
+    def read_plots(self, source, partition=None):
+        if partition is None:
+            return pd.read_parquet(self._source(source))
+
+        level, value = partition
+        if value is not None:
+            return pd.read_parquet(self._source(source), filters=[(level, '==', value)])
+        df = pd.read_parquet(self._source(source))
+        return df[df[level].isna()].reset_index(drop=True)
+
+    def write_table(self, df, name):
+        # Write to a temporary file first, so an interrupted write never leaves a partial table
+        table_path = self.table_path(name)
+        os.makedirs(self.folder, exist_ok=True)
+        df.to_parquet(table_path + '.tmp', index=False)
+        os.replace(table_path + '.tmp', table_path)
+        return table_path
+
+    def write_features(self, df, name):
+        assert 'SHAPE' in df.columns, "features require a SHAPE column"
+        return self.write_table(df, name)
+
+    def table_path(self, name):
+        return os.path.join(self.folder, name + '.parquet')
+
+    def exists(self, name):
+        return os.path.exists(self.table_path(name))
+
+    def patch_table(self, df, name, level, patch_values):
+        if not self.exists(name):
+            self.write_table(df, name)
+            return
+
+        table = pd.read_parquet(self.table_path(name))
+        patched = table[level].isin([value for value in patch_values if value is not None])
+        if None in set(patch_values):
+            patched = patched | table[level].isna()
+        self.write_table(pd.concat([table[~patched], df], ignore_index=True), name)
+
+    def field_names(self, source):
+        return list(pd.read_parquet(self._source(source)).columns)
+
+    def level_values(self, source, level):
+        values = pd.read_parquet(self._source(source), columns=[level])[level]
+        return set(values.dropna()) | ({None} if values.isna().any() else set())
+
+    def fingerprint(self, source):
+        path = self._source(source)
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as parquet_file:
+            digest.update(parquet_file.read())
+
+        return SourceFingerprint(len(pd.read_parquet(path, columns=[]).index), os.path.getmtime(path),
+                                 digest.hexdigest())
+
+
+# Storage backend for an output location
+def open_storage(location):
+    """Returns the storage backend for an output location: ArcpyStorage for a file or enterprise geodatabase,
+    GeoPackageStorage for a GeoPackage and ParquetStorage for any other folder.
+
+    Keyword Args:
+        location -- string: path to the output geodatabase, GeoPackage or folder
+    """
+    extension = os.path.splitext(location.rstrip('\\/'))[1].lower()
+    if extension in ('.gdb', '.sde'):
+        return ArcpyStorage(location)
+    if extension == '.gpkg':
+        return GeoPackageStorage(location)
+
+    return ParquetStorage(location)
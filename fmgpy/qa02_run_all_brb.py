@@ -7,112 +7,155 @@ import importlib
 
 importlib.reload(clean_inputs)
 
-# get parameter arguments for script tool
-
-# fc center
-fc_center = arcpy.GetParameterAsText(0)
-center_plot_name = arcpy.GetParameterAsText(1)
-center_flag_name = arcpy.GetParameterAsText(2)
-in_gdb = arcpy.Describe(fc_center).path
-
-# fc prism
-fc_prism = arcpy.GetParameterAsText(3)
-prism_plot_name = arcpy.GetParameterAsText(4)
-prism_species_name = arcpy.GetParameterAsText(5)
-prism_dia_name = arcpy.GetParameterAsText(6)
-prism_class_name = arcpy.GetParameterAsText(7)
-prism_health_name = arcpy.GetParameterAsText(8)
-prism_misc_name = arcpy.GetParameterAsText(9)
-prism_crew_name = arcpy.GetParameterAsText(10)
-prism_date_name = arcpy.GetParameterAsText(11)
-
-# fc fixed
-fc_fixed = arcpy.GetParameterAsText(12)
-fixed_plot_name = arcpy.GetParameterAsText(13)
-fixed_closure_name = arcpy.GetParameterAsText(14)
-fixed_height_name = arcpy.GetParameterAsText(15)
-fixed_un_ht_name = arcpy.GetParameterAsText(16)
-fixed_un_cover_name = arcpy.GetParameterAsText(17)
-fixed_un_sp_name = arcpy.GetParameterAsText(18)
-fixed_gr_sp_name = arcpy.GetParameterAsText(19)
-fixed_misc_name = arcpy.GetParameterAsText(20)
-fixed_crew_name = arcpy.GetParameterAsText(21)
-fixed_date_name = arcpy.GetParameterAsText(22)
-
-# fc age
-fc_age = arcpy.GetParameterAsText(23)
-age_plot_name = arcpy.GetParameterAsText(24)
-age_species_name = arcpy.GetParameterAsText(25)
-age_dia_name = arcpy.GetParameterAsText(26)
-age_height_name = arcpy.GetParameterAsText(27)
-age_orig_name = arcpy.GetParameterAsText(28)
-age_grw_name = arcpy.GetParameterAsText(29)
-age_misc_name = arcpy.GetParameterAsText(30)
-age_crew_name = arcpy.GetParameterAsText(31)
-age_date_name = arcpy.GetParameterAsText(32)
-
-# fmg polygons
-fc_polygons = arcpy.GetParameterAsText(33)
-pool = arcpy.GetParameterAsText(34)
-comp = arcpy.GetParameterAsText(35)
-unit = arcpy.GetParameterAsText(36)
-site = arcpy.GetParameterAsText(37)
-stand = arcpy.GetParameterAsText(38)
-
-# numeric plot ID flag
-plot_id_string = arcpy.GetParameterAsText(43)
-
-# check if input is a file path or feature layer, if layer, get file path
-if not split(fc_center)[0]:
-    fc_center = join(arcpy.Describe(fc_center).path, arcpy.Describe(fc_center).name)
-
-if not split(fc_prism)[0]:
-    fc_prism = join(arcpy.Describe(fc_prism).path, arcpy.Describe(fc_prism).name)
-
-if not split(fc_fixed)[0]:
-    fc_fixed = join(arcpy.Describe(fc_fixed).path, arcpy.Describe(fc_fixed).name)
-
-if not split(fc_age)[0]:
-    fc_age = join(arcpy.Describe(fc_age).path, arcpy.Describe(fc_age).name)
-
-# check each field collected dataset for required fields
-clean_inputs.check_required_fields_center(fc_center, center_plot_name, center_flag_name)
-clean_inputs.check_required_fields_prism(fc_prism, prism_plot_name, prism_species_name, prism_dia_name,
-                                         prism_class_name, prism_health_name, prism_misc_name, prism_crew_name,
-                                         prism_date_name)
-clean_inputs.check_required_fields_fixed(fc_fixed, fixed_plot_name, fixed_closure_name, fixed_height_name,
-                                         fixed_un_ht_name, fixed_un_cover_name, fixed_un_sp_name,
-                                         fixed_gr_sp_name, fixed_misc_name, fixed_crew_name,
-                                         fixed_date_name)
-clean_inputs.check_required_fields_age(fc_age, age_plot_name, age_species_name, age_dia_name,
-                                       age_height_name, age_orig_name, age_grw_name, age_misc_name,
-                                       age_crew_name, age_date_name)
-
-# check plot IDs
-clean_inputs.check_plot_ids(fc_center, 'PLOT', fc_prism, 'PLOT', plot_id_string)
-clean_inputs.check_plot_ids(fc_center, 'PLOT', fc_fixed, 'PLOT', plot_id_string)
-clean_inputs.check_plot_ids(fc_center, 'PLOT', fc_age, 'PLOT', plot_id_string)
-
-# check fixed offsets
-clean_inputs.check_fixed_center(fc_center, 'PLOT', fc_fixed, 'PLOT', in_gdb)
-
-# verify age plots
-clean_inputs.check_contractor_age_plots(fc_center, 'PLOT', 'TYPE', fc_age, 'PLOT', plot_id_string)
-
-# check prism/fixed match
-clean_inputs.check_prism_fixed(fc_prism, 'PLOT', fc_fixed, 'PLOT', in_gdb, plot_id_string)
-
-# import hierarchies
-hierarchy_result = clean_inputs.import_hierarchy(fc_polygons, fc_center, fc_prism, fc_fixed,
-                                                 fc_age, pool, comp, unit, site, stand)
-
-# remove duplicates
-deduplication_result = clean_inputs.remove_duplicates(fc_prism, fc_fixed, fc_age, fc_center)
-out_center = deduplication_result[3]
-arcpy.SetParameterAsText(39, out_center)
-out_prism = deduplication_result[0]
-arcpy.SetParameterAsText(40, out_prism)
-out_fixed = deduplication_result[1]
-arcpy.SetParameterAsText(41, out_fixed)
-out_age = deduplication_result[2]
-arcpy.SetParameterAsText(42, out_age)
\ No newline at end of file
+
+def run_qa(fc_center, fc_prism, fc_fixed, fc_age, fc_polygons,
+           center_plot_name='PLOT', center_flag_name='TYPE',
+           prism_plot_name='PLOT', prism_species_name='TR_SP', prism_dia_name='TR_DIA', prism_class_name='TR_CL',
+           prism_health_name='TR_HLTH', prism_misc_name='MISC', prism_crew_name='COL_CREW',
+           prism_date_name='COL_DATE',
+           fixed_plot_name='PLOT', fixed_closure_name='OV_CLSR', fixed_height_name='OV_HT', fixed_un_ht_name='UND_HT',
+           fixed_un_cover_name='UND_COV', fixed_un_sp_name='UND_SP1', fixed_gr_sp_name='GRD_SP1',
+           fixed_misc_name='MISC', fixed_crew_name='COL_CREW', fixed_date_name='COL_DATE',
+           age_plot_name='PLOT', age_species_name='AGE_SP', age_dia_name='AGE_DIA', age_height_name='AGE_HT',
+           age_orig_name='AGE_ORIG', age_grw_name='AGE_GRW', age_misc_name='MISC', age_crew_name='COL_CREW',
+           age_date_name='COL_DATE',
+           pool='POOL', comp='COMP', unit='UNIT', site='SITE', stand='SID', plot_id_string='false'):
+    """Runs every QA step on the field collected center, prism, fixed and age plots: required field checks, plot ID
+    checks, fixed offsets, age plot verification, prism/fixed match, hierarchy import and duplicate removal.
+
+    Keyword Args:
+        fc_center   -- string: path or layer of the plot center feature class
+        fc_prism    -- string: path or layer of the prism plot feature class
+        fc_fixed    -- string: path or layer of the fixed plot feature class
+        fc_age      -- string: path or layer of the age plot feature class
+        fc_polygons -- string: path to the FMG hierarchy polygon feature class
+        *_name      -- string: user field names of the plot datasets, defaults are the FMG field names
+        pool, comp, unit, site, stand -- string: hierarchy field names of the polygon feature class
+        plot_id_string -- string: 'true' if plot IDs are not numeric
+
+    Details: returns a dictionary of the deduplicated center, prism, fixed and age feature class paths
+    """
+    in_gdb = arcpy.Describe(fc_center).path
+
+    # check if input is a file path or feature layer, if layer, get file path
+    if not split(fc_center)[0]:
+        fc_center = join(arcpy.Describe(fc_center).path, arcpy.Describe(fc_center).name)
+
+    if not split(fc_prism)[0]:
+        fc_prism = join(arcpy.Describe(fc_prism).path, arcpy.Describe(fc_prism).name)
+
+    if not split(fc_fixed)[0]:
+        fc_fixed = join(arcpy.Describe(fc_fixed).path, arcpy.Describe(fc_fixed).name)
+
+    if not split(fc_age)[0]:
+        fc_age = join(arcpy.Describe(fc_age).path, arcpy.Describe(fc_age).name)
+
+    # check each field collected dataset for required fields
+    clean_inputs.check_required_fields_center(fc_center, center_plot_name, center_flag_name)
+    clean_inputs.check_required_fields_prism(fc_prism, prism_plot_name, prism_species_name, prism_dia_name,
+                                             prism_class_name, prism_health_name, prism_misc_name, prism_crew_name,
+                                             prism_date_name)
+    clean_inputs.check_required_fields_fixed(fc_fixed, fixed_plot_name, fixed_closure_name, fixed_height_name,
+                                             fixed_un_ht_name, fixed_un_cover_name, fixed_un_sp_name,
+                                             fixed_gr_sp_name, fixed_misc_name, fixed_crew_name,
+                                             fixed_date_name)
+    clean_inputs.check_required_fields_age(fc_age, age_plot_name, age_species_name, age_dia_name,
+                                           age_height_name, age_orig_name, age_grw_name, age_misc_name,
+                                           age_crew_name, age_date_name)
+
+    # check plot IDs
+    clean_inputs.check_plot_ids(fc_center, 'PLOT', fc_prism, 'PLOT', plot_id_string)
+    clean_inputs.check_plot_ids(fc_center, 'PLOT', fc_fixed, 'PLOT', plot_id_string)
+    clean_inputs.check_plot_ids(fc_center, 'PLOT', fc_age, 'PLOT', plot_id_string)
+
+    # check fixed offsets
+    clean_inputs.check_fixed_center(fc_center, 'PLOT', fc_fixed, 'PLOT', in_gdb)
+
+    # verify age plots
+    clean_inputs.check_contractor_age_plots(fc_center, 'PLOT', 'TYPE', fc_age, 'PLOT', plot_id_string)
+
+    # check prism/fixed match
+    clean_inputs.check_prism_fixed(fc_prism, 'PLOT', fc_fixed, 'PLOT', in_gdb, plot_id_string)
+
+    # import hierarchies
+    hierarchy_result = clean_inputs.import_hierarchy(fc_polygons, fc_center, fc_prism, fc_fixed,
+                                                     fc_age, pool, comp, unit, site, stand)
+
+    # remove duplicates
+    deduplication_result = clean_inputs.remove_duplicates(fc_prism, fc_fixed, fc_age, fc_center)
+    return {'center': deduplication_result[3],
+            'prism': deduplication_result[0],
+            'fixed': deduplication_result[1],
+            'age': deduplication_result[2]}
+
+
+if __name__ == '__main__':
+    # get parameter arguments for script tool
+
+    # fc center
+    fc_center = arcpy.GetParameterAsText(0)
+    center_plot_name = arcpy.GetParameterAsText(1)
+    center_flag_name = arcpy.GetParameterAsText(2)
+
+    # fc prism
+    fc_prism = arcpy.GetParameterAsText(3)
+    prism_plot_name = arcpy.GetParameterAsText(4)
+    prism_species_name = arcpy.GetParameterAsText(5)
+    prism_dia_name = arcpy.GetParameterAsText(6)
+    prism_class_name = arcpy.GetParameterAsText(7)
+    prism_health_name = arcpy.GetParameterAsText(8)
+    prism_misc_name = arcpy.GetParameterAsText(9)
+    prism_crew_name = arcpy.GetParameterAsText(10)
+    prism_date_name = arcpy.GetParameterAsText(11)
+
+    # fc fixed
+    fc_fixed = arcpy.GetParameterAsText(12)
+    fixed_plot_name = arcpy.GetParameterAsText(13)
+    fixed_closure_name = arcpy.GetParameterAsText(14)
+    fixed_height_name = arcpy.GetParameterAsText(15)
+    fixed_un_ht_name = arcpy.GetParameterAsText(16)
+    fixed_un_cover_name = arcpy.GetParameterAsText(17)
+    fixed_un_sp_name = arcpy.GetParameterAsText(18)
+    fixed_gr_sp_name = arcpy.GetParameterAsText(19)
+    fixed_misc_name = arcpy.GetParameterAsText(20)
+    fixed_crew_name = arcpy.GetParameterAsText(21)
+    fixed_date_name = arcpy.GetParameterAsText(22)
+
+    # fc age
+    fc_age = arcpy.GetParameterAsText(23)
+    age_plot_name = arcpy.GetParameterAsText(24)
+    age_species_name = arcpy.GetParameterAsText(25)
+    age_dia_name = arcpy.GetParameterAsText(26)
+    age_height_name = arcpy.GetParameterAsText(27)
+    age_orig_name = arcpy.GetParameterAsText(28)
+    age_grw_name = arcpy.GetParameterAsText(29)
+    age_misc_name = arcpy.GetParameterAsText(30)
+    age_crew_name = arcpy.GetParameterAsText(31)
+    age_date_name = arcpy.GetParameterAsText(32)
+
+    # fmg polygons
+    fc_polygons = arcpy.GetParameterAsText(33)
+    pool = arcpy.GetParameterAsText(34)
+    comp = arcpy.GetParameterAsText(35)
+    unit = arcpy.GetParameterAsText(36)
+    site = arcpy.GetParameterAsText(37)
+    stand = arcpy.GetParameterAsText(38)
+
+    # numeric plot ID flag
+    plot_id_string = arcpy.GetParameterAsText(43)
+
+    qa_result = run_qa(fc_center, fc_prism, fc_fixed, fc_age, fc_polygons,
+                       center_plot_name, center_flag_name,
+                       prism_plot_name, prism_species_name, prism_dia_name, prism_class_name, prism_health_name,
+                       prism_misc_name, prism_crew_name, prism_date_name,
+                       fixed_plot_name, fixed_closure_name, fixed_height_name, fixed_un_ht_name, fixed_un_cover_name,
+                       fixed_un_sp_name, fixed_gr_sp_name, fixed_misc_name, fixed_crew_name, fixed_date_name,
+                       age_plot_name, age_species_name, age_dia_name, age_height_name, age_orig_name, age_grw_name,
+                       age_misc_name, age_crew_name, age_date_name,
+                       pool, comp, unit, site, stand, plot_id_string)
+
+    # set derived outputs of the deduplicated datasets
+    arcpy.SetParameterAsText(39, qa_result['center'])
+    arcpy.SetParameterAsText(40, qa_result['prism'])
+    arcpy.SetParameterAsText(41, qa_result['fixed'])
+    arcpy.SetParameterAsText(42, qa_result['age'])
@@ -1,102 +1,131 @@
 ﻿# Do some imports
-import arcpy
-import pandas as pd
-from fmglib import forest_calcs as fcalc, forest_summaries as fsum
-
-# Define Required Input Parameters
-prism_fc = arcpy.GetParameterAsText(0)
-fixed_fc = arcpy.GetParameterAsText(1)
-age_fc = arcpy.GetParameterAsText(2)
-out_gdb = arcpy.GetParameterAsText(3)
-
-# Define Optional Inupt Parameters
-pid_sum = arcpy.GetParameterAsText(4)
-sid_sum = arcpy.GetParameterAsText(5)
-site_sum = arcpy.GetParameterAsText(6)
-unit_sum = arcpy.GetParameterAsText(7)
-comp_sum = arcpy.GetParameterAsText(8)
-pool_sum = arcpy.GetParameterAsText(9)
-
-# Evaluate Optional Input Parameters to build level list
-levels = []
-if pid_sum.lower() == 'true':
-    levels.append('PID')
-if sid_sum.lower() == 'true':
-    levels.append('SID')
-if site_sum.lower() == 'true':
-    levels.append('SITE')
-if unit_sum.lower() == 'true':
-    levels.append('UNIT')
-if comp_sum.lower() == 'true':
-    levels.append('COMP')
-if pool_sum.lower() == 'true':
-    levels.append('POOL')
-arcpy.AddMessage('Begin FMG Summaries on ' + str(levels))
-
-# Import ESRI feature classes as pandas dataframes
-fixed_df = pd.DataFrame.spatial.from_featureclass(fixed_fc)
-age_df = pd.DataFrame.spatial.from_featureclass(age_fc)
-prism_df = pd.DataFrame.spatial.from_featureclass(prism_fc)
-
-# Check dfs for FMG level fields
-arcpy.AddMessage('Running checks on input data')
-for required_level in levels:
-    if required_level not in fixed_df.columns:
-        raise Exception('{0} column not present in fixed plots, correct to run FMG Summaries'.format(required_level))
-    if required_level not in age_df.columns:
-        raise Exception('{0} column not present in age plots, correct to run FMG Summaries'.format(required_level))
-    if required_level not in prism_df.columns:
-        raise Exception('{0} column not present in prism plots, correct to run FMG Summaries'.format(required_level))
-arcpy.AddMessage('Checks passed, continuing with summaries')
-
-# Create base datasets
-plot_table = fcalc.create_plot_table(fixed_df=fixed_df, age_df=age_df)
-tree_table = fcalc.create_tree_table(prism_df=prism_df)
-
-# Define output lists
-gen_sum = []
-age_sum = []
-health_sum = []
-mast_sum = []
-size_sum = []
-species_sum = []
-vert_sum = []
-manage_sum = []
-
-# Execute FMG Summaries
-for level in levels:
-    out_gen_sum = fsum.general_summary(plot_table, tree_table, out_gdb, level)
-    gen_sum.append(out_gen_sum)
-
-    out_age_sum = fsum.age_summary(plot_table, out_gdb, level)
-    age_sum.append(out_age_sum)
-
-    out_health_sum = fsum.health_summary(plot_table, tree_table, out_gdb, level)
-    health_sum.append(out_health_sum)
-
-    out_mast_sum = fsum.mast_summary(plot_table, tree_table, out_gdb, level)
-    mast_sum.append(out_mast_sum)
-
-    out_size_sum = fsum.size_summary(plot_table, tree_table, out_gdb, level)
-    size_sum.append(out_size_sum)
-
-    out_species_sum = fsum.species_summary(plot_table, tree_table, fixed_df, out_gdb, level)
-    species_sum.append(out_species_sum)
-
-    out_vert_sum = fsum.vert_comp_summary(plot_table, tree_table, out_gdb, level)
-    vert_sum.append(out_vert_sum)
-
-    out_manage_sum = fsum.management_summary(plot_table, tree_table, out_gdb, level)
-    manage_sum.append(out_manage_sum)
-
-# Set ouput parameters for ESRI-land
-arcpy.SetParameter(10, gen_sum)
-arcpy.SetParameter(11, age_sum)
-arcpy.SetParameter(12, health_sum)
-arcpy.SetParameter(13, mast_sum)
-arcpy.SetParameter(14, size_sum)
-arcpy.SetParameter(15, species_sum)
-arcpy.SetParameter(16, vert_sum)
-arcpy.SetParameter(17, manage_sum)
-
-arcpy.AddMessage('FMG Summaries Complete - check output GDB for results')
+import os
+import sys
+import multiprocessing
+from fmglib import forest_calcs as fcalc, forest_summaries as fsum, storage as fstore
+
+# Summary names, in the order of the tool output parameters
+SUMMARY_NAMES = ['general', 'age', 'health', 'mast', 'size', 'species', 'vert_comp', 'management']
+
+
+def run_standard_summaries(prism_fc, fixed_fc, age_fc, out_gdb, levels, workers=1, incremental=False,
+                           partition_level='', cache_dir=None):
+    """Runs the FMG standard summaries, exporting each summary at each level to a table in the output geodatabase.
+
+    Keyword Args:
+        prism_fc        -- string: path to the prism plot feature class
+        fixed_fc        -- string: path to the fixed plot feature class
+        age_fc          -- string: path to the age plot feature class
+        out_gdb         -- string: path to the output geodatabase, GeoPackage or Parquet folder, see fstore.open_storage
+        levels          -- list: field names for desired FMG levels, i.e. PID, SID, SITE, UNIT
+        workers         -- integer: number of worker processes running the summary computations
+        incremental     -- boolean: if True, only stands changed since the previous run into the output geodatabase
+                           are recomputed
+        partition_level -- string: POOL or COMP to read the input feature classes one polygon at a time, or blank
+        cache_dir       -- string: trusted folder caching the tables built from the inputs between runs, see
+                           fcalc.load_tables. If None, or with a partition level, the tables are always built.
+
+    Details: returns a dictionary of summary name to the list of output table paths, in the order of levels.
+    The inputs are read with the storage backend of the output, i.e. layers of a GeoPackage when writing to a
+    GeoPackage. Incremental runs keep the state of the previous run in the fmg_cache folder next to the output.
+    """
+    if partition_level and incremental:
+        raise Exception('Partitioned and incremental summaries cannot be combined, choose one to run FMG Summaries')
+    fcalc.add_message('Begin FMG Summaries on ' + str(levels))
+    storage = fstore.open_storage(out_gdb)
+
+    # Check feature classes for FMG level fields
+    fcalc.add_message('Running checks on input data')
+    fsum.check_level_fields(levels, prism_fc, fixed_fc, age_fc, storage)
+    fcalc.add_message('Checks passed, continuing with summaries')
+
+    # Reuse results of calculations repeated across summaries
+    fcalc.set_memo(enabled=True)
+
+    # Execute FMG Summaries, summaries at every level share one plan so common computations run once
+    if partition_level:
+        # Build tables and summarize one partition at a time, appending to the output tables
+        table_paths = fsum.run_summaries_partitioned(SUMMARY_NAMES, prism_fc, fixed_fc, age_fc, storage, levels,
+                                                     partition_level=partition_level, workers=workers)
+    else:
+        # Create base datasets, reused from the cache folder while the inputs are unchanged
+        plot_table, tree_table, fixed_df = fcalc.load_tables(prism_fc, fixed_fc, age_fc, cache_dir=cache_dir,
+                                                             storage=storage)
+
+        # Validate the plot hierarchy and build the hierarchy dimension shared by the summaries
+        fcalc.create_hierarchy(plot_table=plot_table)
+
+        if incremental:
+            state_path = os.path.join(os.path.dirname(out_gdb), 'fmg_cache',
+                                      'summary_state_{0}.json'.format(os.path.basename(out_gdb)))
+            table_paths = fsum.run_summaries_incremental(SUMMARY_NAMES, plot_table, tree_table, storage, levels,
+                                                         state_path, fixed_df=fixed_df, workers=workers)
+        else:
+            # Roll up tree table to plot level once, coarser levels are summed from the cube
+            tree_cube = fcalc.create_tree_cube(tree_table=tree_table)
+            table_paths = fsum.run_summaries(SUMMARY_NAMES, plot_table, tree_table, storage, levels,
+                                             tree_cube=tree_cube, fixed_df=fixed_df, workers=workers)
+
+    # Report reused calculations and release cached results
+    memo_stats = fcalc.memo_stats()
+    fcalc.add_message('Reused {0} of {1} repeated calculations'.format(memo_stats['hits'],
+                                                                        memo_stats['hits'] + memo_stats['misses']))
+    fcalc.set_memo(enabled=False)
+
+    fcalc.add_message('FMG Summaries Complete - check output GDB for results')
+    return table_paths
+
+
+# Worker processes import this script, only the tool run executes the summaries
+if __name__ == '__main__':
+    # ArcGIS is only required by the tool, run_standard_summaries also runs on GeoPackage or Parquet storage
+    import arcpy
+
+    # Define Required Input Parameters
+    prism_fc = arcpy.GetParameterAsText(0)
+    fixed_fc = arcpy.GetParameterAsText(1)
+    age_fc = arcpy.GetParameterAsText(2)
+    out_gdb = arcpy.GetParameterAsText(3)
+
+    # Define Optional Inupt Parameters
+    pid_sum = arcpy.GetParameterAsText(4)
+    sid_sum = arcpy.GetParameterAsText(5)
+    site_sum = arcpy.GetParameterAsText(6)
+    unit_sum = arcpy.GetParameterAsText(7)
+    comp_sum = arcpy.GetParameterAsText(8)
+    pool_sum = arcpy.GetParameterAsText(9)
+
+    # Define Optional Worker Count, summaries run in this process unless more than one worker is given
+    workers = int(arcpy.GetParameterAsText(18) or 1)
+
+    # Define Optional Incremental Mode, recomputing only stands changed since the previous run into the output GDB
+    incremental = arcpy.GetParameterAsText(19).lower() == 'true'
+
+    # Define Optional Partition Level, POOL or COMP, reading the input feature classes one polygon at a time
+    partition_level = arcpy.GetParameterAsText(20).upper()
+
+    # Evaluate Optional Input Parameters to build level list
+    levels = []
+    if pid_sum.lower() == 'true':
+        levels.append('PID')
+    if sid_sum.lower() == 'true':
+        levels.append('SID')
+    if site_sum.lower() == 'true':
+        levels.append('SITE')
+    if unit_sum.lower() == 'true':
+        levels.append('UNIT')
+    if comp_sum.lower() == 'true':
+        levels.append('COMP')
+    if pool_sum.lower() == 'true':
+        levels.append('POOL')
+
+    # Worker processes start python.exe, not the ArcGIS Pro executable running this script
+    if workers > 1:
+        multiprocessing.set_executable(os.path.join(sys.exec_prefix, 'python.exe'))
+
+    table_paths = run_standard_summaries(prism_fc, fixed_fc, age_fc, out_gdb, levels, workers=workers,
+                                         incremental=incremental, partition_level=partition_level)
+
+    # Set ouput parameters for ESRI-land, one list of tables per summary
+    for parameter_index, name in enumerate(SUMMARY_NAMES, start=10):
+        arcpy.SetParameter(parameter_index, table_paths[name])
@@ -0,0 +1,29 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+
+
+def test_itself():
+    old_plots = pd.DataFrame({'POOL': ['P1', 'P1', 'P1', 'P2'],
+                              'COMP': ['C1', 'C1', 'C2', 'C3'],
+                              'UNIT': ['U1', 'U1', 'U2', 'U3'],
+                              'SITE': ['T1', 'T1', 'T2', 'T3'],
+                              'SID': ['S1', 'S1', 'S2', 'S3'],
+                              'PID': ['A', 'B', 'C', 'D']})
+
+    # Stand S2 moved to unit U1, both its old and new ancestors are affected
+    new_plots = old_plots.copy()
+    new_plots.loc[2, ['COMP', 'UNIT', 'SITE']] = ['C1', 'U1', 'T1']
+    affected = fcalc.affected_polygons([old_plots, new_plots], ['S2'], ['PID', 'SID', 'SITE', 'UNIT', 'POOL'])
+
+    assert affected == {'PID': ['C'], 'SID': ['S2'], 'SITE': ['T1', 'T2'], 'UNIT': ['U1', 'U2'], 'POOL': ['P1']}
+
+    # Plots without a SID are affected by the nan stand
+    new_plots.loc[3, 'SID'] = None
+    assert fcalc.affected_polygons([new_plots], [float('nan')], ['PID'])['PID'] == ['D']
+
+
+def test_column_existence():
+    plots = pd.DataFrame({'SID': ['S1'], 'PID': ['A']})
+
+    assert list(fcalc.affected_polygons([plots], ['S1'], ['PID', 'SID']).keys()) == ['PID', 'SID']
+    assert fcalc.affected_polygons([plots], [], ['PID']) == {'PID': []}
@@ -0,0 +1,44 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import fmgpy.fmglib.forest_summaries as fsum
+import pandas as pd
+import pytest
+
+
+def plot_table():
+    return pd.DataFrame({'POOL': ['P1', 'P1', 'P1', 'P2'],
+                         'COMP': ['C1', 'C1', 'C2', 'C3'],
+                         'UNIT': ['U1', 'U1', 'U2', 'U3'],
+                         'SITE': ['T1', 'T1', 'T2', 'T3'],
+                         'SID': ['S1', 'S1', 'S2', 'S3'],
+                         'PID': ['A', 'B', 'C', 'D']})
+
+
+def test_itself():
+    hierarchy = fcalc.create_hierarchy(plot_table())
+
+    assert list(hierarchy.plots.index) == ['A', 'B', 'C', 'D']
+    assert list(hierarchy.plots['SID_KEY']) == [0, 0, 1, 2]
+    assert hierarchy.parents['SID'].loc['S2', 'COMP'] == 'C2'
+    assert hierarchy.parents['POOL'].loc['P1', 'PLT_CT'] == 3
+    assert hierarchy.plot_counts['SID'].loc['S1'] == 2
+
+    # Children with more than one parent fail rather than taking the first parent
+    bad_table = plot_table()
+    bad_table.loc[1, 'UNIT'] = 'U2'
+    with pytest.raises(ValueError):
+        fcalc.create_hierarchy(bad_table)
+
+    # Summaries read the hierarchy validated by the tool rather than rebuilding it
+    table = plot_table()
+    assert fsum.fcalc.create_hierarchy(table) is fcalc.create_hierarchy(table)
+
+
+def test_column_existence():
+    table = plot_table()
+    level_df = fcalc.create_level_df('SID', table)
+
+    asserted_columns = ['POOL', 'COMP', 'UNIT', 'SITE']
+
+    assert level_df.index.name == 'SID'
+    assert list(level_df.columns) == asserted_columns
+    assert fcalc.create_hierarchy(table) is fcalc.create_hierarchy(table)
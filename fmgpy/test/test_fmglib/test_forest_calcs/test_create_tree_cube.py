@@ -0,0 +1,37 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+
+
+def test_itself():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+    tree_cube = fcalc.create_tree_cube(tree_table)
+
+    # Compare level results summed from the cube to results from the tree table
+    for level in ['PID', 'SID', 'SITE', 'UNIT', 'COMP', 'POOL']:
+        pdt.assert_series_equal(fcalc.level_plot_count(tree_table, level),
+                                fcalc.level_plot_count(tree_cube, level))
+
+        filter_statement = ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+        cube_filter_statement = ~tree_cube.TR_HLTH.isin(["D", "DEAD"])
+        pdt.assert_frame_equal(fcalc.tpa_ba_qmdbh(tree_table, filter_statement, level, ['TR_SIZE']),
+                               fcalc.tpa_ba_qmdbh(tree_cube, cube_filter_statement, level, ['TR_SIZE']))
+
+        pdt.assert_frame_equal(fcalc.dominance_many(tree_table, level, 'TR_SP', {'DOM_SP': None}),
+                               fcalc.dominance_many(tree_cube, level, 'TR_SP', {'DOM_SP': None}))
+
+
+def test_column_existence():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+    tree_cube = fcalc.create_tree_cube(tree_table, dims=['TR_SP', 'TR_HLTH'])
+
+    asserted_columns = ['POOL', 'COMP', 'UNIT', 'SITE', 'SID', 'PID', 'TR_SP', 'TR_HLTH',
+                        'IS_TREE', 'TR_DENS', 'TR_BA', 'PLOT_COUNT']
+
+    assert list(tree_cube.columns) == asserted_columns
+    assert tree_cube.PLOT_COUNT.sum() == tree_table.PID.nunique()
@@ -35,7 +35,7 @@ def test_itself():
         'POOL': 'string[python]', 'COMP': 'string[python]', 'UNIT': 'string[python]', 'SITE': 'string[python]',
         'SID': 'string[python]', 'PID': 'string[python]', 'VALID_SID': 'string[python]',
         'TR_SIZE': 'object', 'VERT_COMP': 'object', 'TR_TYPE': 'object', 'TR_BA': 'float64', 'TR_DENS': 'float64',
-        'SP_TYPE': 'object', 'SP_RICH_TYPE': 'object'
+        'IS_TREE': 'bool', 'SP_TYPE': 'object', 'SP_RICH_TYPE': 'object'
     })
 
     pdt.assert_frame_equal(tree_table, asserted_dataframe)
@@ -50,7 +50,7 @@ def test_column_existence():
                         'COL_CREW', 'COL_DATE', 'TR_TIME', 'MIS_FIELDS', 'HAS_MIS_FIELD', 'CANOPY_DBH_FLAG',
                         'VALID_PLOT_ID', 'HAS_FIXED', 'METERS_FROM_FIXED_PLOT', 'CORRECT_PLOT_ID', 'DUPLICATE',
                         'MAST_TYPE', 'POOL', 'COMP', 'UNIT', 'SITE', 'SID', 'PID', 'VALID_SID', 'SHAPE', 'TR_SIZE',
-                        'VERT_COMP', 'TR_TYPE', 'TR_BA', 'TR_DENS', 'SP_TYPE', 'SP_RICH_TYPE']
+                        'VERT_COMP', 'TR_TYPE', 'TR_BA', 'TR_DENS', 'IS_TREE', 'SP_TYPE', 'SP_RICH_TYPE']
 
     assert set(asserted_columns).issubset(tree_table.columns)
     assert len(asserted_columns) == len(tree_table.columns)
@@ -71,7 +71,7 @@ def test_data_types():
         'POOL': 'string[python]', 'COMP': 'string[python]', 'UNIT': 'string[python]', 'SITE': 'string[python]',
         'SID': 'string[python]', 'PID': 'string[python]', 'VALID_SID': 'string[python]', 'SHAPE': 'geometry',
         'TR_SIZE': 'object', 'VERT_COMP': 'object', 'TR_TYPE': 'object', 'TR_BA': 'float64', 'TR_DENS': 'float64',
-        'SP_TYPE': 'object', 'SP_RICH_TYPE': 'object'
+        'IS_TREE': 'bool', 'SP_TYPE': 'object', 'SP_RICH_TYPE': 'object'
     })
 
     tree_table_dtypes = tree_table.dtypes
@@ -0,0 +1,28 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+
+
+def test_itself():
+    species = pd.Series(['ACSA2', 'QUAL', 'ZZZZ', None, 'ACSA2', 'NONE'], index=[10, 11, 12, 13, 14, 15])
+
+    # Lookup matches a left merge onto the crosswalk
+    merged_df = species \
+        .rename('TR_SP') \
+        .to_frame() \
+        .merge(right=fcalc.species_crosswalk().reset_index(), how='left', on='TR_SP') \
+        .drop(columns=['TR_SP']) \
+        .set_axis(species.index)
+
+    pdt.assert_frame_equal(merged_df, fcalc.crosswalk_lookup(species))
+    assert fcalc.unknown_species(species) == ['ZZZZ']
+
+
+def test_column_existence():
+    lookup_df = fcalc.crosswalk_lookup(pd.Series(['ACSA2']), columns=['MAST_TYPE', 'SP_RICH_TYPE'])
+
+    asserted_columns = ['MAST_TYPE', 'SP_RICH_TYPE']
+
+    assert list(lookup_df.columns) == asserted_columns
+    assert list(fcalc.species_crosswalk().columns) == ['MAST_TYPE', 'TYP_FOR_MVR', 'SP_RICH_TYPE']
+    assert fcalc.species_crosswalk() is fcalc.species_crosswalk()
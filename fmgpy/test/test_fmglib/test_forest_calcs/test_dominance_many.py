@@ -0,0 +1,56 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+
+
+def test_itself():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+
+    filters = {'NONE': None,
+               'MID': tree_table.VERT_COMP == 'Midstory',
+               'HARD': tree_table.MAST_TYPE == 'Hard'}
+
+    # Compare each filter in the batched output to the single filter dominance functions
+    for level in ['PID', 'POOL']:
+        sp_dom_df = fcalc.dominance_many(tree_table, level, 'TR_SP', filters)
+        hlth_dom_df = fcalc.dominance_many(tree_table, level, 'TR_HLTH', filters)
+
+        for name, filter_statement in filters.items():
+            if level == 'PID':
+                sp_df = fcalc.species_dom_plot(tree_table, filter_statement)
+                hlth_df = fcalc.health_dom_plot(tree_table, filter_statement)
+            else:
+                sp_df = fcalc.species_dom_level(tree_table, filter_statement, level)
+                hlth_df = fcalc.health_dom_level(tree_table, filter_statement, level)
+
+            sp_df = sp_df \
+                .rename(columns={'SP_DOM': name, 'SP_DOM_PCMP': name + '_PCMP'}) \
+                .set_index(level)
+            hlth_df = hlth_df \
+                .rename(columns={'HLTH_DOM': name, 'HLTH_DOM_PCMP': name + '_PCMP'}) \
+                .set_index(level)
+
+            pdt.assert_frame_equal(sp_df,
+                                   sp_dom_df.loc[sp_df.index, [name, name + '_PCMP']],
+                                   check_dtype=False)
+            pdt.assert_frame_equal(hlth_df,
+                                   hlth_dom_df.loc[hlth_df.index, [name, name + '_PCMP']],
+                                   check_dtype=False)
+
+
+def test_column_existence():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    level = 'SID'
+
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+    dom_table = fcalc.dominance_many(tree_table, level, 'TR_SP',
+                                     {'DEAD_DOM_SP': tree_table.TR_HLTH == 'D',
+                                      'DOM_SP': None})
+
+    asserted_columns = ['DEAD_DOM_SP', 'DEAD_DOM_SP_PCMP', 'DOM_SP', 'DOM_SP_PCMP']
+
+    assert dom_table.index.name == level
+    assert list(dom_table.columns) == asserted_columns
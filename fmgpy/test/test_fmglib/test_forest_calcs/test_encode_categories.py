@@ -0,0 +1,33 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+
+
+def test_itself():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+    cat_tree_table = fcalc.create_tree_table(prism_df, categorical=True)
+
+    # Decoded tables match the string tables
+    pdt.assert_frame_equal(tree_table, fcalc.decode_categories(cat_tree_table))
+
+    # Level results match once decoded
+    for level in ['PID', 'SID', 'POOL']:
+        dom_df = fcalc.dominance_many(tree_table, level, 'TR_SP', {'DOM_SP': None})
+        cat_dom_df = fcalc.dominance_many(cat_tree_table, level, 'TR_SP', {'DOM_SP': None})
+        cat_dom_df = fcalc.decode_categories(cat_dom_df.reset_index()).set_index(level)
+        pdt.assert_frame_equal(dom_df, cat_dom_df)
+
+
+def test_column_existence():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+    cat_tree_table = fcalc.encode_categories([tree_table], columns=['TR_SP', 'SID'])[0]
+
+    assert list(cat_tree_table.columns) == list(tree_table.columns)
+    assert isinstance(cat_tree_table.TR_SP.dtype, pd.CategoricalDtype)
+    assert isinstance(cat_tree_table.SID.dtype, pd.CategoricalDtype)
+    assert not isinstance(cat_tree_table.TR_HLTH.dtype, pd.CategoricalDtype)
@@ -0,0 +1,35 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+import numpy as np
+
+
+def test_itself():
+    col_csv = 'resources/management_summary_cols.csv'
+    df = pd.DataFrame({'index': [0, 1, 2],
+                       'POOL': ['P1', 'P1', 'P2'],
+                       'COMP': ['C1', 'C2', 'C3'],
+                       'SP_RICH': [3, np.nan, 1],
+                       'STOCK_PCT': [55.0, 10.5, np.nan],
+                       'COMP_SP_RICH': ['Hard: 2', None, 'Soft: 1']})
+
+    # Fused schema step matches the reindex, fillna, astype chain
+    chained_df = df \
+        .reindex(labels=fcalc.fmg_column_reindex_list('COMP', col_csv), axis='columns') \
+        .fillna(value=fcalc.fmg_nan_fill(col_csv)) \
+        .astype(dtype=fcalc.fmg_dtype_enforce(col_csv))
+
+    pdt.assert_frame_equal(chained_df, fcalc.fmg_enforce_schema(df, 'COMP', col_csv))
+
+
+def test_column_existence():
+    schema = fcalc.table_schema('resources/age_summary_cols.csv')
+
+    asserted_columns = ('AGE_ORIG', 'AGE_DBH', 'AGE_GRW', 'AGE_UND_COV', 'HM_ORIG', 'SM_ORIG', 'LM_ORIG')
+
+    assert schema.columns == asserted_columns
+    assert schema.dtypes['AGE_ORIG'] == 'int32'
+    assert schema.nan_fill['AGE_ORIG'] == 0
+
+    # Schemas are loaded once and resolved independent of the working directory
+    assert fcalc.table_schema('age_summary_cols.csv') is schema
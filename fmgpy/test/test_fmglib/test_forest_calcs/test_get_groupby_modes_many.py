@@ -0,0 +1,57 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+import numpy as np
+
+
+def fixed_df():
+    return pd.DataFrame({'SID': ['S1', 'S1', 'S1', 'S2', 'S2', 'S3', None],
+                         'UND_SP1': ['ACNE2', 'ACNE2', 'NONE', 'CEOC2', 'ULAM', 'NONE', 'ACNE2'],
+                         'GRD_SP1': ['carex', 'NONE', 'NONE', 'phar3', 'phar3', None, 'carex']})
+
+
+def test_itself():
+    df = fixed_df()
+    modes_df = fcalc.get_groupby_modes_many(source=df,
+                                            keys=['SID'],
+                                            values=['UND_SP1', 'GRD_SP1'],
+                                            exclude=['NONE'],
+                                            return_counts=True)
+
+    # Matches get_groupby_modes run column by column, ties go to the lowest value
+    asserted_dataframe = pd.DataFrame({'UND_SP1': ['ACNE2', 'CEOC2', np.nan],
+                                       'UND_SP1_count': [2, 1, np.nan],
+                                       'GRD_SP1': ['carex', 'phar3', np.nan],
+                                       'GRD_SP1_count': [1, 2, np.nan]},
+                                      index=pd.Index(['S1', 'S2', 'S3'], name='SID')) \
+        .dropna(how='all')
+
+    pdt.assert_frame_equal(modes_df, asserted_dataframe, check_dtype=False)
+
+    for column in ['UND_SP1', 'GRD_SP1']:
+        single_df = fcalc.get_groupby_modes(source=df[~df[column].isin(['NONE'])],
+                                            keys=['SID'],
+                                            values=[column],
+                                            return_counts=True) \
+            .set_index('SID') \
+            .sort_index()
+        assert list(single_df[column]) == list(modes_df[column].dropna())
+
+    # Top k modes are ranked by count then value
+    top_df = fcalc.get_groupby_modes_many(source=df, keys=['SID'], values=['UND_SP1'], top_k=2)
+    assert top_df.loc['S1', 'UND_SP1_1'] == 'ACNE2'
+    assert top_df.loc['S1', 'UND_SP1_2'] == 'NONE'
+    assert top_df.loc['S2', 'UND_SP1_2'] == 'ULAM'
+
+
+def test_column_existence():
+    sp_columns = ['UND_SP1', 'GRD_SP1']
+    modes_df = fcalc.get_groupby_modes_many(source=fixed_df(),
+                                            keys=['SID'],
+                                            values=sp_columns,
+                                            exclude={column: ['NONE'] for column in sp_columns})
+
+    asserted_columns = ['UND_SP1', 'GRD_SP1']
+
+    assert modes_df.index.name == 'SID'
+    assert list(modes_df.columns) == asserted_columns
@@ -0,0 +1,39 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+
+
+def test_itself():
+    plot_table = pd.DataFrame({'GRD_SP1': ['PHAU7', 'NONE', None, 'HUJA'],
+                               'GRD_SP2': ['HUJA', 'NONE', None, 'NONE'],
+                               'GRD_SP3': ['NONE', 'NONE', None, 'NONE'],
+                               'NOT_SP1': ['PHAU7', 'NONE', None, 'NONE'],
+                               'NOT_SP2': ['NONE', 'NONE', None, 'NONE'],
+                               'NOT_SP3': ['NONE', 'NONE', None, 'NONE'],
+                               'NOT_SP4': ['NONE', 'NONE', None, 'NONE'],
+                               'NOT_SP5': ['NONE', 'NONE', None, 'LOJA']},
+                              index=[5, 6, 7, 8])
+
+    # Species lists are sorted and de-duplicated, plots without invasives are blank
+    asserted_dataframe = pd.DataFrame({'INV_SP': ['HUJA, PHAU7', '', '', 'HUJA'],
+                                       'INV_PRESENT': ['Yes', 'No', 'No', 'Yes']},
+                                      index=[5, 6, 7, 8]) \
+        .astype('string')
+
+    pdt.assert_frame_equal(fcalc.inv_sp_detect(plot_table), asserted_dataframe)
+
+    # The invasive species list is configurable
+    asserted_dataframe = pd.DataFrame({'INV_SP': ['', '', '', 'LOJA'],
+                                       'INV_PRESENT': ['No', 'No', 'No', 'Yes']},
+                                      index=[5, 6, 7, 8]) \
+        .astype('string')
+
+    pdt.assert_frame_equal(fcalc.inv_sp_detect(plot_table, invasive_species=['LOJA']), asserted_dataframe)
+
+
+def test_column_existence():
+    plot_table = pd.DataFrame({column: ['NONE'] for column in fcalc.INVASIVE_SPECIES_COLUMNS})
+
+    asserted_columns = ['INV_SP', 'INV_PRESENT']
+
+    assert list(fcalc.inv_sp_detect(plot_table).columns) == asserted_columns
@@ -0,0 +1,41 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import fmgpy.fmglib.storage as fstore
+import pandas as pd
+import pandas.testing as pdt
+import os
+
+
+def test_itself(tmp_path):
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    fixed = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Fixed_QA_20250513'
+    age = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Age_QA_20250513'
+    cache_dir = str(tmp_path)
+
+    # First call builds and caches the tables, the second loads the cached copy
+    built = fcalc.load_tables(prism, fixed, age, cache_dir=cache_dir)
+    cache_files = os.listdir(cache_dir)
+    cached = fcalc.load_tables(prism, fixed, age, cache_dir=cache_dir)
+
+    assert len(cache_files) == 1
+    assert os.listdir(cache_dir) == cache_files
+    pdt.assert_frame_equal(built.tree_table, cached.tree_table)
+    pdt.assert_frame_equal(built.plot_table.drop(columns='SHAPE'), cached.plot_table.drop(columns='SHAPE'))
+
+    # Tables of other sources are cached alongside, without removing the cached tables above
+    fcalc.load_tables(prism, fixed, age, cache_dir=cache_dir, categorical=True)
+    assert len(os.listdir(cache_dir)) == 2
+    assert set(cache_files) < set(os.listdir(cache_dir))
+
+    # Cached tables match tables built without a cache
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    pdt.assert_frame_equal(fcalc.create_tree_table(prism_df), cached.tree_table)
+
+
+def test_column_existence():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+
+    fingerprint = fstore.ArcpyStorage().source_fingerprint(prism)
+
+    assert fingerprint._fields == ('row_count', 'last_edited', 'content_hash')
+    assert fingerprint.row_count == len(pd.DataFrame.spatial.from_featureclass(prism).index)
+    assert fstore.ArcpyStorage().source_fingerprint(prism) == fingerprint
@@ -0,0 +1,64 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+
+
+def test_itself():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+    uncached_df = fcalc.tpa_ba_qmdbh_level(tree_table, 'live', 'SID')
+
+    fcalc.set_memo(enabled=True)
+    try:
+        first_df = fcalc.tpa_ba_qmdbh_level(tree_table, 'live', 'SID')
+        hits = fcalc.memo_stats()['hits']
+
+        # Changing a returned result does not change the cached result
+        first_df['TPA'] = 0
+        second_df = fcalc.tpa_ba_qmdbh_level(tree_table, 'live', 'SID')
+        assert fcalc.memo_stats()['hits'] == hits + 1
+        pdt.assert_frame_equal(uncached_df, second_df)
+
+        # Equal filter statements and copies of the tree table share results
+        hits = fcalc.memo_stats()['hits']
+        third_df = fcalc.tpa_ba_qmdbh_level(tree_table.copy(), ~tree_table.TR_HLTH.isin(["D", "DEAD"]), 'SID')
+        assert fcalc.memo_stats()['hits'] > hits
+        pdt.assert_frame_equal(uncached_df, third_df)
+
+        # Replacing a column changes the table fingerprint, so results are recomputed
+        misses = fcalc.memo_stats()['misses']
+        tree_table['TR_DIA'] = tree_table['TR_DIA'] * 2
+        fcalc.tpa_ba_qmdbh_level(tree_table, 'live', 'SID')
+        assert fcalc.memo_stats()['misses'] > misses
+
+        # Values written in place are picked up once the cache is cleared
+        stale_df = fcalc.tpa_ba_qmdbh_level(tree_table, 'live', 'SID')
+        tree_table.loc[tree_table.index[fcalc.tree_filter(tree_table, 'live')][0], 'TR_DENS'] += 10
+        fcalc.clear_memo()
+        edited_df = fcalc.tpa_ba_qmdbh_level(tree_table, 'live', 'SID')
+        assert not edited_df.equals(stale_df)
+        pdt.assert_frame_equal(fcalc.tpa_ba_qmdbh_level(tree_table.copy(), 'live', 'SID'), edited_df)
+    finally:
+        fcalc.set_memo(enabled=False)
+
+    assert fcalc.memo_stats()['entries'] == 0
+
+
+def test_column_existence():
+    fcalc.set_memo(enabled=True, max_bytes=0)
+    try:
+        prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+
+        prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+        tree_table = fcalc.create_tree_table(prism_df)
+        fcalc.tpa_ba_qmdbh_level(tree_table, None, 'PID')
+        stats = fcalc.memo_stats()
+    finally:
+        fcalc.set_memo(enabled=False, max_bytes=256 * 1024 ** 2)
+
+    asserted_keys = ['enabled', 'hits', 'misses', 'entries', 'bytes', 'max_bytes']
+
+    assert list(stats.keys()) == asserted_keys
+    assert stats['entries'] == 0
+    assert stats['misses'] > 0
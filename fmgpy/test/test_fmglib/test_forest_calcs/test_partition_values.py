@@ -0,0 +1,30 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import fmgpy.fmglib.storage as fstore
+import pandas as pd
+
+
+def test_itself():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    fixed = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Fixed_QA_20250513'
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+
+    values = fcalc.partition_values([prism, fixed], 'POOL')
+
+    # Partitions cover every prism row exactly once
+    storage = fstore.ArcpyStorage()
+    partition_rows = [len(pd.DataFrame.spatial.from_featureclass(prism,
+                                                                  where_clause=storage.partition_where(prism, 'POOL',
+                                                                                                       value)).index)
+                      for value in values]
+    assert sum(partition_rows) == len(prism_df.index)
+    assert set(prism_df['POOL'].dropna()) <= set(values)
+
+
+def test_column_existence():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+
+    values = fcalc.partition_values([prism], 'COMP')
+
+    assert values == sorted(value for value in values if value is not None) + [None] * (None in values)
+    assert fstore.ArcpyStorage().partition_where(prism, 'COMP', None).endswith('IS NULL')
+    assert fstore.ArcpyStorage().partition_where(prism, 'COMP', "O'Neil").endswith("= 'O''Neil'")
@@ -0,0 +1,73 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+
+
+def specs():
+    health = fcalc.SummarySpec(
+        table_name='Health_Summary',
+        col_csv='resources/health_summary_cols.csv',
+        metrics=[fcalc.SummaryMetric('dominance', 'TR_SP', 'hlth:D', {'DOM': 'DEAD_DOM_SP'}),
+                 fcalc.SummaryMetric('dominance', 'TR_SP', None, {'DOM': 'DOM_SP'}),
+                 fcalc.SummaryMetric('tpa_ba_qmdbh', None, 'live', {'TPA': 'LIVE_TPA'})])
+    management = fcalc.SummarySpec(
+        table_name='Management_Summary',
+        col_csv='resources/management_summary_cols.csv',
+        metrics=[fcalc.SummaryMetric('dominance', 'TR_SP', None, {'DOM': 'DOM_SP'}),
+                 fcalc.SummaryMetric('stocking', None, 'live')])
+    general = fcalc.SummarySpec(
+        table_name='General_Summary',
+        col_csv='resources/general_summary_cols.csv',
+        tree='tree',
+        metrics=[fcalc.SummaryMetric('tpa_ba_qmdbh', None, 'live', {'TPA': 'LIVE_TPA'})])
+    return [health, management, general]
+
+
+def test_itself():
+    plan = fcalc.plan_summaries(specs(), 'SID')
+
+    # Filters are batched by grouping key, shared computations are planned once per tree source
+    assert plan[('dominance', 'cube', 'SID', 'TR_SP')] == ['hlth:D', None]
+    assert plan[('tpa', 'cube', 'SID', None)] == ['live']
+    assert plan[('tpa', 'tree', 'SID', None)] == ['live']
+    assert len(plan) == 3
+
+    # Requests of further levels are collected into the same plan
+    assert fcalc.plan_summaries(specs(), 'UNIT', plan) is plan
+    assert len(plan) == 6
+
+    # Planned computations are joined onto the level polygons
+    plot_table = pd.DataFrame({'POOL': ['P1', 'P1', 'P1'],
+                               'COMP': ['C1', 'C1', 'C1'],
+                               'UNIT': ['U1', 'U1', 'U1'],
+                               'SITE': ['T1', 'T1', 'T1'],
+                               'SID': ['S1', 'S1', 'S2'],
+                               'PID': ['A', 'B', 'C']})
+    tree_table = pd.DataFrame({'SID': ['S1', 'S1', 'S2'],
+                               'PID': ['A', 'B', 'C'],
+                               'TR_HLTH': ['H', 'D', 'H'],
+                               'IS_TREE': [True, True, False]})
+    spec = fcalc.SummarySpec(table_name='Tree_Counts',
+                             col_csv='resources/general_summary_cols.csv',
+                             tree='tree',
+                             metrics=[fcalc.SummaryMetric('tree_count'),
+                                      fcalc.SummaryMetric('tree_count', None, 'hlth:D', {'TR_CT': 'TR_D_CT'})])
+    tables = {'plot': plot_table, 'tree': tree_table}
+    plan = fcalc.plan_summaries([spec], 'SID')
+    results = fcalc.run_summary_plan(plan, tables)
+    summary_df = fcalc.assemble_summary(spec, 'SID', results, plot_table)
+
+    assert list(summary_df['TR_CT']) == [2, 0]
+    assert list(summary_df['TR_D_CT']) == [1, 0]
+
+    # Both tree counts are one pass over the stacked rows of each filter
+    plan_df = fcalc.describe_summary_plan(plan, tables)
+    assert list(plan_df['passes']) == [1]
+    assert list(plan_df['rows_scanned']) == [4]
+
+
+def test_column_existence():
+    metric = fcalc.SummaryMetric('tree_count')
+
+    assert metric._fields == ('metric', 'case_column', 'filter', 'rename')
+    assert fcalc.SummarySpec('Summary', 'resources/age_summary_cols.csv', [metric]).tree == 'cube'
+    assert set(name for name, _ in fcalc.SUMMARY_METRICS.values()) <= set(fcalc.SUMMARY_COMPUTATIONS)
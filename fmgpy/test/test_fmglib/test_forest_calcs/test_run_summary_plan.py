@@ -0,0 +1,50 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+
+
+def tables():
+    plot_table = pd.DataFrame({'POOL': ['P1', 'P1', 'P1'],
+                               'COMP': ['C1', 'C1', 'C1'],
+                               'UNIT': ['U1', 'U1', 'U2'],
+                               'SITE': ['T1', 'T1', 'T2'],
+                               'SID': ['S1', 'S1', 'S2'],
+                               'PID': ['A', 'B', 'C']})
+    tree_table = pd.DataFrame({'UNIT': ['U1', 'U1', 'U2', 'U2'],
+                               'SID': ['S1', 'S1', 'S2', 'S2'],
+                               'PID': ['A', 'B', 'C', 'C'],
+                               'TR_HLTH': ['H', 'D', 'H', 'D'],
+                               'IS_TREE': [True, True, False, True]})
+    return {'plot': plot_table, 'tree': tree_table}
+
+
+def spec():
+    return fcalc.SummarySpec(table_name='Tree_Counts',
+                             col_csv='resources/general_summary_cols.csv',
+                             tree='tree',
+                             metrics=[fcalc.SummaryMetric('tree_count'),
+                                      fcalc.SummaryMetric('tree_count', None, 'hlth:D', {'TR_CT': 'TR_D_CT'})])
+
+
+def test_itself():
+    plan = {}
+    for level in ['SID', 'UNIT']:
+        fcalc.plan_summaries([spec()], level, plan)
+
+    # Worker processes return the same results, in the same order, as a single process run
+    serial = fcalc.run_summary_plan(plan, tables())
+    parallel = fcalc.run_summary_plan(plan, tables(), workers=2)
+
+    assert list(serial.keys()) == list(parallel.keys())
+    for key in serial:
+        pdt.assert_frame_equal(serial[key], parallel[key])
+
+
+def test_column_existence():
+    plan = fcalc.plan_summaries([spec()], 'SID')
+    results = fcalc.run_summary_plan(plan, tables())
+
+    asserted_keys = [('tree_count', 'tree', 'SID', None, None), ('tree_count', 'tree', 'SID', None, 'hlth:D')]
+
+    assert list(results.keys()) == asserted_keys
+    assert [list(result_df.columns) for result_df in results.values()] == [['TR_CT'], ['TR_CT']]
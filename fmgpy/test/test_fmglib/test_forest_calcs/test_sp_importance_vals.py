@@ -0,0 +1,40 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+
+
+def test_itself():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+
+    # Relative values are shares of each level polygon
+    for level in ['PID', 'SID', 'POOL']:
+        iv_df = fcalc.sp_importance_vals(tree_table, level)
+        totals = iv_df[iv_df['Level_TPA'] > 0].groupby(level)[['Relative_FREQ', 'Relative_BA', 'Relative_TPA']].sum()
+        assert ((totals - 100).abs() < 1e-6).all().all()
+
+    # Plot and level functions are views of the same results
+    plot_df = fcalc.sp_importance_vals_plot(tree_table)
+    pid_df = fcalc.sp_importance_vals(tree_table, 'PID')
+    pdt.assert_series_equal(plot_df['Species_TPA'], pid_df['Species_TPA'])
+
+    # The tree cube gives the same results as the tree table
+    pdt.assert_frame_equal(fcalc.sp_importance_vals_level(tree_table, 'SID'),
+                           fcalc.sp_importance_vals_level(fcalc.create_tree_cube(tree_table), 'SID'))
+
+
+def test_column_existence():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+    iv_df = fcalc.sp_importance_vals(tree_table, 'PID')
+
+    asserted_columns = ['PID', 'TR_SP', 'Species_TPA', 'Species_BA', 'Species_PLT_CT', 'Level_PLT_CT',
+                        'Level_TPA', 'Level_BA', 'Species_FREQ', 'Level_FREQ', 'Relative_FREQ', 'Relative_BA',
+                        'Relative_TPA', 'SP_IMP_VAL']
+
+    assert list(iv_df.columns) == asserted_columns
+    assert list(fcalc.sp_importance_vals_plot(tree_table).columns) == \
+           ['PID', 'TR_SP', 'Species_TPA', 'Species_BA', 'Level_TPA', 'Level_BA',
+            'Relative_BA', 'Relative_TPA', 'PLOT_IMPVAL']
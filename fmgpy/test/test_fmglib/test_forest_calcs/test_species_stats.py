@@ -0,0 +1,46 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+
+
+def tree_table():
+    return pd.DataFrame({'SID': ['S1', 'S1', 'S1', 'S1', 'S2', 'S2'],
+                         'PID': ['A', 'A', 'B', 'B', 'C', 'C'],
+                         'TR_SP': ['QUAL', 'ACSA2', 'QUAL', 'NONE', 'ULAM', 'ZZZZ'],
+                         'TR_HLTH': ['H', 'D', 'S', None, 'D', 'H'],
+                         'SP_RICH_TYPE': ['Hard', 'Typical', 'Hard', None, 'Other', None],
+                         'TR_DENS': [10.0, 20.0, 5.0, 0.0, 8.0, 4.0],
+                         'TR_BA': [10.0, 10.0, 10.0, 0.0, 10.0, 10.0]})
+
+
+def plot_table():
+    return pd.DataFrame({'POOL': ['P1', 'P1', 'P1', 'P1'],
+                         'COMP': ['C1', 'C1', 'C1', 'C1'],
+                         'UNIT': ['U1', 'U1', 'U1', 'U1'],
+                         'SITE': ['T1', 'T1', 'T1', 'T2'],
+                         'SID': ['S1', 'S1', 'S2', 'S3'],
+                         'PID': ['A', 'B', 'C', 'D']})
+
+
+def test_itself():
+    stats_df = fcalc.species_stats(tree_table(), 'SID').set_index(['SID', 'TR_SP'])
+
+    assert stats_df.loc[('S1', 'QUAL'), 'stand_dens'] == 15.0
+    assert stats_df.loc[('S1', 'QUAL'), 'sp_plot_count'] == 2.0
+    assert stats_df.loc[('S1', 'NONE'), 'tree_count'] == 0.0
+    assert not stats_df.loc[('S1', 'ACSA2'), 'LIVE']
+
+    # Richness counts live species, polygons without trees are NONE
+    richness_df = fcalc.create_sp_richness(tree_table(), plot_table(), 'SID').set_index('SID')
+
+    assert list(richness_df['SP_RICH']) == [1, 1, 0]
+    assert list(richness_df['COMP_SP_RICH']) == ['100', 'NONE', 'NONE']
+
+
+def test_column_existence():
+    stats_df = fcalc.species_stats(tree_table(), 'PID')
+
+    asserted_columns = ['PID', 'TR_SP', 'SP_RICH_TYPE', 'tree_count', 'stand_dens', 'TR_BA', 'sp_plot_count', 'LIVE']
+
+    assert list(stats_df.columns) == asserted_columns
+    assert list(fcalc.create_sp_richness(tree_table(), plot_table(), 'PID').columns) == \
+           ['PID', 'SP_RICH', 'COMP_SP_RICH']
@@ -0,0 +1,41 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+
+
+def tables():
+    plot_table = pd.DataFrame({'SID': ['S1', 'S1', 'S2', None],
+                               'PID': ['A', 'B', 'C', 'D'],
+                               'OV_HT': [60, 70, 80, 90]})
+    tree_table = pd.DataFrame({'SID': ['S1', 'S3'],
+                               'PID': ['A', 'E'],
+                               'TR_DIA': [12, 14]})
+    return {'plot': plot_table, 'tree': tree_table}
+
+
+def test_itself():
+    fingerprints = fcalc.stand_fingerprints(tables())
+
+    # Row order does not change a stand, edits, added and removed stands do
+    reordered = {name: table.iloc[::-1] for name, table in tables().items()}
+    assert fcalc.changed_stands(fingerprints, fcalc.stand_fingerprints(reordered)) == []
+
+    edited = tables()
+    edited['tree'].loc[0, 'TR_DIA'] = 16
+    edited['plot'] = edited['plot'][edited['plot']['SID'] != 'S2']
+    assert fcalc.changed_stands(fingerprints, fcalc.stand_fingerprints(edited)) == ['S1', 'S2']
+
+    # Plots without a SID are fingerprinted together
+    edited = tables()
+    edited['plot'].loc[3, 'OV_HT'] = 95
+    changed = fcalc.changed_stands(fingerprints, fcalc.stand_fingerprints(edited))
+    assert len(changed) == 1 and pd.isna(changed[0])
+
+
+def test_column_existence():
+    fingerprints = fcalc.stand_fingerprints(tables())
+
+    asserted_columns = ['plot_rows', 'plot_hash', 'tree_rows', 'tree_hash']
+
+    assert list(fingerprints.columns) == asserted_columns
+    assert fingerprints.loc['S3', 'plot_rows'] == 0
+    assert fingerprints.loc['S1', 'plot_rows'] == 2
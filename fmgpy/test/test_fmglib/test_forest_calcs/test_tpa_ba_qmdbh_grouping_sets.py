@@ -0,0 +1,36 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+
+
+def test_itself():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+
+    grouping_sets = [['TR_SP'], ['TR_HLTH', 'TR_SP'], ['TR_SP', 'TR_SIZE']]
+    levels = ['PID', 'SID', 'POOL']
+    summary_dfs = fcalc.tpa_ba_qmdbh_grouping_sets(tree_table, grouping_sets, levels)
+
+    # Every set at every level matches the per table multi case summaries, up to summation order
+    for level in levels:
+        for case_columns in grouping_sets:
+            if level == 'PID':
+                asserted_dataframe = fcalc.tpa_ba_qmdbh_plot_by_multi_case_long(tree_table, None, case_columns)
+            else:
+                asserted_dataframe = fcalc.tpa_ba_qmdbh_level_by_multi_case_long(tree_table, None, case_columns, level)
+
+            pdt.assert_frame_equal(summary_dfs[(level, tuple(case_columns))], asserted_dataframe, check_exact=False)
+
+
+def test_column_existence():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+
+    summary_dfs = fcalc.tpa_ba_qmdbh_grouping_sets(tree_table, [['TR_SP', 'MAST_TYPE']], ['SID'])
+
+    asserted_columns = ['SID', 'TR_SP', 'MAST_TYPE', 'Tree_Count', 'Stand_Dens', 'Plot_Count', 'TPA', 'BA', 'QM_DBH']
+
+    assert list(summary_dfs.keys()) == [('SID', ('TR_SP', 'MAST_TYPE'))]
+    assert list(summary_dfs[('SID', ('TR_SP', 'MAST_TYPE'))].columns) == asserted_columns
@@ -0,0 +1,33 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+
+
+def test_itself():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+
+    filters = [None, 'live', tree_table.MAST_TYPE == 'Hard', 'size:Saw & dead']
+
+    # Compare each filter in the stacked output to the single filter function
+    for level, case_columns, wide in [('PID', None, False), ('SID', ['TR_HLTH'], True), ('POOL', ['TR_SIZE'], False)]:
+        tpa_dfs = fcalc.tpa_ba_qmdbh_many(tree_table, filters, level, case_columns, wide)
+
+        assert len(tpa_dfs) == len(filters)
+        for filter_statement, tpa_df in zip(filters, tpa_dfs):
+            pdt.assert_frame_equal(fcalc.tpa_ba_qmdbh(tree_table, filter_statement, level, case_columns, wide),
+                                   tpa_df)
+
+
+def test_column_existence():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    level = 'SID'
+
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+    tpa_dfs = fcalc.tpa_ba_qmdbh_many(tree_table, ['live', 'dead'], level)
+
+    asserted_columns = [level, 'tree_count', 'stand_dens', 'plot_count', 'TPA', 'BA', 'QM_DBH']
+
+    assert [list(tpa_df.columns) for tpa_df in tpa_dfs] == [asserted_columns, asserted_columns]
@@ -0,0 +1,38 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import pandas as pd
+import pandas.testing as pdt
+import numpy as np
+
+
+def test_itself():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+
+    live = ~tree_table.TR_HLTH.isin(["D", "DEAD"])
+    saw = (tree_table.TR_SIZE == 'Saw').fillna(False)
+    hard = (tree_table.MAST_TYPE == 'Hard').fillna(False)
+
+    # Named filters match the equivalent pandas filter statements
+    assert np.array_equal(fcalc.tree_filter(tree_table, 'live'), live.to_numpy(dtype=bool))
+    assert np.array_equal(fcalc.tree_filter(tree_table, 'dead'), (~live).to_numpy(dtype=bool))
+    assert np.array_equal(fcalc.tree_filter(tree_table, 'live & size:Saw'), (live & saw).to_numpy(dtype=bool))
+    assert np.array_equal(fcalc.tree_filter(tree_table, '~(hard_mast | size:Saw)'),
+                          (~(hard | saw)).to_numpy(dtype=bool))
+
+    # Functions accept filter names in place of filter statements
+    pdt.assert_frame_equal(fcalc.tpa_ba_qmdbh_level(tree_table, 'live', 'SID'),
+                           fcalc.tpa_ba_qmdbh_level(tree_table, live, 'SID'))
+    pdt.assert_frame_equal(fcalc.dominance_many(tree_table, 'SID', 'TR_SP', {'SAW': 'live & size:Saw'}),
+                           fcalc.dominance_many(tree_table, 'SID', 'TR_SP', {'SAW': live & saw}))
+
+
+def test_column_existence():
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+
+    prism_df = pd.DataFrame.spatial.from_featureclass(prism)
+    tree_table = fcalc.create_tree_table(prism_df)
+    mask = fcalc.tree_filter(tree_table, 'sp_type:Common')
+
+    assert mask.dtype == bool
+    assert len(mask) == len(tree_table.index)
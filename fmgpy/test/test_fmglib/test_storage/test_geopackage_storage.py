@@ -0,0 +1,69 @@
+import fmgpy.fmglib.forest_calcs as fcalc
+import fmgpy.fmglib.storage as fstore
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+import struct
+
+
+def point(x, y):
+    # GeoPackage geometry blob of a point in EPSG 26915, little endian header and WKB
+    return b'GP' + bytes([0, 1]) + struct.pack('<i', 26915) + struct.pack('<bIdd', 1, 1, x, y)
+
+
+def plot_df():
+    return pd.DataFrame({'PID': ['A', 'B', 'C', 'D'],
+                         'POOL': ['P1', 'P1', 'P2', None],
+                         'TR_DIA': [10, 12, 8, 15],
+                         'OV_CLSR': [55.5, None, 10.0, 20.25],
+                         'COL_DATE': pd.to_datetime(['2024-06-01 09:00', '2024-06-02 11:45', None, '2023-07-15 10:30']),
+                         'SHAPE': [point(1, 2), point(3, 4), point(5, 6), None]})
+
+
+def test_itself(tmp_path):
+    storage = fstore.GeoPackageStorage(str(tmp_path / 'fmg.gpkg'))
+    df = plot_df()
+
+    # Features round trip, with the key and geometry named as in ESRI feature classes
+    storage.write_features(df, 'Prism')
+    read_df = storage.read_plots('Prism')
+    pdt.assert_frame_equal(read_df.drop(columns=['OBJECTID']), df)
+    assert list(read_df['OBJECTID']) == [1, 2, 3, 4]
+
+    # Partitions select the rows of one level polygon, or the rows without a level value
+    pdt.assert_frame_equal(storage.read_trees(str(tmp_path / 'fmg.gpkg' / 'Prism'), ('POOL', 'P1'))
+                           .drop(columns=['OBJECTID']), df.iloc[:2])
+    assert list(storage.read_plots('Prism', ('POOL', None))['PID']) == ['D']
+    assert fcalc.partition_values(['Prism'], 'POOL', storage=storage) == ['P1', 'P2', None]
+
+    # Patching replaces the rows of the patched polygons and keeps the others
+    storage.write_table(df.drop(columns=['SHAPE']), 'POOL_Summary')
+    storage.patch_table(df.drop(columns=['SHAPE']).iloc[[0]].assign(TR_DIA=99), 'POOL_Summary', 'POOL', ['P1', None])
+    patched_df = storage.read_plots('POOL_Summary')
+    assert sorted(patched_df['PID']) == ['A', 'C']
+    assert patched_df.loc[patched_df['PID'] == 'A', 'TR_DIA'].item() == 99
+    assert storage.exists('POOL_Summary')
+    assert not storage.exists('SID_Summary')
+
+    # Fingerprints change with the rows
+    fingerprint = storage.fingerprint('Prism')
+    assert storage.fingerprint('Prism') == fingerprint
+    storage.write_features(df.iloc[:3], 'Prism')
+    assert storage.fingerprint('Prism').content_hash != fingerprint.content_hash
+
+
+def test_column_existence(tmp_path):
+    storage = fstore.open_storage(str(tmp_path / 'fmg.gpkg'))
+    storage.write_features(plot_df(), 'Fixed')
+
+    asserted_columns = ['OBJECTID', 'PID', 'POOL', 'TR_DIA', 'OV_CLSR', 'COL_DATE', 'SHAPE']
+
+    assert isinstance(storage, fstore.GeoPackageStorage)
+    assert storage.field_names('Fixed') == asserted_columns
+    assert storage.fingerprint('Fixed')._fields == ('row_count', 'last_edited', 'content_hash')
+    assert storage.fingerprint('Fixed').row_count == 4
+    assert isinstance(fstore.open_storage(str(tmp_path / 'summaries')), fstore.ParquetStorage)
+
+    # The storage interface leaves the backend methods to the subclasses
+    with pytest.raises(TypeError):
+        fstore.Storage()
@@ -0,0 +1,23 @@
+import fmgpy.fmg as fmg
+import fmglib.forest_calcs as fcalc
+import os
+
+
+def test_itself(tmp_path, monkeypatch):
+    import arcpy
+
+    prism = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Prism_QA_20250513'
+    fixed = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Fixed_QA_20250513'
+    age = r'C:\Users\b5ecdiws\Documents\FMG\fmg_test_data\FMG_FieldData_QA_20250513\FMG_FieldData_QA_20250513.gdb\Age_QA_20250513'
+    arcpy.management.CreateFileGDB(str(tmp_path), 'FMG_Summaries.gdb')
+    out_gdb = os.path.join(str(tmp_path), 'FMG_Summaries.gdb')
+
+    messages = []
+    monkeypatch.setattr(fcalc, 'add_message', messages.append)
+    fmg.run_pipeline({'summaries': {'prism_fc': prism, 'fixed_fc': fixed, 'age_fc': age, 'out_gdb': out_gdb,
+                                    'levels': ['SID', 'UNIT']}})
+
+    # Summaries share the result cache switched on by the tool, so repeated calculations are reused
+    reused = [message.split() for message in messages if message.startswith('Reused')]
+    assert len(reused) == 1
+    assert int(reused[0][1]) > 0